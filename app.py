@@ -6,9 +6,13 @@ Autor: [João Pedro Balduino Leitão]
 """
 
 import streamlit as st
-from src.graph import Graph
+from src.graph import Graph, parse_coordinates
+from src.instrumentation import SearchStats
+import numpy as np
 import pandas as pd
 
+PAGE_SIZE = 20  # Itens por página nas listas de cidades e rotas
+
 # Configuração da página
 st.set_page_config(
     page_title="Sistema de Grafos - Dijkstra",
@@ -18,13 +22,83 @@ st.set_page_config(
 
 # Inicializar o grafo na sessão
 if 'graph' not in st.session_state:
-    st.session_state.graph = Graph(directed=True)
+    st.session_state.graph = Graph(directed=True, verbose=False)
     st.session_state.log = []
 
 def add_log(message):
     """Adiciona mensagem ao log."""
     st.session_state.log.append(message)
 
+def get_views():
+    """Visões derivadas do grafo, recalculadas só quando a versão do grafo muda."""
+    graph = st.session_state.graph
+    views = st.session_state.get('views')
+    
+    if views is None or views['graph'] is not graph or views['version'] != graph.version:
+        # O snapshot CSR já traz os vértices ordenados e as arestas em arrays contíguos
+        snapshot = graph.freeze()
+        vertices = list(snapshot.labels)
+        offsets = np.frombuffer(snapshot.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(len(vertices)), np.diff(offsets))
+        
+        # Tabela montada por colunas de uma vez, sem uma linha (dict) por aresta
+        edges = pd.DataFrame({
+            "Origem": pd.Categorical.from_codes(sources, categories=vertices),
+            "Destino": pd.Categorical.from_codes(np.frombuffer(snapshot.targets, dtype=np.int32),
+                                                 categories=vertices),
+            "Distância (km)": np.frombuffer(snapshot.weights, dtype=np.float64)
+        })
+        
+        views = {'graph': graph, 'version': graph.version, 'vertices': vertices, 'edges': edges}
+        st.session_state.views = views
+    
+    return views
+
+def search_vertices(vertices, query):
+    """Filtra os vértices cujo nome contém o texto buscado."""
+    if not query:
+        return vertices
+    query = query.lower()
+    return [vertex for vertex in vertices if query in str(vertex).lower()]
+
+def filter_edges(edges, vertices, query):
+    """Filtra as rotas que passam por alguma cidade cujo nome contém o texto buscado."""
+    if not query:
+        return edges
+    # Compara só os nomes das cidades (categorias) e filtra as linhas pelos códigos
+    codes = [i for i, vertex in enumerate(vertices) if query.lower() in str(vertex).lower()]
+    mask = edges["Origem"].cat.codes.isin(codes) | edges["Destino"].cat.codes.isin(codes)
+    return edges[mask]
+
+def paginate(total, key):
+    """Seletor de página; devolve o intervalo [início, fim) a exibir."""
+    pages = max(1, -(-total // PAGE_SIZE))
+    # A página vive só no session_state (o widget não recebe value=, que conflitaria com a key)
+    st.session_state[key] = min(st.session_state.get(key, 1), pages)
+    
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Página (de {pages}):", min_value=1, max_value=pages, key=key)
+    
+    start = (page - 1) * PAGE_SIZE
+    return start, min(start + PAGE_SIZE, total)
+
+def show_search_stats(stats):
+    """Exibe os contadores de uma busca instrumentada."""
+    st.markdown("**📈 Estatísticas da Busca:**")
+    if stats.cache_hit:
+        st.caption(f"Respondido pela árvore em cache ({stats.wall_time * 1000:.2f} ms), sem nova busca.")
+        return
+    
+    row1 = st.columns(3)
+    row1[0].metric("Vértices fixados", stats.settled)
+    row1[1].metric("Arestas examinadas", stats.relaxations)
+    row1[2].metric("Tempo", f"{stats.wall_time * 1000:.2f} ms")
+    row2 = st.columns(3)
+    row2[0].metric("Inserções", stats.pushes)
+    row2[1].metric("Obsoletas", stats.stale_pops)
+    row2[2].metric("Fronteira máx.", stats.max_frontier)
+
 def load_example():
     """Carrega exemplo de cidades brasileiras."""
     graph = st.session_state.graph
@@ -34,6 +108,17 @@ def load_example():
         "Brasília", "Salvador", "Curitiba", "Fortaleza"
     ]
     
+    # Coordenadas (latitude, longitude) usadas pela heurística do A*
+    coordinates = {
+        "São Paulo": (-23.5505, -46.6333),
+        "Rio de Janeiro": (-22.9068, -43.1729),
+        "Belo Horizonte": (-19.9167, -43.9345),
+        "Brasília": (-15.7939, -47.8828),
+        "Salvador": (-12.9777, -38.5016),
+        "Curitiba": (-25.4284, -49.2733),
+        "Fortaleza": (-3.7319, -38.5267)
+    }
+    
     routes = [
         ("São Paulo", "Rio de Janeiro", 430),
         ("São Paulo", "Belo Horizonte", 586),
@@ -46,14 +131,17 @@ def load_example():
         ("Salvador", "Fortaleza", 1075)
     ]
     
-    for city in cities:
-        graph.add_vertex(city)
-    
-    for origin, destination, distance in routes:
-        graph.add_edge(origin, destination, distance)
+    # Carga em lote: aplicada de uma vez e sem duplicar rotas se o exemplo já foi carregado
+    with graph.batch(policy="min") as batch:
+        for city in cities:
+            batch.add_vertex(city, coordinates[city])
+        for origin, destination, distance in routes:
+            batch.add_edge(origin, destination, distance)
+    changes = batch.applied
     
-    add_log(f"✅ Exemplo carregado: {len(cities)} cidades e {len(routes)} rotas")
-    st.success(f"Exemplo carregado! {len(cities)} cidades e {len(routes)} rotas adicionadas.")
+    add_log(f"✅ Exemplo carregado: {changes['added_vertices']} cidades e {changes['added_edges']} rotas novas")
+    st.success(f"Exemplo carregado! {changes['added_vertices']} cidades e {changes['added_edges']} rotas adicionadas "
+               f"({changes['skipped_edges']} já existiam).")
 
 # Header
 st.title("🗺️ Sistema de Grafos + Dijkstra")
@@ -75,13 +163,26 @@ with col1:
 
 with col2:
     if st.button("🗑️ Limpar Grafo", use_container_width=True):
-        st.session_state.graph = Graph(directed=True)
+        st.session_state.graph = Graph(directed=st.session_state.graph.directed, verbose=False)
         st.session_state.log = []
         st.success("Grafo limpo!")
         st.rerun()
 
+with col3:
+    undirected = st.toggle("↔️ Rotas de mão dupla (grafo não direcionado)",
+                           value=not st.session_state.graph.directed,
+                           help="Trocar o tipo começa um grafo novo, vazio.")
+    if undirected == st.session_state.graph.directed:
+        st.session_state.graph = Graph(directed=not undirected, verbose=False)
+        add_log(f"🔄 Novo grafo {'não direcionado' if undirected else 'direcionado'}")
+        st.rerun()
+
 st.divider()
 
+# Visões derivadas (reaproveitadas entre execuções enquanto o grafo não muda)
+views = get_views()
+vertices_list = views['vertices']
+
 # Layout principal em 2 colunas
 col_left, col_right = st.columns([1, 1])
 
@@ -93,20 +194,29 @@ with col_left:
     st.markdown("##### 📍 Gerenciar Vértices (Cidades)")
     with st.form("add_vertex_form"):
         new_vertex = st.text_input("Nome da cidade:")
+        new_coordinates = st.text_input("Latitude, longitude (opcional, usadas pelo A*):",
+                                        placeholder="-23.55, -46.63")
         submit_vertex = st.form_submit_button("➕ Adicionar Cidade", use_container_width=True)
         
         if submit_vertex and new_vertex:
-            if st.session_state.graph.add_vertex(new_vertex):
-                add_log(f"✅ Cidade '{new_vertex}' adicionada")
-                st.success(f"Cidade '{new_vertex}' adicionada!")
-                st.rerun()
+            try:
+                coordinates = parse_coordinates(new_coordinates)
+            except ValueError:
+                st.error("Coordenadas inválidas! Use o formato: -23.55, -46.63")
+            else:
+                if st.session_state.graph.add_vertex(new_vertex, coordinates):
+                    add_log(f"✅ Cidade '{new_vertex}' adicionada")
+                    st.success(f"Cidade '{new_vertex}' adicionada!")
+                    st.rerun()
     
-    # Listar vértices
-    if st.session_state.graph.vertices:
+    # Listar vértices (com busca e paginação)
+    if vertices_list:
         st.write("**Cidades cadastradas:**")
-        vertices_list = sorted(list(st.session_state.graph.vertices))
+        vertex_query = st.text_input("🔎 Buscar cidade:", key="vertex_search")
+        matches = search_vertices(vertices_list, vertex_query)
+        start, end = paginate(len(matches), "vertex_page")
         
-        for vertex in vertices_list:
+        for vertex in matches[start:end]:
             col_v1, col_v2 = st.columns([3, 1])
             with col_v1:
                 st.write(f"• {vertex}")
@@ -115,6 +225,11 @@ with col_left:
                     st.session_state.graph.remove_vertex(vertex)
                     add_log(f"❌ Cidade '{vertex}' removida")
                     st.rerun()
+        
+        if matches:
+            st.caption(f"Exibindo {start + 1}–{end} de {len(matches)} cidades")
+        else:
+            st.caption("Nenhuma cidade encontrada.")
     else:
         st.info("Nenhuma cidade cadastrada ainda.")
     
@@ -125,8 +240,6 @@ with col_left:
     
     if len(st.session_state.graph.vertices) >= 2:
         with st.form("add_edge_form"):
-            vertices_list = sorted(list(st.session_state.graph.vertices))
-            
             col_e1, col_e2, col_e3 = st.columns(3)
             
             with col_e1:
@@ -136,7 +249,7 @@ with col_left:
                 to_vertex = st.selectbox("Destino:", vertices_list, key="to")
             
             with col_e3:
-                weight = st.number_input("Distância (km):", min_value=1, value=100)
+                weight = st.number_input("Distância (km):", value=100)
             
             submit_edge = st.form_submit_button("➕ Adicionar Rota", use_container_width=True)
             
@@ -151,21 +264,17 @@ with col_left:
     else:
         st.info("Adicione pelo menos 2 cidades para criar rotas.")
     
-    # Listar arestas
-    if st.session_state.graph.graph:
+    # Listar arestas (com filtro e paginação)
+    if vertices_list:
         st.write("**Rotas cadastradas:**")
-        edges_data = []
-        for vertex in sorted(st.session_state.graph.vertices):
-            for neighbor, weight in st.session_state.graph.graph[vertex]:
-                edges_data.append({
-                    "Origem": vertex,
-                    "Destino": neighbor,
-                    "Distância": f"{weight}km"
-                })
+        df_edges = views['edges']
         
-        if edges_data:
-            df_edges = pd.DataFrame(edges_data)
-            st.dataframe(df_edges, use_container_width=True, hide_index=True)
+        if len(df_edges):
+            edge_query = st.text_input("🔎 Filtrar rotas por cidade:", key="edge_search")
+            df_edges = filter_edges(df_edges, vertices_list, edge_query)
+            start, end = paginate(len(df_edges), "edge_page")
+            st.dataframe(df_edges.iloc[start:end], use_container_width=True, hide_index=True)
+            st.caption(f"{len(df_edges)} rota(s)")
         else:
             st.info("Nenhuma rota cadastrada ainda.")
 
@@ -173,9 +282,7 @@ with col_left:
 with col_right:
     st.subheader("🎯 PARTE 2: Algoritmo de Dijkstra")
     
-    if len(st.session_state.graph.vertices) >= 2:
-        vertices_list = sorted(list(st.session_state.graph.vertices))
-        
+    if len(vertices_list) >= 2:
         st.markdown("##### 🔍 Encontrar Menor Caminho")
         
         col_d1, col_d2 = st.columns(2)
@@ -184,13 +291,36 @@ with col_right:
         with col_d2:
             end_vertex = st.selectbox("Cidade de destino:", vertices_list, key="dijkstra_end")
         
+        use_astar = st.checkbox(
+            "🧭 Usar A* (coordenadas)",
+            help="Prioriza as cidades mais próximas do destino em linha reta; cidades sem coordenadas "
+                 "não têm estimativa e a busca se comporta como o Dijkstra."
+        )
+        bidirectional = st.checkbox(
+            "⚡ Busca bidirecional",
+            help="Expande a partir da origem e do destino ao mesmo tempo, visitando apenas os vértices necessários.",
+            disabled=use_astar
+        )
+        
+        show_stats = st.checkbox("📈 Mostrar estatísticas da busca", key="dijkstra_stats")
+        alternatives = st.number_input(
+            "🔀 Rotas alternativas:", min_value=1, max_value=10, value=1,
+            help="Quantas rotas sem ciclos exibir, da menor para a maior (algoritmo de Yen)."
+        )
+        
         if st.button("▶️ Executar Dijkstra", use_container_width=True, type="primary"):
-            result = st.session_state.graph.dijkstra(start_vertex, end_vertex)
+            algorithm_name = "A*" if use_astar else "Dijkstra"
+            stats = SearchStats() if show_stats and not use_astar else None
+            if use_astar:
+                result = st.session_state.graph.astar(start_vertex, end_vertex)
+            else:
+                result = st.session_state.graph.dijkstra(start_vertex, end_vertex, bidirectional=bidirectional,
+                                                         stats=stats)
             
             if result:
                 st.markdown("---")
                 if result['path']:
-                    st.success("**✅ Caminho encontrado pelo Dijkstra!**")
+                    st.success(f"**✅ Caminho encontrado pelo {algorithm_name}!**")
                     
                     # Exibir caminho
                     st.markdown("**📍 Caminho:**")
@@ -212,38 +342,65 @@ with col_right:
                     df_path = pd.DataFrame(path_data)
                     st.dataframe(df_path, use_container_width=True, hide_index=True)
                     
-                    add_log(f"🎯 Dijkstra: {start_vertex} → {end_vertex} = {result['distances'][end_vertex]:.2f}km")
+                    add_log(f"🎯 {algorithm_name}: {start_vertex} → {end_vertex} = {result['distances'][end_vertex]:.2f}km")
+                    
+                    if alternatives > 1:
+                        routes = st.session_state.graph.k_shortest_paths(start_vertex, end_vertex, alternatives)
+                        st.markdown("**🔀 Rotas Alternativas:**")
+                        best = routes[0]['distance']
+                        routes_data = [
+                            {"Opção": i, "Rota": " → ".join(map(str, route['path'])),
+                             "Distância": f"{route['distance']:.2f} km",
+                             "Diferença": f"+{route['distance'] - best:.2f} km"}
+                            for i, route in enumerate(routes, 1)
+                        ]
+                        st.dataframe(pd.DataFrame(routes_data), use_container_width=True, hide_index=True)
+                        if len(routes) < alternatives:
+                            st.caption(f"Só existem {len(routes)} rota(s) sem ciclos entre estas cidades.")
+                        add_log(f"🔀 {len(routes)} rota(s) alternativas: {start_vertex} → {end_vertex}")
+                elif not st.session_state.graph.can_reach(start_vertex, end_vertex):
+                    # Resposta do índice de componentes: nenhuma busca foi feita
+                    st.warning("⚠️ Não há caminho: as cidades estão em componentes sem ligação.")
+                    add_log(f"⚠️ {algorithm_name}: Sem caminho de {start_vertex} para {end_vertex}")
                 else:
                     st.warning("⚠️ Não há caminho entre as cidades selecionadas.")
-                    add_log(f"⚠️ Dijkstra: Sem caminho de {start_vertex} para {end_vertex}")
+                    add_log(f"⚠️ {algorithm_name}: Sem caminho de {start_vertex} para {end_vertex}")
+                
+                if stats is not None:
+                    show_search_stats(stats)
+                elif show_stats:
+                    st.caption(f"📈 Vértices fixados pelo A*: {result['settled']}")
+            elif st.session_state.graph.has_negative_weights():
+                st.error("O grafo tem rotas com peso negativo: use o Bellman-Ford em Algoritmos Extras.")
         
         st.divider()
         
         # Visualizar grafo completo
         st.markdown("##### 📊 Visualização do Grafo")
         
-        if st.button("👁️ Exibir Grafo Completo", use_container_width=True):
-            st.write("**Tipo:** Grafo Direcionado")
-            st.write(f"**Total de Vértices:** {len(st.session_state.graph.vertices)}")
-            st.write(f"**Vértices:** {', '.join(sorted(st.session_state.graph.vertices))}")
+        # Toggle (e não botão) para a paginação continuar visível entre execuções
+        if st.toggle("👁️ Exibir Grafo Completo"):
+            st.write(f"**Tipo:** Grafo {'Direcionado' if st.session_state.graph.directed else 'Não Direcionado'}")
+            st.write(f"**Total de Vértices:** {len(vertices_list)}")
+            shown = ', '.join(str(vertex) for vertex in vertices_list[:PAGE_SIZE])
+            st.write(f"**Vértices:** {shown}{' …' if len(vertices_list) > PAGE_SIZE else ''}")
             
             st.write("**Arestas:**")
-            edges_data = []
-            for vertex in sorted(st.session_state.graph.vertices):
-                for neighbor, weight in st.session_state.graph.graph[vertex]:
-                    edges_data.append({
-                        "Origem": vertex,
-                        "→": "→",
-                        "Destino": neighbor,
-                        "Peso (km)": weight
-                    })
-            
-            if edges_data:
-                df_all_edges = pd.DataFrame(edges_data)
-                st.dataframe(df_all_edges, use_container_width=True, hide_index=True)
-                st.write(f"**Total de Arestas:** {len(edges_data)}")
+            df_all_edges = views['edges']
+            if len(df_all_edges):
+                start, end = paginate(len(df_all_edges), "all_edges_page")
+                st.dataframe(df_all_edges.iloc[start:end], use_container_width=True, hide_index=True)
+                st.write(f"**Total de Arestas:** {len(df_all_edges)}")
             else:
                 st.info("Nenhuma aresta cadastrada.")
+            
+            with st.expander("💾 Uso de Memória"):
+                report = st.session_state.graph.memory_report()
+                total = report.pop('total')
+                st.dataframe(pd.DataFrame(
+                    [{"Estrutura": name, "KB": f"{size / 1024:.1f}"} for name, size in report.items()]
+                ), use_container_width=True, hide_index=True)
+                st.write(f"**Total:** {total / 1024:.1f} KB")
         
         st.divider()
         
@@ -252,15 +409,23 @@ with col_right:
         
         extra_algo = st.selectbox(
             "Selecione um algoritmo extra:",
-            ["", "BFS - Busca em Largura", "DFS - Busca em Profundidade"]
+            ["", "BFS - Busca em Largura", "DFS - Busca em Profundidade", "Bellman-Ford - Pesos Negativos",
+             "Componentes Conexas", "Árvore Geradora Mínima"]
         )
         
         if extra_algo:
             extra_start = st.selectbox("Vértice inicial:", vertices_list, key="extra_start")
+            extra_stats = None
+            mst_algorithm = "Kruskal"
+            if extra_algo in ("BFS - Busca em Largura", "DFS - Busca em Profundidade") and st.checkbox(
+                    "📈 Mostrar estatísticas da busca", key="extra_stats"):
+                extra_stats = SearchStats()
+            if extra_algo == "Árvore Geradora Mínima":
+                mst_algorithm = st.radio("Algoritmo:", ["Kruskal", "Prim"], horizontal=True)
             
             if st.button(f"▶️ Executar {extra_algo}", use_container_width=True):
                 if extra_algo == "BFS - Busca em Largura":
-                    result = st.session_state.graph.bfs(extra_start)
+                    result = st.session_state.graph.bfs(extra_start, stats=extra_stats)
                     if result:
                         st.success("**Resultado do BFS:**")
                         st.write(f"**Ordem de visita:** {' → '.join(result['order'])}")
@@ -268,13 +433,72 @@ with col_right:
                         for city, level in sorted(result['levels'].items(), key=lambda x: x[1]):
                             st.write(f"  • {city}: nível {level}")
                         add_log(f"🔍 BFS executado a partir de '{extra_start}'")
+                        if extra_stats is not None:
+                            show_search_stats(extra_stats)
                 
                 elif extra_algo == "DFS - Busca em Profundidade":
-                    result = st.session_state.graph.dfs(extra_start)
+                    result = st.session_state.graph.dfs(extra_start, stats=extra_stats)
                     if result:
                         st.success("**Resultado do DFS:**")
                         st.write(f"**Ordem de visita:** {' → '.join(result)}")
                         add_log(f"🔍 DFS executado a partir de '{extra_start}'")
+                        if extra_stats is not None:
+                            show_search_stats(extra_stats)
+                
+                elif extra_algo == "Bellman-Ford - Pesos Negativos":
+                    result = st.session_state.graph.bellman_ford(extra_start)
+                    if result:
+                        if result['negative_cycle']:
+                            cycle = result['negative_cycle']
+                            st.error(f"**Ciclo negativo detectado:** {' → '.join(cycle + [cycle[0]])}")
+                            add_log(f"⚠️ Bellman-Ford: ciclo negativo a partir de '{extra_start}'")
+                        else:
+                            st.success("**Resultado do Bellman-Ford:**")
+                            distances_data = [
+                                {"Cidade": city, "Distância": f"{distance:.2f} km"}
+                                for city, distance in sorted(result['distances'].items(), key=lambda x: x[1])
+                            ]
+                            st.dataframe(pd.DataFrame(distances_data), use_container_width=True, hide_index=True)
+                            add_log(f"🔍 Bellman-Ford executado a partir de '{extra_start}'")
+                
+                elif extra_algo == "Componentes Conexas":
+                    components = st.session_state.graph.components()
+                    own = st.session_state.graph.component_of(extra_start)
+                    st.success(f"**{len(components)} componente(s) "
+                               f"{'fortemente conexas' if st.session_state.graph.directed else 'conexas'}:**")
+                    components_data = [
+                        {"Componente": i, "Cidades": len(component),
+                         "Membros": ", ".join(map(str, sorted(component, key=str)[:PAGE_SIZE]))
+                                    + (" …" if len(component) > PAGE_SIZE else ""),
+                         "Contém origem": "✓" if st.session_state.graph.component_of(component[0]) == own else ""}
+                        for i, component in enumerate(components, 1)
+                    ]
+                    st.dataframe(pd.DataFrame(components_data), use_container_width=True, hide_index=True)
+                    add_log(f"🧩 {len(components)} componente(s) encontradas")
+                
+                elif extra_algo == "Árvore Geradora Mínima":
+                    if st.session_state.graph.directed:
+                        st.warning("A árvore geradora mínima exige rotas de mão dupla (grafo não direcionado).")
+                    else:
+                        result = st.session_state.graph.minimum_spanning_forest(mst_algorithm.lower())
+                        st.success(f"**Árvore Geradora Mínima ({mst_algorithm}):**")
+                        col_total, col_edges, col_trees = st.columns(3)
+                        col_total.metric("Peso total", f"{result['total_weight']:.2f} km")
+                        col_edges.metric("Rotas", len(result['edges']))
+                        col_trees.metric("Árvores", result['components'])
+                        st.session_state.mst = {
+                            'graph': st.session_state.graph, 'version': st.session_state.graph.version,
+                            'edges': pd.DataFrame(result['edges'], columns=["Origem", "Destino", "Distância (km)"])
+                        }
+                        add_log(f"🌲 Árvore geradora mínima: {len(result['edges'])} rotas, "
+                                f"{result['total_weight']:.2f} km")
+            
+            # A tabela fica na sessão (enquanto o grafo não muda) para a paginação sobreviver aos reruns
+            mst = st.session_state.get('mst')
+            if (extra_algo == "Árvore Geradora Mínima" and mst is not None
+                    and mst['graph'] is st.session_state.graph and mst['version'] == st.session_state.graph.version):
+                start, end = paginate(len(mst['edges']), "mst_page")
+                st.dataframe(mst['edges'].iloc[start:end], use_container_width=True, hide_index=True)
     
     else:
         st.info("📍 Adicione pelo menos 2 cidades para usar o Dijkstra.")
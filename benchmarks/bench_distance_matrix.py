@@ -0,0 +1,51 @@
+"""
+Benchmark da matriz de distâncias muitos-para-muitos
+Mede o tempo com 1, 2, 4... processos para verificar a escalabilidade
+
+Uso: python benchmarks/bench_distance_matrix.py [--side 150] [--sources 64] [--targets 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from graph import Graph
+from generators import grid_edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da matriz de distâncias muitos-para-muitos")
+    parser.add_argument("--side", type=int, default=150, help="Lado da grade")
+    parser.add_argument("--sources", type=int, default=64, help="Número de origens")
+    parser.add_argument("--targets", type=int, default=500, help="Número de destinos")
+    args = parser.parse_args()
+    side, n_sources, n_targets = args.side, args.sources, args.targets
+
+    graph = Graph.from_edge_list(grid_edges(side, side), directed=False, verbose=False)
+    csr = graph.freeze()
+
+    rng = random.Random(42)
+    vertices = sorted(graph.vertices)
+    sources = rng.sample(vertices, n_sources)
+    targets = rng.sample(vertices, n_targets)
+
+    print(f"Grade {side}x{side}: {csr.num_vertices()} vértices, {csr.num_edges()} arestas")
+    print(f"{n_sources} origens x {n_targets} destinos\n")
+
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        csr.distance_matrix(sources, targets, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  {workers:>2} processo(s): {elapsed:8.3f} s  (speedup {baseline / elapsed:4.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
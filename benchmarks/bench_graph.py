@@ -0,0 +1,233 @@
+"""
+Benchmark das operações do Graph sobre grafos sintéticos reprodutíveis
+Mede o tempo (melhor de N repetições) e o pico de memória (tracemalloc) de cada
+operação e, opcionalmente, salva ou compara com uma linha de base em JSON
+
+Uso:
+    python benchmarks/bench_graph.py [--sizes 1000 10000] [--generators grid chain]
+                                     [--repeat 3] [--directed]
+                                     [--save base.json] [--compare base.json] [--tolerance 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from graph import Graph
+from generators import GENERATORS
+
+DEFAULT_SIZES = [1000, 10000]
+MUTATIONS = 100  # Arestas/vértices removidos por medição
+PAIRS = 20  # Consultas origem-destino por medição
+SOURCES = 5  # Buscas completas (Dijkstra, BFS, DFS) por medição
+
+
+# ==================== OPERAÇÕES ====================
+# Cada operação recebe o cenário, faz o preparo fora da medição e devolve a
+# função que será cronometrada
+
+def build_graph(scenario):
+    return Graph.from_edge_list(scenario['edges'], directed=scenario['directed'],
+                                verbose=False, cache_size=0)
+
+
+def op_add_edge(scenario):
+    graph = Graph(directed=scenario['directed'], verbose=False, cache_size=0)
+    edges = scenario['edges']
+
+    def run():
+        for u, v, weight in edges:
+            graph.add_edge(u, v, weight)
+    return run
+
+
+def op_remove_edge(scenario):
+    graph = build_graph(scenario)
+    edges = scenario['sample_edges']
+
+    def run():
+        for u, v, _ in edges:
+            graph.remove_edge(u, v)
+    return run
+
+
+def op_remove_vertex(scenario):
+    graph = build_graph(scenario)
+    vertices = scenario['sample_vertices']
+
+    def run():
+        for vertex in vertices:
+            graph.remove_vertex(vertex)
+    return run
+
+
+def op_dijkstra_pair(scenario):
+    graph = build_graph(scenario)
+    pairs = scenario['pairs']
+
+    def run():
+        for source, target in pairs:
+            graph.dijkstra(source, target)
+    return run
+
+
+def op_dijkstra_full(scenario):
+    graph = build_graph(scenario)
+    sources = scenario['sources']
+
+    def run():
+        for source in sources:
+            graph.dijkstra(source)
+    return run
+
+
+def op_bfs(scenario):
+    graph = build_graph(scenario)
+    sources = scenario['sources']
+
+    def run():
+        for source in sources:
+            graph.bfs(source)
+    return run
+
+
+def op_dfs(scenario):
+    graph = build_graph(scenario)
+    sources = scenario['sources']
+
+    def run():
+        for source in sources:
+            graph.dfs(source)
+    return run
+
+
+OPERATIONS = {
+    "add_edge": op_add_edge,
+    "remove_edge": op_remove_edge,
+    "remove_vertex": op_remove_vertex,
+    "dijkstra_pair": op_dijkstra_pair,
+    "dijkstra_full": op_dijkstra_full,
+    "bfs": op_bfs,
+    "dfs": op_dfs,
+}
+
+
+# ==================== MEDIÇÃO ====================
+
+def make_scenario(generator, n, directed):
+    # Semente derivada do nome: o mesmo cenário em qualquer máquina
+    rng = random.Random(f"{generator}/{n}")
+    edges = GENERATORS[generator](n, seed=rng.randrange(1 << 30))
+    vertices = sorted({u for u, _, _ in edges} | {v for _, v, _ in edges})
+
+    return {
+        'edges': edges,
+        'directed': directed,
+        'vertices': len(vertices),
+        'sample_edges': rng.sample(edges, min(MUTATIONS, len(edges))),
+        'sample_vertices': rng.sample(vertices, min(MUTATIONS, len(vertices))),
+        'pairs': [(rng.choice(vertices), rng.choice(vertices)) for _ in range(PAIRS)],
+        'sources': [rng.choice(vertices) for _ in range(SOURCES)],
+    }
+
+
+def measure(operation, scenario, repeat):
+    # Tempo: melhor de N execuções, cada uma com preparo novo e sem tracemalloc
+    best = float('infinity')
+    for _ in range(repeat):
+        run = operation(scenario)
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    # Memória: execução separada, pois o tracemalloc deixa tudo mais lento
+    run = operation(scenario)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'time': best, 'peak': peak}
+
+
+# ==================== LINHA DE BASE ====================
+
+def save_baseline(path, results):
+    data = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+    print(f"\n✓ Linha de base salva em '{path}'.")
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    if data.get('python') != platform.python_version():
+        print(f"⚠️  Linha de base gerada com Python {data.get('python')}; "
+              f"comparação pode não ser justa.")
+    return data['results']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das operações do Graph")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (vale o melhor tempo)")
+    parser.add_argument("--directed", action="store_true", help="Grafos direcionados (padrão: não direcionados)")
+    parser.add_argument("--save", metavar="ARQUIVO", help="Salva os resultados como linha de base")
+    parser.add_argument("--compare", metavar="ARQUIVO", help="Compara com uma linha de base salva")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Piora relativa de tempo aceita antes de acusar regressão (padrão: 0.10)")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results = {}
+    regressions = []
+
+    for generator in args.generators:
+        for n in args.sizes:
+            scenario = make_scenario(generator, n, args.directed)
+            print(f"\n{generator}: {scenario['vertices']} vértices, {len(scenario['edges'])} arestas")
+            print(f"  {'operação':<15}{'tempo (ms)':>12}{'pico (KB)':>12}{'vs base':>10}")
+
+            for name in args.operations:
+                key = f"{generator}/{n}/{name}"
+                result = measure(OPERATIONS[name], scenario, args.repeat)
+                results[key] = result
+
+                comparison = ""
+                if key in baseline and baseline[key]['time'] > 0:
+                    ratio = result['time'] / baseline[key]['time']
+                    comparison = f"{ratio:.2f}x"
+                    if ratio > 1 + args.tolerance:
+                        comparison += " ✗"
+                        regressions.append((key, ratio))
+
+                print(f"  {name:<15}{result['time'] * 1000:12.2f}{result['peak'] / 1024:12.1f}{comparison:>10}")
+
+    if args.save:
+        save_baseline(args.save, results)
+
+    if args.compare:
+        if regressions:
+            print(f"\n✗ {len(regressions)} regressão(ões) acima de {args.tolerance:.0%}:")
+            for key, ratio in regressions:
+                print(f"  {key}: {ratio:.2f}x")
+            sys.exit(1)
+        print(f"\n✓ Nenhuma regressão acima de {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark das filas de prioridade do Dijkstra (heap binário, Dial e radix heap)
+Grafos esparsos parecidos com malhas viárias, pesos inteiros em km
+
+Uso: python benchmarks/bench_queues.py [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from graph import Graph
+from generators import grid_edges
+
+BACKENDS = ["heap", "dial", "radix"]
+SIDES = [50, 100, 200]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das filas de prioridade do Dijkstra")
+    parser.add_argument("--repeat", type=int, default=5, help="Buscas (origens sorteadas) por grafo")
+    repetitions = parser.parse_args().repeat
+
+    for side in SIDES:
+        for max_weight in (100, 2000):
+            edges = grid_edges(side, side, seed=side, max_weight=max_weight)
+            graph = Graph.from_edge_list(edges, directed=False, verbose=False, cache_size=0)
+            sources = random.Random(side).sample(sorted(graph.vertices), repetitions)
+
+            print(f"\nGrade {side}x{side} ({len(graph.vertices)} vértices), pesos 1..{max_weight}:")
+            reference = None
+            for backend in BACKENDS:
+                start = time.perf_counter()
+                results = [graph.dijkstra(source, queue=backend)['distances'] for source in sources]
+                elapsed = (time.perf_counter() - start) / repetitions
+
+                # Todas as filas devem chegar às mesmas distâncias
+                reference = reference or results
+                status = "ok" if results == reference else "DIVERGENTE"
+                print(f"  {backend:>6}: {elapsed * 1000:9.2f} ms/busca  [{status}]")
+
+
+if __name__ == "__main__":
+    main()
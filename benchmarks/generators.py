@@ -0,0 +1,76 @@
+"""
+Geradores reprodutíveis de grafos sintéticos para os benchmarks
+Cada gerador devolve uma lista de arestas (origem, destino, peso)
+"""
+
+import random
+
+
+def grid_edges(rows, cols, seed=0, min_weight=1, max_weight=100):
+    """Malha parecida com uma rede viária: cada cruzamento liga aos vizinhos da grade."""
+    rng = random.Random(seed)
+    edges = []
+    for i in range(rows):
+        for j in range(cols):
+            vertex = i * cols + j
+            if j + 1 < cols:
+                edges.append((vertex, vertex + 1, rng.randint(min_weight, max_weight)))
+            if i + 1 < rows:
+                edges.append((vertex, vertex + cols, rng.randint(min_weight, max_weight)))
+    return edges
+
+
+def erdos_renyi_edges(n, average_degree=4, seed=0, min_weight=1, max_weight=100):
+    """Grafo aleatório G(n, m): m = n * grau médio arestas sorteadas uniformemente."""
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(n * average_degree):
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        if u != v:
+            edges.append((u, v, rng.randint(min_weight, max_weight)))
+    return edges
+
+
+def scale_free_edges(n, attachments=2, seed=0, min_weight=1, max_weight=100):
+    """Barabási–Albert: cada vértice novo liga a vértices já existentes com
+    probabilidade proporcional ao grau (poucos hubs com muitas arestas)."""
+    rng = random.Random(seed)
+    edges = []
+    # Cada vértice aparece aqui uma vez por aresta incidente: sortear desta
+    # lista equivale a sortear proporcionalmente ao grau
+    endpoints = list(range(attachments + 1))
+    for u in range(attachments + 1):
+        for v in range(u + 1, attachments + 1):
+            edges.append((u, v, rng.randint(min_weight, max_weight)))
+            endpoints.extend((u, v))
+
+    for u in range(attachments + 1, n):
+        chosen = set()
+        while len(chosen) < attachments:
+            chosen.add(rng.choice(endpoints))
+        for v in chosen:
+            edges.append((u, v, rng.randint(min_weight, max_weight)))
+            endpoints.extend((u, v))
+    return edges
+
+
+def chain_edges(n, seed=0, min_weight=1, max_weight=100):
+    """Caminho simples 0 -> 1 -> ... -> n-1: profundidade máxima para buscas."""
+    rng = random.Random(seed)
+    return [(u, u + 1, rng.randint(min_weight, max_weight)) for u in range(n - 1)]
+
+
+def grid_edges_for(n, seed=0, **kwargs):
+    """Malha quadrada com aproximadamente n vértices."""
+    side = max(2, int(round(n ** 0.5)))
+    return grid_edges(side, side, seed=seed, **kwargs)
+
+
+# Geradores por nome, todos com assinatura (n, seed)
+GENERATORS = {
+    "grid": grid_edges_for,
+    "erdos_renyi": erdos_renyi_edges,
+    "scale_free": scale_free_edges,
+    "chain": chain_edges,
+}
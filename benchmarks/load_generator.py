@@ -0,0 +1,187 @@
+"""
+Gerador de carga para o serviço HTTP de rotas (src/server.py)
+Vários clientes asyncio com conexões keep-alive disparam consultas de menor
+caminho (e, opcionalmente, alterações) e o relatório mostra vazão e latências
+
+Uso:
+    python benchmarks/load_generator.py --port 8080 [--concurrency 32] [--duration 10]
+    python benchmarks/load_generator.py --spawn-grid 60 [--pool process]   # sobe o servidor sozinho
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from generators import grid_edges
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'server.py')
+
+
+class Client:
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, target, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        self.writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def worker(host, port, vertices, deadline, write_ratio, seed, latencies, errors):
+    rng = random.Random(seed)
+    client = Client(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            source, target = rng.choice(vertices), rng.choice(vertices)
+            if rng.random() < write_ratio:
+                kind = "write"
+                method, path, payload = "POST", "/edges", {"from": source, "to": target,
+                                                           "weight": rng.randint(1, 100)}
+            else:
+                kind = "read"
+                method, path, payload = "GET", f"/shortest-path?from={source}&to={target}", None
+
+            started = time.perf_counter()
+            status, _ = await client.request(method, path, payload)
+            latencies[kind].append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        client.close()
+
+
+async def run(args):
+    # Descobre os vértices (nomes simples: sem escape de URL)
+    client = Client(args.host, args.port)
+    _, data = await client.request("GET", "/vertices")
+    client.close()
+    vertices = data['vertices']
+    if len(vertices) < 2:
+        print("✗ O servidor precisa de pelo menos 2 vértices.")
+        return
+
+    latencies = {'read': [], 'write': []}
+    errors = []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(args.host, args.port, vertices, deadline, args.write_ratio,
+                                  seed, latencies, errors)
+                           for seed in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total = len(latencies['read']) + len(latencies['write'])
+    print(f"\n{args.concurrency} clientes, {elapsed:.1f} s, {len(vertices)} vértices")
+    print(f"  Pedidos: {total} ({total / elapsed:.0f}/s), erros: {len(errors)}")
+    for kind, values in latencies.items():
+        if values:
+            print(f"  {kind:>5}: {len(values):7d} pedidos  "
+                  f"p50 {percentile(values, 0.50) * 1000:7.2f} ms  "
+                  f"p99 {percentile(values, 0.99) * 1000:7.2f} ms  "
+                  f"máx {max(values) * 1000:7.2f} ms")
+
+    client = Client(args.host, args.port)
+    _, stats = await client.request("GET", "/stats")
+    client.close()
+    if stats.get('batches'):
+        print(f"  Levas: {stats['batches']} (média de {stats['queries'] / stats['batches']:.1f} consultas por leva)")
+
+
+def spawn_server(args):
+    # Grava uma malha sintética e sobe o servidor local com ela
+    edges_file = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+    with edges_file:
+        for u, v, weight in grid_edges(args.spawn_grid, args.spawn_grid, seed=1):
+            edges_file.write(f"v{u},v{v},{weight}\n")
+
+    command = [sys.executable, SERVER, "--graph", edges_file.name, "--undirected",
+               "--port", str(args.port), "--pool", args.pool]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    return process, edges_file.name
+
+
+async def wait_for_server(host, port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            client = Client(host, port)
+            await client.request("GET", "/health")
+            client.close()
+            return True
+        except OSError:
+            await asyncio.sleep(0.2)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de rotas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=32, help="Clientes simultâneos")
+    parser.add_argument("--duration", type=float, default=10, help="Segundos de carga")
+    parser.add_argument("--write-ratio", type=float, default=0.0,
+                        help="Fração dos pedidos que adicionam arestas (padrão: 0)")
+    parser.add_argument("--spawn-grid", type=int, metavar="LADO",
+                        help="Sobe um servidor local com uma malha LADO x LADO")
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread",
+                        help="Pool do servidor iniciado com --spawn-grid")
+    args = parser.parse_args()
+
+    process = edges_path = None
+    if args.spawn_grid:
+        process, edges_path = spawn_server(args)
+    try:
+        if not asyncio.run(wait_for_server(args.host, args.port)):
+            print(f"✗ Servidor não respondeu em {args.host}:{args.port}.")
+            return
+        asyncio.run(run(args))
+    finally:
+        if process is not None:
+            # SIGTERM: o servidor fecha o pool de workers e apaga os snapshots antes de sair
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            os.remove(edges_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Armazenamento compacto das adjacências do Graph
+Os rótulos dos vértices são internados em ids inteiros densos e a lista de cada
+vértice vira dois arrays tipados (ids dos vizinhos e pesos), sem uma tupla e um
+peso "boxed" por aresta. Os pesos ficam em array('q') enquanto todos forem
+inteiros e passam para array('d') na primeira aresta com peso fracionário
+As arestas de entrada (busca reversa, remoção de vértices) usam o mesmo formato, com
+o menor peso entre as paralelas de cada origem, e só são montadas na primeira vez que
+alguém precisa delas
+Para compatibilidade, graph.graph[rótulo] continua devolvendo [(vizinho, peso), ...]
+"""
+
+from array import array
+from collections.abc import Mapping
+import sys
+
+
+class CompactAdjacency(Mapping):
+
+    def __init__(self):
+        self.ids = {}  # rótulo -> id
+        self.labels = []  # id -> rótulo (None nos ids liberados)
+        self.targets = []  # id -> array('i') com os ids dos vizinhos, ordenados por (rótulo, peso)
+        self.weights = []  # id -> array com os pesos, alinhado a targets
+        self.sources = None  # id -> array('i') com as origens das arestas que chegam (sem repetição); criado sob demanda
+        self.source_weights = None  # id -> menor peso entre as paralelas de cada origem, alinhado a sources
+        self.typecode = 'q'  # 'q' (inteiros) até a primeira aresta de peso fracionário; depois 'd'
+        self._free = []  # ids liberados por remoções, reaproveitados nas inserções
+
+    # ==================== MAPEAMENTO (COMPATIBILIDADE) ====================
+
+    def __getitem__(self, label):
+        # Como o defaultdict(list) de antes: vértice desconhecido não tem vizinhos
+        return list(self.neighbors(label))
+
+    def __contains__(self, label):
+        return label in self.ids
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def neighbors(self, label):
+        # Iterador de (vizinho, peso) sem montar a lista: usado nos laços das buscas
+        i = self.ids.get(label)
+        if i is None:
+            return iter(())
+        return zip(map(self.labels.__getitem__, self.targets[i]), self.weights[i])
+
+    def successors(self, label):
+        # Rótulos dos vizinhos de saída (repetidos se houver arestas paralelas)
+        return map(self.labels.__getitem__, self.targets[self.ids[label]])
+
+    def edge_weights(self, label):
+        return self.weights[self.ids[label]]
+
+    def degree(self, label):
+        return len(self.targets[self.ids[label]])
+
+    # ==================== VÉRTICES ====================
+
+    def add(self, label):
+        if label in self.ids:
+            return False
+        if self._free:
+            i = self._free.pop()
+            self.labels[i] = label
+        else:
+            i = len(self.labels)
+            self.labels.append(label)
+            self.targets.append(array('i'))
+            self.weights.append(array(self.typecode))
+            if self.sources is not None:
+                self.sources.append(array('i'))
+                self.source_weights.append(array(self.typecode))
+        self.ids[label] = i
+        return True
+
+    def discard(self, label):
+        # Libera o id; as arestas que chegam no vértice já devem ter sido removidas
+        i = self.ids.pop(label)
+        self.labels[i] = None
+        self.targets[i] = array('i')
+        self.weights[i] = array(self.typecode)
+        if self.sources is not None:
+            self.sources[i] = array('i')
+            self.source_weights[i] = array(self.typecode)
+        self._free.append(i)
+
+    # ==================== ARESTAS ====================
+
+    def insert(self, label, neighbor, weight):
+        # Inserção ordenada por (rótulo do vizinho, peso), como o insort na lista de tuplas
+        i, j = self.ids[label], self.ids[neighbor]
+        targets, weights, labels = self.targets[i], self.weights[i], self.labels
+        weight = self._stored(weight)
+        key = (neighbor, weight)
+        lo, hi = 0, len(targets)
+        try:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if key < (labels[targets[mid]], weights[mid]):
+                    hi = mid
+                else:
+                    lo = mid + 1
+        except TypeError:
+            # Rótulos de tipos não comparáveis: mantém a ordem de inserção
+            lo = len(targets)
+        self._insert_weight(i, lo, weight)
+        targets.insert(lo, j)
+
+    def append(self, label, neighbor, weight):
+        # Inserção no fim, sem ordenar (o lote chama sort uma vez por vértice no final)
+        i = self.ids[label]
+        self._insert_weight(i, len(self.targets[i]), self._stored(weight))
+        self.targets[i].append(self.ids[neighbor])
+
+    def sort(self, label):
+        i = self.ids[label]
+        targets, weights, labels = self.targets[i], self.weights[i], self.labels
+        try:
+            order = sorted(range(len(targets)), key=lambda k: (labels[targets[k]], weights[k]))
+        except TypeError:
+            return
+        self.targets[i] = array('i', [targets[k] for k in order])
+        self.weights[i] = array(self.typecode, [weights[k] for k in order])
+
+    def remove(self, label, neighbor):
+        # Remove todas as arestas (paralelas) de label para neighbor; devolve os pesos removidos
+        i, j = self.ids[label], self.ids[neighbor]
+        targets, weights = self.targets[i], self.weights[i]
+        removed = []
+        position = 0
+        while True:
+            try:
+                position = targets.index(j, position)
+            except ValueError:
+                return removed
+            removed.append(weights[position])
+            del targets[position]
+            del weights[position]
+
+    def _stored(self, weight):
+        # Float inteiro (430.0, como vem do float() da CLI) fica como int: só peso
+        # realmente fracionário promove os arrays para 'd'
+        if self.typecode == 'q' and isinstance(weight, float) and weight.is_integer():
+            return int(weight)
+        return weight
+
+    def _insert_weight(self, i, position, weight):
+        try:
+            self.weights[i].insert(position, weight)
+        except (TypeError, OverflowError):
+            self._promote()
+            self.weights[i].insert(position, weight)
+
+    def _promote(self):
+        # Peso fracionário (ou inteiro grande demais): todos os pesos passam a float
+        self.typecode = 'd'
+        self.weights = [array('d', weights) for weights in self.weights]
+        if self.source_weights is not None:
+            self.source_weights = [array('d', weights) for weights in self.source_weights]
+
+    # ==================== ARESTAS DE ENTRADA ====================
+
+    def edge_weight(self, label, neighbor):
+        # Menor peso entre as arestas (paralelas) label -> neighbor, ou None se não houver
+        i, j = self.ids.get(label), self.ids.get(neighbor)
+        if i is None or j is None:
+            return None
+        targets, weights = self.targets[i], self.weights[i]
+        best = None
+        position = 0
+        while True:
+            try:
+                position = targets.index(j, position)
+            except ValueError:
+                return best
+            if best is None or weights[position] < best:
+                best = weights[position]
+            position += 1
+
+    def predecessors(self, label):
+        # Rótulos das origens das arestas que chegam em label (uma vez cada)
+        return map(self.labels.__getitem__, self._reverse()[0][self.ids[label]])
+
+    def incoming(self, label):
+        # Iterador de (origem, menor peso), usado na busca reversa
+        sources, source_weights = self._reverse()
+        i = self.ids[label]
+        return zip(map(self.labels.__getitem__, sources[i]), source_weights[i])
+
+    def link(self, label, source, weight):
+        # Registra a aresta source -> label, guardando o menor peso entre as paralelas
+        if self.sources is None:
+            return
+        i, j = self.ids[label], self.ids[source]
+        sources = self.sources[i]
+        weight = self._stored(weight)
+        try:
+            position = sources.index(j)
+        except ValueError:
+            sources.append(j)
+            try:
+                self.source_weights[i].append(weight)
+            except (TypeError, OverflowError):
+                self._promote()
+                self.source_weights[i].append(weight)
+            return
+        if weight < self.source_weights[i][position]:
+            self.source_weights[i][position] = weight
+
+    def unlink(self, label, source):
+        # Esquece a origem source nas entradas de label
+        if self.sources is None:
+            return
+        i, j = self.ids[label], self.ids[source]
+        try:
+            position = self.sources[i].index(j)
+        except ValueError:
+            return
+        del self.sources[i][position]
+        del self.source_weights[i][position]
+
+    def _reverse(self):
+        # Monta as entradas na primeira consulta reversa; daí em diante link/unlink as mantêm
+        if self.sources is None:
+            sources = [array('i') for _ in self.labels]
+            source_weights = [array(self.typecode) for _ in self.labels]
+            for i, (targets, weights) in enumerate(zip(self.targets, self.weights)):
+                lightest = {}
+                for j, weight in zip(targets, weights):
+                    if j not in lightest or weight < lightest[j]:
+                        lightest[j] = weight
+                for j, weight in lightest.items():
+                    sources[j].append(i)
+                    source_weights[j].append(weight)
+            self.sources, self.source_weights = sources, source_weights
+        return self.sources, self.source_weights
+
+    # ==================== MEMÓRIA ====================
+
+    def memory(self):
+        # Bytes por estrutura (sys.getsizeof: os objetos dos rótulos contam à parte)
+        getsizeof = sys.getsizeof
+        return {
+            'vertex_ids': (getsizeof(self.ids) + getsizeof(self.labels) + getsizeof(self._free)
+                           + sum(getsizeof(i) for i in self.ids.values() if i > 256)),
+            'labels': sum(getsizeof(label) for label in self.ids),
+            'adjacency': (getsizeof(self.targets) + getsizeof(self.weights)
+                          + sum(getsizeof(targets) for targets in self.targets)
+                          + sum(getsizeof(weights) for weights in self.weights)),
+            'incoming': 0 if self.sources is None else (
+                getsizeof(self.sources) + getsizeof(self.source_weights)
+                + sum(getsizeof(sources) for sources in self.sources)
+                + sum(getsizeof(weights) for weights in self.source_weights)),
+        }
@@ -0,0 +1,102 @@
+"""
+Lote de alterações do Graph (with graph.batch(): ...)
+As operações ficam num buffer e só são aplicadas na saída do bloco, numa única
+passada: a versão do grafo muda uma vez e os ouvintes recebem um só evento.
+Se o bloco levantar uma exceção, o buffer é descartado e o grafo fica como estava
+Arestas repetidas (dentro do lote ou já existentes no grafo) seguem a política:
+- "min": fica uma só aresta, a de menor peso
+- "replace": o último peso informado substitui o anterior
+- "multi": todas entram como arestas paralelas (como no add_edge)
+"""
+
+from numbers import Real
+
+POLICIES = ('min', 'replace', 'multi')
+
+
+class GraphBatch:
+
+    def __init__(self, directed=True, policy="min"):
+        if policy not in POLICIES:
+            raise ValueError(f"Política de arestas desconhecida: '{policy}' (use {', '.join(POLICIES)})")
+        self.directed = directed
+        self.policy = policy
+        self._order = 0  # Contador das operações, para saber o que veio antes de cada remoção
+        self._vertices = {}  # {vértice: (ordem, coordenadas)} a inserir
+        self._edges = {}  # {(origem, destino): (ordem, peso)}; na política "multi", lista de pesos
+        self._removed_vertices = {}  # {vértice: ordem da última remoção}
+        self._removed_edges = {}  # {(origem, destino): None}: arestas do grafo a remover (dict mantém a ordem)
+        self.applied = None  # Contadores do que mudou no grafo, preenchidos na saída do bloco
+
+    def __len__(self):
+        return self._order
+
+    def _next(self):
+        self._order += 1
+        return self._order
+
+    def _alive(self, vertex, order):
+        # A operação de ordem `order` não foi desfeita por uma remoção posterior do vértice
+        return self._removed_vertices.get(vertex, 0) < order
+
+    # ==================== OPERAÇÕES ====================
+
+    def add_vertex(self, vertex, coordinates=None):
+        pending = self._vertices.get(vertex)
+        if pending is None or not self._alive(vertex, pending[0]):
+            self._vertices[vertex] = (self._next(), tuple(coordinates) if coordinates is not None else None)
+        elif coordinates is not None and pending[1] is None:
+            # Vértice já pendente (por exemplo, criado por uma aresta): só completa as coordenadas
+            self._vertices[vertex] = (pending[0], tuple(coordinates))
+
+    def add_edge(self, from_vertex, to_vertex, weight=1):
+        # Peso inválido falha aqui, dentro do bloco, antes de qualquer alteração no grafo
+        if not isinstance(weight, Real):
+            raise TypeError(f"Peso inválido: {weight!r}")
+        removed = self._removed_vertices
+        for vertex in (from_vertex, to_vertex):
+            if vertex not in self._vertices or vertex in removed:
+                self.add_vertex(vertex)
+
+        key = (from_vertex, to_vertex)
+        if not self.directed and key not in self._edges and (to_vertex, from_vertex) in self._edges:
+            key = (to_vertex, from_vertex)
+
+        order = self._next()
+        pending = self._edges.get(key)
+        if pending is not None and not (self._alive(from_vertex, pending[0]) and self._alive(to_vertex, pending[0])):
+            pending = None
+
+        if pending is None:
+            self._edges[key] = (order, [weight] if self.policy == "multi" else weight)
+        elif self.policy == "multi":
+            pending[1].append(weight)
+        elif self.policy == "replace" or weight < pending[1]:
+            self._edges[key] = (pending[0], weight)
+
+    def remove_vertex(self, vertex):
+        self._removed_vertices[vertex] = self._next()
+
+    def remove_edge(self, from_vertex, to_vertex):
+        # Cancela as inserções pendentes e marca a aresta do grafo (se houver) para remoção
+        self._next()
+        self._edges.pop((from_vertex, to_vertex), None)
+        if not self.directed:
+            self._edges.pop((to_vertex, from_vertex), None)
+        self._removed_edges[(from_vertex, to_vertex)] = None
+
+    # ==================== PLANO ====================
+
+    def plan(self):
+        # Remoções primeiro (valem para o grafo de antes do lote) e depois as inserções
+        # que não foram desfeitas por uma remoção posterior do vértice
+        if not self._removed_vertices:
+            vertices = [(vertex, coordinates) for vertex, (_, coordinates) in self._vertices.items()]
+            edges = [(from_vertex, to_vertex, weights) for (from_vertex, to_vertex), (_, weights) in self._edges.items()]
+        else:
+            vertices = [(vertex, coordinates) for vertex, (order, coordinates) in self._vertices.items()
+                        if self._alive(vertex, order)]
+            edges = [(from_vertex, to_vertex, weights)
+                     for (from_vertex, to_vertex), (order, weights) in self._edges.items()
+                     if self._alive(from_vertex, order) and self._alive(to_vertex, order)]
+        return list(self._removed_vertices), list(self._removed_edges), vertices, edges
@@ -0,0 +1,56 @@
+"""
+Cache LRU com contadores de acertos, falhas e remoções
+Usado pelo Graph para guardar árvores de menor caminho por origem
+"""
+
+from collections import OrderedDict
+import threading
+
+
+class LRUCache:
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize  # 0 desativa o cache
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        if not self.maxsize:
+            return None
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            # Remove as entradas usadas há mais tempo
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize
+        }
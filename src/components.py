@@ -0,0 +1,251 @@
+"""
+Índice de componentes para responder "existe rota?" sem busca
+- Grafo direcionado: componentes fortemente conexas (Tarjan iterativo), numeradas
+  em ordem topológica reversa: u só alcança v se id(u) >= id(v). Com ids
+  diferentes, a resposta exata vem de uma busca no DAG de condensação que
+  descarta as componentes de id menor que a do destino
+- Grafo não direcionado: rótulo da componente por vértice (uma travessia) e um
+  union-find sobre os rótulos, que absorve as arestas inseridas depois
+O índice escuta as alterações do Graph. Inserções que não mudam as componentes
+são aplicadas na hora; as demais marcam o índice como desatualizado e ele é
+reconstruído na próxima consulta exata (can_reach, components). Remoções só
+diminuem o alcance: o índice deixa de ser exato, mas continua provando "sem
+rota" (separated), sem reconstrução, para as buscas ponto a ponto
+"""
+
+
+def connected_components(vertices, neighbors):
+    """Componentes conexas por travessia com pilha: devolve {vértice: id da componente}.
+    neighbors(v) itera os vizinhos de v."""
+    label = {}
+    count = 0
+    for root in vertices:
+        if root in label:
+            continue
+        label[root] = count
+        stack = [root]
+        while stack:
+            vertex = stack.pop()
+            for neighbor in neighbors(vertex):
+                if neighbor not in label:
+                    label[neighbor] = count
+                    stack.append(neighbor)
+        count += 1
+    return label
+
+
+def strongly_connected_components(vertices, successors):
+    """Tarjan iterativo (pilha explícita). successors(v) itera os vizinhos de saída de v.
+    As componentes saem em ordem topológica reversa: cada uma depois de todas as que ela alcança."""
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in vertices:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            vertex, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(successors(neighbor))))
+                    break
+                if neighbor in on_stack and index[neighbor] < low[vertex]:
+                    low[vertex] = index[neighbor]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[vertex] < low[parent]:
+                        low[parent] = low[vertex]
+
+                # vertex é raiz de uma componente: desempilha até ele
+                if low[vertex] == index[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+
+    return components
+
+
+class UnionFind:
+
+    def __init__(self, items=()):
+        self.parent = {}
+        self.size = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item):
+        # Compressão por divisão pela metade: cada passo aponta para o avô
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
+
+
+class ComponentIndex:
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.version = -1  # Versão do grafo em que o índice é exato (-1: desatualizado)
+        self.sound_version = -1  # Versão em que o índice ainda prova "sem rota" (só superestima o alcance)
+        self._component = {}  # {vértice: id da componente} (não direcionado: id original)
+        self._members = []  # Direcionado: id -> vértices da componente
+        self._successors = []  # Direcionado: id -> ids alcançados por uma aresta (condensação)
+        self._union_find = None  # Não direcionado: junta ids de componentes ligadas depois
+        self.rebuild()
+        graph.subscribe(self._on_change)
+
+    def close(self):
+        self.graph.unsubscribe(self._on_change)
+
+    def rebuild(self):
+        graph = self.graph
+        if graph.directed:
+            # Ids seguem a ordem do Tarjan: sucessores sempre têm id menor
+            successors = graph.graph.successors
+            self._members = strongly_connected_components(graph.vertices, successors)
+            self._component = {vertex: i for i, members in enumerate(self._members) for vertex in members}
+            component = self._component
+            self._successors = [
+                {component[neighbor] for vertex in members for neighbor in successors(vertex)} - {i}
+                for i, members in enumerate(self._members)
+            ]
+        else:
+            self._component = connected_components(graph.vertices, graph.graph.successors)
+            self._union_find = UnionFind(set(self._component.values()))
+        self.version = self.sound_version = graph.version
+
+    # Resultado de _apply: a alteração manteve o índice exato, só a prova de "sem rota", ou nada
+    EXACT, SOUND, BROKEN = 2, 1, 0
+
+    def _on_change(self, event, *args):
+        # Só dá para atualizar no lugar se o índice acompanhava a versão anterior
+        version = self.graph.version
+        if self.sound_version != version - 1:
+            return
+        if event == "batch":
+            # Lote: uma versão só para todas as alterações; vale o pior resultado
+            (events,) = args
+            result = self.EXACT
+            for change in events:
+                result = min(result, self._apply(*change))
+                if result == self.BROKEN:
+                    break
+        else:
+            result = self._apply(event, *args)
+        if result >= self.SOUND:
+            self.sound_version = version
+        if result == self.EXACT and self.version == version - 1:
+            self.version = version
+
+    def _apply(self, event, *args):
+        if event == "add_vertex":
+            (vertex,) = args
+            if self.graph.directed:
+                self._component[vertex] = len(self._members)
+                self._members.append([vertex])
+                self._successors.append(set())
+            else:
+                # Id novo, maior que todos os já usados
+                self._component[vertex] = len(self._union_find.parent)
+                self._union_find.add(self._component[vertex])
+            return self.EXACT
+        if event == "add_edge":
+            from_vertex, to_vertex, _ = args
+            if not self.graph.directed:
+                self._union_find.union(self._component[from_vertex], self._component[to_vertex])
+                return self.EXACT
+            source, target = self._component[from_vertex], self._component[to_vertex]
+            if source > target:
+                # Aresta a favor da ordem topológica: não fecha ciclo entre componentes
+                self._successors[source].add(target)
+            elif source < target:
+                # Pode fundir componentes e inverte a ordem: só uma reconstrução resolve
+                return self.BROKEN
+            return self.EXACT
+        # Remoções só tiram caminhos: "sem rota" continua valendo
+        return self.SOUND
+
+    # ==================== CONSULTAS ====================
+
+    def component_of(self, vertex):
+        if self.graph.directed:
+            return self._component[vertex]
+        return self._union_find.find(self._component[vertex])
+
+    def components(self):
+        if self.graph.directed:
+            return [list(members) for members in self._members]
+        groups = {}
+        find = self._union_find.find
+        for vertex, component in self._component.items():
+            groups.setdefault(find(component), []).append(vertex)
+        return list(groups.values())
+
+    def separated(self, from_vertex, to_vertex):
+        # Teste O(1) para as buscas ponto a ponto: True só se o índice prova que não há
+        # rota; sem prova (ou índice desatualizado), False e a própria busca decide
+        if self.sound_version != self.graph.version:
+            return False
+        source, target = self._component.get(from_vertex), self._component.get(to_vertex)
+        if source is None or target is None:
+            return False
+        if self.graph.directed:
+            return source < target
+        find = self._union_find.find
+        return find(source) != find(target)
+
+    def reachable(self, from_vertex, to_vertex):
+        source, target = self.component_of(from_vertex), self.component_of(to_vertex)
+        if source == target:
+            return True
+        if not self.graph.directed or source < target:
+            return False
+        # Busca no DAG de condensação, sem passar por componentes de id menor que o destino
+        successors = self._successors
+        seen = {source}
+        stack = [source]
+        while stack:
+            for successor in successors[stack.pop()]:
+                if successor == target:
+                    return True
+                if successor > target and successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
@@ -0,0 +1,274 @@
+"""
+Contraction Hierarchies: pré-processamento para consultas repetidas de menor caminho
+O grafo é contraído vértice a vértice (inserindo atalhos) e as consultas usam
+apenas uma busca bidirecional "para cima" na hierarquia resultante
+"""
+
+import heapq
+import json
+import logging
+
+
+class ContractionHierarchy:
+
+    def __init__(self, labels, rank, forward, backward, directed=True, verbose=True, logger=None):
+        self.labels = labels  # id -> rótulo original do vértice
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.rank = rank  # Posição de cada vértice na ordem de contração
+        # Arestas "para cima": {vizinho: (peso, vértice do meio ou -1 se aresta original)}
+        self.forward = forward  # forward[u]: arestas u -> v com rank[v] > rank[u]
+        self.backward = backward  # backward[v]: arestas u -> v com rank[u] > rank[v], indexadas por u
+        self.directed = directed
+        self.verbose = verbose
+        self.logger = logger
+
+    def _log(self, message, level=logging.INFO):
+        if self.logger is not None:
+            self.logger.log(level, message)
+        elif self.verbose:
+            print(message)
+
+    # ==================== PRÉ-PROCESSAMENTO ====================
+
+    @classmethod
+    def from_graph(cls, graph, witness_limit=50):
+        csr = graph.freeze()
+        n = len(csr.labels)
+
+        # Grafo de trabalho: só o menor peso entre arestas paralelas, sem laços
+        out_edges = [{} for _ in range(n)]
+        in_edges = [{} for _ in range(n)]
+        for u in range(n):
+            for i in range(csr.offsets[u], csr.offsets[u + 1]):
+                v, weight = csr.targets[i], csr.weights[i]
+                if u != v and weight < out_edges[u].get(v, (float('infinity'),))[0]:
+                    out_edges[u][v] = (weight, -1)
+                    in_edges[v][u] = (weight, -1)
+
+        rank = [0] * n
+        deleted_neighbors = [0] * n
+
+        def contract(v, apply):
+            # Simula (ou aplica) a contração de v e devolve quantos atalhos seriam criados
+            shortcuts = 0
+            for u, (weight_in, _) in list(in_edges[v].items()):
+                if not out_edges[v]:
+                    break
+                limit = weight_in + max(weight for weight, _ in out_edges[v].values())
+                witness = cls._witness_search(out_edges, u, v, limit, witness_limit, set(out_edges[v]))
+
+                for w, (weight_out, _) in list(out_edges[v].items()):
+                    if w == u:
+                        continue
+                    via = weight_in + weight_out
+                    if witness.get(w, float('infinity')) <= via:
+                        continue
+                    shortcuts += 1
+                    if apply and via < out_edges[u].get(w, (float('infinity'),))[0]:
+                        out_edges[u][w] = (via, v)
+                        in_edges[w][u] = (via, v)
+            return shortcuts
+
+        def priority(v):
+            # Diferença de arestas + vizinhos já contraídos (espalha a contração)
+            return contract(v, False) - len(in_edges[v]) - len(out_edges[v]) + deleted_neighbors[v]
+
+        queue = [(priority(v), v) for v in range(n)]
+        heapq.heapify(queue)
+
+        forward = [None] * n
+        backward = [None] * n
+        order = 0
+
+        while queue:
+            _, v = heapq.heappop(queue)
+
+            # Atualização preguiçosa: recalcula e devolve à fila se piorou
+            current = priority(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            contract(v, True)
+            rank[v] = order
+            order += 1
+
+            # As arestas restantes de v ligam a vértices ainda não contraídos (rank maior)
+            forward[v] = out_edges[v]
+            backward[v] = in_edges[v]
+            for u in backward[v]:
+                del out_edges[u][v]
+                deleted_neighbors[u] += 1
+            for w in forward[v]:
+                del in_edges[w][v]
+                deleted_neighbors[w] += 1
+
+        return cls(list(csr.labels), rank, forward, backward, csr.directed,
+                   verbose=csr.verbose, logger=csr.logger)
+
+    @staticmethod
+    def _witness_search(out_edges, source, skip, limit, max_settled, targets):
+        # Dijkstra local a partir de source ignorando o vértice em contração;
+        # para cedo quando todos os vizinhos de saída do vértice já foram fixados
+        distances = {source: 0}
+        priority_queue = [(0, source)]
+        settled = 0
+        remaining = len(targets)
+
+        while priority_queue and settled < max_settled and remaining:
+            current_distance, u = heapq.heappop(priority_queue)
+            if current_distance > distances[u]:
+                continue
+            if current_distance > limit:
+                break
+            settled += 1
+            if u in targets:
+                remaining -= 1
+
+            for v, (weight, _) in out_edges[u].items():
+                if v == skip:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < distances.get(v, float('infinity')):
+                    distances[v] = new_distance
+                    heapq.heappush(priority_queue, (new_distance, v))
+
+        return distances
+
+    # ==================== CONSULTA ====================
+
+    def query(self, start_vertex, end_vertex):
+        if start_vertex not in self.index:
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        if end_vertex not in self.index:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        source, target = self.index[start_vertex], self.index[end_vertex]
+        infinity = float('infinity')
+
+        distances = ({source: 0}, {target: 0})
+        previous = ({source: -1}, {target: -1})
+        visited = (set(), set())
+        queues = [[(0, source)], [(0, target)]]
+        graphs = (self.forward, self.backward)
+        best, meeting = infinity, -1
+
+        # Busca bidirecional só subindo na hierarquia; cada lado para quando
+        # sua menor distância pendente já não pode melhorar o melhor caminho
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                if queues[side] and queues[side][0][0] >= best:
+                    queues[side] = []
+            if not queues[0] and not queues[1]:
+                break
+
+            side = 0 if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]) else 1
+            current_distance, u = heapq.heappop(queues[side])
+            if u in visited[side]:
+                continue
+            visited[side].add(u)
+
+            other = distances[1 - side]
+            if u in other and current_distance + other[u] < best:
+                best, meeting = current_distance + other[u], u
+
+            own = distances[side]
+            for v, (weight, _) in graphs[side][u].items():
+                new_distance = current_distance + weight
+                if new_distance < own.get(v, infinity):
+                    own[v] = new_distance
+                    previous[side][v] = u
+                    heapq.heappush(queues[side], (new_distance, v))
+
+        settled = len(visited[0]) + len(visited[1])
+        if meeting == -1:
+            return {'distances': {start_vertex: 0}, 'previous': {start_vertex: None},
+                    'path': [], 'settled': settled}
+
+        # Caminho na hierarquia: origem -> encontro -> destino
+        ids = []
+        current = meeting
+        while current != -1:
+            ids.append(current)
+            current = previous[0][current]
+        ids.reverse()
+        current = previous[1][meeting]
+        while current != -1:
+            ids.append(current)
+            current = previous[1][current]
+
+        path_ids, steps = self._unpack(ids)
+
+        labels = self.labels
+        path = [labels[u] for u in path_ids]
+        distances_along = {path[0]: 0}
+        previous_along = {path[0]: None}
+        total = 0
+        for i, weight in enumerate(steps, 1):
+            total += weight
+            distances_along[path[i]] = total
+            previous_along[path[i]] = path[i - 1]
+
+        return {
+            'distances': distances_along,
+            'previous': previous_along,
+            'path': path,
+            'settled': settled
+        }
+
+    def _edge(self, u, v):
+        # Cada aresta (u, v) fica guardada no vértice de menor rank
+        if self.rank[u] < self.rank[v]:
+            return self.forward[u][v]
+        return self.backward[v][u]
+
+    def _unpack(self, ids):
+        # Expande atalhos recursivamente (com pilha explícita) até as arestas originais
+        path = [ids[0]]
+        steps = []
+        for u, v in zip(ids, ids[1:]):
+            stack = [(u, v)]
+            while stack:
+                a, b = stack.pop()
+                weight, middle = self._edge(a, b)
+                if middle == -1:
+                    path.append(b)
+                    steps.append(weight)
+                else:
+                    stack.append((middle, b))
+                    stack.append((a, middle))
+        return path, steps
+
+    # ==================== SERIALIZAÇÃO ====================
+
+    def to_dict(self):
+        def encode(edges):
+            return [[[v, weight, middle] for v, (weight, middle) in adjacency.items()] for adjacency in edges]
+
+        return {
+            'labels': self.labels,
+            'directed': self.directed,
+            'rank': self.rank,
+            'forward': encode(self.forward),
+            'backward': encode(self.backward)
+        }
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        def decode(edges):
+            return [{v: (weight, middle) for v, weight, middle in adjacency} for adjacency in edges]
+
+        return cls(data['labels'], data['rank'], decode(data['forward']), decode(data['backward']),
+                   data['directed'], **kwargs)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with open(path, encoding='utf-8') as file:
+            return cls.from_dict(json.load(file), **kwargs)
@@ -0,0 +1,476 @@
+"""
+Snapshot imutável do grafo em formato CSR (Compressed Sparse Row)
+Vértices viram ids inteiros e as arestas ficam em arrays contíguos
+"""
+
+from array import array
+import heapq
+import logging
+
+try:
+    from .matrix import compute_distance_matrix
+    from .spanning import ALGORITHMS as SPANNING_ALGORITHMS
+    from .storage import load_csr, save_csr
+except ImportError:
+    from matrix import compute_distance_matrix
+    from spanning import ALGORITHMS as SPANNING_ALGORITHMS
+    from storage import load_csr, save_csr
+
+
+class CSRGraph:
+
+    def __init__(self, labels, offsets, targets, weights, directed=True, index=None,
+                 verbose=True, logger=None, coordinates=None):
+        self.labels = labels  # id -> rótulo original do vértice
+        self.offsets = offsets  # Arestas do vértice i ficam em [offsets[i], offsets[i + 1])
+        self.targets = targets  # id do vértice de destino de cada aresta
+        self.weights = weights  # Peso de cada aresta
+        self.directed = directed
+        self.coordinates = coordinates  # Opcional: latitude e longitude do vértice i em [2i, 2i + 2), NaN se ausente
+        self._index = index  # rótulo -> id, montado sob demanda
+        self._reverse = None  # (offsets, origens) das arestas de entrada, montado sob demanda
+        self.verbose = verbose
+        self.logger = logger
+
+    def _log(self, message, level=logging.INFO):
+        if self.logger is not None:
+            self.logger.log(level, message)
+        elif self.verbose:
+            print(message)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    def freeze(self):
+        # Já é imutável: quem aceita Graph ou CSRGraph chama freeze() sem distinguir os dois
+        return self
+
+    @classmethod
+    def from_graph(cls, graph):
+        # Ordena os rótulos para que a ordem dos ids siga a ordem dos nomes
+        try:
+            labels = sorted(graph.vertices)
+        except TypeError:
+            labels = list(graph.vertices)
+        index = {label: i for i, label in enumerate(labels)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+
+        # Ids internos do Graph -> ids do snapshot, sem procurar rótulo por aresta
+        adjacency = graph.graph
+        remap = array('i', [-1]) * len(adjacency.labels)
+        for label, i in adjacency.ids.items():
+            remap[i] = index[label]
+
+        for label in labels:
+            # Vizinhos ordenados uma única vez aqui, e não a cada visita
+            i = adjacency.ids[label]
+            for dest, weight in sorted(zip(map(remap.__getitem__, adjacency.targets[i]), adjacency.weights[i])):
+                targets.append(dest)
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        return cls(labels, offsets, targets, weights, graph.directed, index,
+                   verbose=graph.verbose, logger=graph.logger)
+
+    # ==================== PERSISTÊNCIA ====================
+
+    def save(self, path, coordinates=None):
+        save_csr(self, path, self.coordinates if coordinates is None else coordinates)
+
+    @classmethod
+    def load(cls, path, mmap=True, **kwargs):
+        # Com mmap=True os arrays apontam direto para o arquivo mapeado (sem cópia)
+        labels, offsets, targets, weights, directed, coordinates = load_csr(path, mmap)
+        return cls(labels, offsets, targets, weights, directed, coordinates=coordinates, **kwargs)
+
+    def edges(self):
+        # Gera (origem, destino, peso); no modo não direcionado cada aresta sai uma vez só
+        labels, targets, weights = self.labels, self.targets, self.weights
+        for u in range(len(labels)):
+            skip_loop = False
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                v = targets[i]
+                if not self.directed:
+                    if v < u:
+                        continue
+                    if v == u:
+                        # Laço aparece duas vezes na lista do próprio vértice
+                        skip_loop = not skip_loop
+                        if not skip_loop:
+                            continue
+                yield labels[u], labels[v], weights[i]
+
+    # ==================== CONSULTAS BÁSICAS ====================
+
+    @property
+    def vertices(self):
+        return set(self.labels)
+
+    def num_vertices(self):
+        return len(self.labels)
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def reverse_adjacency(self):
+        # Arestas de entrada no mesmo formato CSR: origens de v em [offsets[v], offsets[v + 1])
+        if not self.directed:
+            return self.offsets, self.targets
+        if self._reverse is None:
+            n = len(self.labels)
+            offsets, targets = self.offsets, self.targets
+            counts = array('q', [0]) * (n + 1)
+            for v in targets:
+                counts[v + 1] += 1
+            for v in range(n):
+                counts[v + 1] += counts[v]
+            sources = array('i', [0]) * len(targets)
+            position = array('q', counts[:n])
+            for u in range(n):
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = targets[i]
+                    sources[position[v]] = u
+                    position[v] += 1
+            self._reverse = (counts, sources)
+        return self._reverse
+
+    def get_neighbors(self, vertex):
+        u = self.index.get(vertex)
+        if u is None:
+            return []
+        labels, targets, weights = self.labels, self.targets, self.weights
+        return [(labels[targets[i]], weights[i]) for i in range(self.offsets[u], self.offsets[u + 1])]
+
+    def get_edge_weight(self, from_vertex, to_vertex):
+        u = self.index.get(from_vertex)
+        v = self.index.get(to_vertex)
+        if u is None or v is None:
+            return None
+
+        for i in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[i] == v:
+                return self.weights[i]
+        return None
+
+    # ==================== ALGORITMO DE DIJKSTRA ====================
+
+    def _dijkstra(self, source, target=-1):
+        n = len(self.labels)
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        distances = [float('infinity')] * n
+        previous = [-1] * n
+        distances[source] = 0
+        visited = bytearray(n)
+
+        priority_queue = [(0, source)]
+
+        while priority_queue:
+            current_distance, u = heapq.heappop(priority_queue)
+
+            if visited[u]:
+                continue
+            visited[u] = 1
+
+            if u == target:
+                break
+
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                new_distance = current_distance + weights[i]
+                if new_distance < distances[v]:
+                    distances[v] = new_distance
+                    previous[v] = u
+                    heapq.heappush(priority_queue, (new_distance, v))
+
+        return distances, previous
+
+    def dijkstra(self, start_vertex, end_vertex=None):
+        if start_vertex not in self.index:
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        if end_vertex is not None and end_vertex not in self.index:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        source = self.index[start_vertex]
+        target = self.index[end_vertex] if end_vertex is not None else -1
+        distances, previous = self._dijkstra(source, target)
+
+        # Reconstruir caminho se end_vertex foi especificado
+        path = []
+        if end_vertex is not None:
+            current = target
+            while current != -1:
+                path.append(self.labels[current])
+                current = previous[current]
+            path.reverse()
+
+            if path[0] != start_vertex:
+                path = []
+
+        labels = self.labels
+        return {
+            'distances': dict(zip(labels, distances)),
+            'previous': {labels[i]: (labels[p] if p != -1 else None) for i, p in enumerate(previous)},
+            'path': path if end_vertex is not None else None
+        }
+
+    # ==================== ALGORITMO DE BELLMAN-FORD ====================
+
+    def _bellman_ford(self, source):
+        n = len(self.labels)
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        infinity = float('infinity')
+
+        # Lista de arestas em arrays paralelos: origem[i] -> targets[i] com weights[i]
+        sources = array('i')
+        for u in range(n):
+            sources.extend([u] * (offsets[u + 1] - offsets[u]))
+
+        distances = [infinity] * n
+        previous = [-1] * n
+        distances[source] = 0
+
+        # Até V - 1 passadas; uma passada extra com alteração indica ciclo negativo
+        last_relaxed = -1
+        for _ in range(n):
+            last_relaxed = -1
+            for u, v, weight in zip(sources, targets, weights):
+                distance_u = distances[u]
+                if distance_u + weight < distances[v]:
+                    distances[v] = distance_u + weight
+                    previous[v] = u
+                    last_relaxed = v
+            if last_relaxed == -1:
+                break
+
+        cycle = None
+        if last_relaxed != -1:
+            # Volta V passos pelos predecessores para cair dentro do ciclo
+            vertex = last_relaxed
+            for _ in range(n):
+                vertex = previous[vertex]
+            cycle = [vertex]
+            current = previous[vertex]
+            while current != vertex:
+                cycle.append(current)
+                current = previous[current]
+            cycle.reverse()
+
+        return distances, previous, cycle
+
+    def bellman_ford(self, start_vertex, end_vertex=None):
+        if start_vertex not in self.index:
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        if end_vertex is not None and end_vertex not in self.index:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        distances, previous, cycle = self._bellman_ford(self.index[start_vertex])
+        labels = self.labels
+
+        path = None
+        if end_vertex is not None:
+            path = []
+            current = self.index[end_vertex]
+            if cycle is None and distances[current] != float('infinity'):
+                while current != -1:
+                    path.append(labels[current])
+                    current = previous[current]
+                path.reverse()
+
+        return {
+            'distances': dict(zip(labels, distances)),
+            'previous': {labels[i]: (labels[p] if p != -1 else None) for i, p in enumerate(previous)},
+            'path': path,
+            'negative_cycle': [labels[u] for u in cycle] if cycle is not None else None
+        }
+
+    def distance_matrix(self, sources, targets, workers=1):
+        missing = [vertex for vertex in (*sources, *targets) if vertex not in self.index]
+        if missing:
+            self._log(f"✗ Vértice '{missing[0]}' não encontrado.", logging.WARNING)
+            return None
+
+        # Uma busca por origem; com workers > 1 os arrays vão para memória compartilhada
+        return compute_distance_matrix(self, [self.index[s] for s in sources],
+                                       [self.index[t] for t in targets], workers)
+
+    # ==================== BUSCAS EM LARGURA E PROFUNDIDADE ====================
+
+    def bfs(self, start_vertex):
+        if start_vertex not in self.index:
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        offsets, targets, labels = self.offsets, self.targets, self.labels
+        source = self.index[start_vertex]
+
+        levels = [-1] * len(labels)
+        levels[source] = 0
+        order = [source]
+
+        # A própria lista de ordem serve de fila
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            next_level = levels[u] + 1
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if levels[v] == -1:
+                    levels[v] = next_level
+                    order.append(v)
+
+        return {
+            'order': [labels[u] for u in order],
+            'levels': {labels[u]: levels[u] for u in order}
+        }
+
+    def bfs_levels(self, start_vertex, alpha=14, beta=24):
+        # BFS por níveis que alterna entre passos top-down (expande a fronteira) e
+        # bottom-up (cada vértice não visitado procura um pai na fronteira), conforme
+        # o tamanho da fronteira. Devolve array('i') de níveis por id (-1: inalcançável)
+        if start_vertex not in self.index:
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        n = len(self.labels)
+        offsets, targets = self.offsets, self.targets
+        in_offsets, sources = self.reverse_adjacency()
+        source = self.index[start_vertex]
+
+        # Lista durante a busca (acesso mais rápido em Python); array compacto no fim
+        levels = [-1] * n
+        levels[source] = 0
+        frontier = [source]
+        unvisited = None  # Ids ainda sem nível, montados ao entrar no modo bottom-up
+        # Arestas que o bottom-up teria de examinar (entrada dos não visitados)
+        unexplored_edges = len(targets) - (in_offsets[source + 1] - in_offsets[source])
+        # Arestas que o top-down examinaria (saída da fronteira)
+        frontier_edges = offsets[source + 1] - offsets[source]
+        bottom_up = False
+        depth = 0
+
+        while frontier:
+            if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                bottom_up = True
+            elif bottom_up and len(frontier) < n / beta:
+                bottom_up = False
+            depth += 1
+            next_frontier = []
+
+            if bottom_up:
+                in_frontier = bytearray(n)
+                for u in frontier:
+                    in_frontier[u] = 1
+                if unvisited is None:
+                    unvisited = [v for v in range(n) if levels[v] < 0]
+                remaining = []
+                for v in unvisited:
+                    for u in sources[in_offsets[v]:in_offsets[v + 1]]:
+                        if in_frontier[u]:
+                            levels[v] = depth
+                            next_frontier.append(v)
+                            break
+                    else:
+                        remaining.append(v)
+                unvisited = remaining
+            else:
+                for u in frontier:
+                    for v in targets[offsets[u]:offsets[u + 1]]:
+                        if levels[v] < 0:
+                            levels[v] = depth
+                            next_frontier.append(v)
+                unvisited = None  # Desatualizada: remontada se voltar ao bottom-up
+
+            # Sem direção, entrada e saída coincidem: uma soma só
+            frontier_edges = sum(offsets[v + 1] - offsets[v] for v in next_frontier)
+            if self.directed:
+                unexplored_edges -= sum(in_offsets[v + 1] - in_offsets[v] for v in next_frontier)
+            else:
+                unexplored_edges -= frontier_edges
+            frontier = next_frontier
+
+        return array('i', levels)
+
+    def levels_to_bfs(self, levels):
+        # Converte o array de níveis para o formato de bfs(); dentro de um mesmo
+        # nível a ordem segue os ids (ordem dos rótulos), não a ordem da fila
+        labels = self.labels
+        buckets = []
+        for v, level in enumerate(levels):
+            if level >= 0:
+                while len(buckets) <= level:
+                    buckets.append([])
+                buckets[level].append(v)
+        order = [v for bucket in buckets for v in bucket]
+        return {
+            'order': [labels[v] for v in order],
+            'levels': {labels[v]: levels[v] for v in order}
+        }
+
+    def dfs(self, start_vertex):
+        if start_vertex not in self.index:
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+
+        offsets, targets, labels = self.offsets, self.targets, self.labels
+        source = self.index[start_vertex]
+
+        visited = bytearray(len(labels))
+        visited[source] = 1
+        order = [source]
+
+        # Pilha explícita de (vértice, próxima aresta a examinar): sem limite de recursão
+        stack = [(source, offsets[source])]
+        while stack:
+            u, i = stack[-1]
+            end = offsets[u + 1]
+            while i < end and visited[targets[i]]:
+                i += 1
+
+            if i == end:
+                stack.pop()
+                continue
+
+            v = targets[i]
+            stack[-1] = (u, i + 1)
+            visited[v] = 1
+            order.append(v)
+            stack.append((v, offsets[v]))
+
+        return [labels[u] for u in order]
+
+    # ==================== ÁRVORE GERADORA MÍNIMA ====================
+
+    def minimum_spanning_forest(self, algorithm="kruskal"):
+        if self.directed:
+            self._log("✗ Árvore geradora mínima exige grafo não direcionado.", logging.WARNING)
+            return None
+
+        if algorithm not in SPANNING_ALGORITHMS:
+            self._log(f"✗ Algoritmo '{algorithm}' desconhecido (use 'kruskal' ou 'prim').", logging.WARNING)
+            return None
+
+        n = len(self.labels)
+        forest = SPANNING_ALGORITHMS[algorithm](self.offsets, self.targets, self.weights, n)
+
+        labels = self.labels
+        edges = [(labels[u], labels[v], int(weight) if weight.is_integer() else weight)
+                 for u, v, weight in forest]
+        return {
+            'edges': edges,
+            'total_weight': sum(weight for _, _, weight in edges),
+            'components': n - len(edges)  # Uma árvore por componente conexa
+        }
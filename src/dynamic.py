@@ -0,0 +1,174 @@
+"""
+Árvore de menores caminhos mantida incrementalmente
+A árvore escuta as alterações do Graph e repara apenas a região afetada:
+- aresta nova (ou mais curta): propaga a redução de distância a partir do destino
+- aresta/vértice removido: invalida só a subárvore que dependia dele e a recalcula
+- origem removida: a árvore fica vazia e é refeita quando a origem voltar ao grafo
+Vale para pesos não negativos, como o Dijkstra
+"""
+
+import heapq
+
+
+class ShortestPathTree:
+
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.distances = {}  # Só vértices alcançáveis a partir da origem
+        self.previous = {}
+        self._children = {}  # {vértice: {filhos na árvore}} para achar subárvores sem varrer tudo
+        self.last_affected = 0  # Vértices recalculados na última atualização
+        self.version = graph.version
+
+        self.last_affected = self._rebuild()
+        graph.subscribe(self._on_change)
+
+    def close(self):
+        # Para de acompanhar o grafo
+        self.graph.unsubscribe(self._on_change)
+
+    # ==================== CONSULTAS ====================
+
+    def distance_to(self, vertex):
+        return self.distances.get(vertex, float('infinity'))
+
+    def path_to(self, vertex):
+        if vertex not in self.distances:
+            return []
+        path = []
+        while vertex is not None:
+            path.append(vertex)
+            vertex = self.previous[vertex]
+        path.reverse()
+        return path
+
+    # ==================== REPAROS ====================
+
+    def _set(self, vertex, distance, parent):
+        old_parent = self.previous.get(vertex)
+        if old_parent is not None:
+            self._children[old_parent].discard(vertex)
+        self.distances[vertex] = distance
+        self.previous[vertex] = parent
+        if parent is not None:
+            self._children.setdefault(parent, set()).add(vertex)
+
+    def _rebuild(self):
+        # Árvore inteira a partir da origem (construção, ou origem de volta ao grafo)
+        self.distances.clear()
+        self.previous.clear()
+        self._children.clear()
+        if self.source not in self.graph.vertices:
+            return 0
+        self._set(self.source, 0, None)
+        return self._relax([(0, self.source)])
+
+    def _invalidate(self):
+        # Origem removida: não há árvore até ela voltar
+        affected = len(self.distances)
+        self.distances.clear()
+        self.previous.clear()
+        self._children.clear()
+        return affected
+
+    def _decrease(self, seeds):
+        # Dijkstra a partir dos vértices cuja distância caiu
+        infinity = float('infinity')
+        priority_queue = []
+        for distance, vertex, parent in seeds:
+            if distance < self.distances.get(vertex, infinity):
+                self._set(vertex, distance, parent)
+                priority_queue.append((distance, vertex))
+        return self._relax(priority_queue)
+
+    def _relax(self, priority_queue):
+        infinity = float('infinity')
+        heapq.heapify(priority_queue)
+        touched = 0
+        while priority_queue:
+            current_distance, current_vertex = heapq.heappop(priority_queue)
+            if current_distance > self.distances.get(current_vertex, infinity):
+                continue
+            touched += 1
+
+            for neighbor, weight in self.graph.graph.neighbors(current_vertex):
+                new_distance = current_distance + weight
+                if new_distance < self.distances.get(neighbor, infinity):
+                    self._set(neighbor, new_distance, current_vertex)
+                    heapq.heappush(priority_queue, (new_distance, neighbor))
+        return touched
+
+    def _increase(self, root):
+        # Subárvore de root perdeu o caminho: descarta e reconecta pelos vizinhos de entrada
+        affected = set()
+        stack = [root]
+        while stack:
+            vertex = stack.pop()
+            affected.add(vertex)
+            stack.extend(self._children.pop(vertex, ()))
+
+        parent = self.previous.get(root)
+        if parent is not None and parent in self._children:
+            self._children[parent].discard(root)
+        for vertex in affected:
+            del self.distances[vertex]
+            del self.previous[vertex]
+
+        seeds = []
+        for vertex in affected:
+            if vertex not in self.graph.vertices:
+                continue
+            best, best_parent = float('infinity'), None
+            for predecessor, weight in self.graph.graph.incoming(vertex):
+                if predecessor in self.distances and self.distances[predecessor] + weight < best:
+                    best, best_parent = self.distances[predecessor] + weight, predecessor
+            if best_parent is not None:
+                seeds.append((best, vertex, best_parent))
+
+        self._decrease(seeds)
+        return len(affected)
+
+    def _on_change(self, event, *args):
+        if event == "batch":
+            # Repara uma alteração de cada vez, sobre o grafo já com o lote inteiro aplicado:
+            # as distâncias seguem sendo de caminhos que existem, e as inserções do fim as reduzem
+            (events,) = args
+            affected = 0
+            for change in events:
+                self._on_change(*change)
+                affected += self.last_affected
+            self.last_affected = affected
+
+        elif event == "add_vertex":
+            (vertex,) = args
+            # Origem de volta ao grafo: refaz a árvore (as arestas que chegarem depois a estendem)
+            self.last_affected = self._rebuild() if vertex == self.source else 0
+
+        elif event == "add_edge":
+            from_vertex, to_vertex, weight = args
+            seeds = []
+            if from_vertex in self.distances:
+                seeds.append((self.distances[from_vertex] + weight, to_vertex, from_vertex))
+            if not self.graph.directed and to_vertex in self.distances:
+                seeds.append((self.distances[to_vertex] + weight, from_vertex, to_vertex))
+            self.last_affected = self._decrease(seeds) if seeds else 0
+
+        elif event == "remove_edge":
+            from_vertex, to_vertex = args
+            self.last_affected = 0
+            if self.previous.get(to_vertex) == from_vertex:
+                self.last_affected += self._increase(to_vertex)
+            if not self.graph.directed and self.previous.get(from_vertex) == to_vertex:
+                self.last_affected += self._increase(from_vertex)
+
+        elif event == "remove_vertex":
+            (vertex,) = args
+            if vertex == self.source:
+                self.last_affected = self._invalidate()
+            elif vertex in self.distances:
+                self.last_affected = self._increase(vertex)
+            else:
+                self.last_affected = 0
+
+        self.version = self.graph.version
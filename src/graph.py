@@ -1,82 +1,369 @@
-from collections import deque, defaultdict
+from array import array
+from collections import deque
+from contextlib import contextmanager
 import heapq
+import logging
+import os
+from math import radians, sin, cos, asin, sqrt, isnan, nan
+import sys
+import time
+
+try:
+    from .adjacency import CompactAdjacency
+    from .batch import GraphBatch
+    from .cache import LRUCache
+    from .components import ComponentIndex
+    from .contraction import ContractionHierarchy
+    from .csr import CSRGraph
+    from .dynamic import ShortestPathTree
+    from .landmarks import STRATEGIES as LANDMARK_STRATEGIES, LandmarkIndex, graph_signature
+    from .loaders import read_edges
+    from .queues import make_queue
+except ImportError:
+    from adjacency import CompactAdjacency
+    from batch import GraphBatch
+    from cache import LRUCache
+    from components import ComponentIndex
+    from contraction import ContractionHierarchy
+    from csr import CSRGraph
+    from dynamic import ShortestPathTree
+    from landmarks import STRATEGIES as LANDMARK_STRATEGIES, LandmarkIndex, graph_signature
+    from loaders import read_edges
+    from queues import make_queue
+
+EARTH_RADIUS_KM = 6371.0
+_REVERSE = object()  # Marca as árvores reversas (até um destino) no cache de caminhos
+
+
+def great_circle_distance(origin, destination):
+    # Fórmula de haversine: distância em km entre dois pontos (latitude, longitude)
+    lat1, lon1 = map(radians, origin)
+    lat2, lon2 = map(radians, destination)
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def parse_coordinates(text):
+    # "latitude, longitude" digitado nas interfaces -> tupla; texto vazio -> None
+    if not text.strip():
+        return None
+    latitude, longitude = map(float, text.split(","))
+    return (latitude, longitude)
 
 
 class Graph:
     
-    def __init__(self, directed=True):
-        self.graph = defaultdict(list)  # Lista de adjacência: {vértice: [(vizinho, peso), ...]}
-        self.vertices = set()  # Conjunto de vértices
+    def __init__(self, directed=True, verbose=True, logger=None, cache_size=16):
+        # Lista de adjacência com rótulos internados em ids e arrays tipados;
+        # graph[vértice] ainda devolve [(vizinho, peso), ...]
+        self.graph = CompactAdjacency()
         self.directed = directed
+        self.coordinates = {}  # Opcional: {vértice: (latitude, longitude)}
+        self._negative_edges = 0  # Quantas arestas têm peso negativo (Dijkstra não se aplica)
+        self._fractional_edges = 0  # Quantas arestas têm peso não inteiro (sem filas inteiras)
+        self._max_weight = (-1, 0)  # (versão, maior peso) calculado sob demanda
+        self._frozen = (-1, None)  # (versão, snapshot CSR) reaproveitado até a próxima alteração
+        self._landmarks = (-1, None)  # (versão, tabelas ALT) reaproveitadas até a próxima alteração
+        self.verbose = verbose  # Se False, as mensagens das operações são descartadas
+        self.logger = logger  # Se informado, as mensagens vão para o logging em vez do terminal
+        self.version = 0  # Incrementada a cada alteração na estrutura do grafo
+        self._path_cache = LRUCache(cache_size)  # Árvores de Dijkstra por (origem, versão)
+        self._queried = LRUCache(4 * cache_size)  # (origem, versão) já consultadas uma vez com destino
+        self._listeners = []  # Funções avisadas a cada alteração (ex.: ShortestPathTree)
+        self._components = None  # Índice de componentes, criado na primeira consulta
+    
+    @property
+    def vertices(self):
+        # Visão (somente leitura) dos rótulos internados: sem um set duplicando as chaves
+        return self.graph.ids.keys()
+    
+    def _log(self, message, level=logging.INFO):
+        if self.logger is not None:
+            self.logger.log(level, message)
+        elif self.verbose:
+            print(message)
+    
+    def _touch(self):
+        # Nova versão: árvores em cache de versões anteriores deixam de ser usadas
+        self.version += 1
+    
+    def cache_stats(self):
+        # Contadores do cache de menor caminho (acertos, falhas, remoções)
+        return self._path_cache.stats()
+    
+    def memory_report(self):
+        # Bytes aproximados por estrutura (sys.getsizeof, sem contar duas vezes os
+        # rótulos e pesos compartilhados entre as estruturas)
+        getsizeof = sys.getsizeof
+        report = self.graph.memory()
+        report['coordinates'] = getsizeof(self.coordinates) + sum(
+            getsizeof(pair) + sum(map(getsizeof, pair)) for pair in self.coordinates.values())
+        snapshot = self._frozen[1]
+        report['snapshot'] = 0 if snapshot is None else sum(
+            map(getsizeof, (snapshot.labels, snapshot.offsets, snapshot.targets, snapshot.weights)))
+        landmarks = self._landmarks[1]
+        report['landmarks'] = 0 if landmarks is None else landmarks.memory()
+        report['total'] = sum(report.values())
+        return report
+    
+    def subscribe(self, callback):
+        # callback(evento, *argumentos) é chamado depois de cada alteração:
+        # ("add_vertex", v), ("add_edge", origem, destino, peso),
+        # ("remove_edge", origem, destino), ("remove_vertex", v) e, no fim de um lote,
+        # ("batch", [(evento, *argumentos), ...]) com as alterações na ordem em que foram aplicadas
+        self._listeners.append(callback)
+    
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, event, *args):
+        for callback in list(self._listeners):
+            callback(event, *args)
         
     # ==================== PARTE 1: OPERAÇÕES BÁSICAS DO GRAFO (7 pontos) ====================
     
-    def add_vertex(self, vertex):
-        if vertex not in self.vertices:
-            self.vertices.add(vertex)
-            if vertex not in self.graph:
-                self.graph[vertex] = []
-            print(f"✓ Vértice '{vertex}' adicionado.")
+    def _insert_vertex(self, vertex):
+        # Inserção sem mensagens, usada pelas operações públicas e pela carga em lote
+        if not self._place_vertex(vertex):
+            return False
+        self._touch()
+        if self._listeners:
+            self._notify("add_vertex", vertex)
+        return True
+    
+    def _place_vertex(self, vertex):
+        # Só a estrutura: sem versão nova e sem avisar os ouvintes (ver batch)
+        return self.graph.add(vertex)
+    
+    def _insert_edge(self, from_vertex, to_vertex, weight):
+        self._touch()
+        self._place_edge(from_vertex, to_vertex, weight)
+        if self._listeners:
+            self._notify("add_edge", from_vertex, to_vertex, weight)
+    
+    def _place_edge(self, from_vertex, to_vertex, weight):
+        self._count_weights((weight,), 1 if self.directed else 2)
+        # As entradas guardam o menor peso entre arestas paralelas (usado na busca reversa)
+        self.graph.insert(from_vertex, to_vertex, weight)
+        self.graph.link(to_vertex, from_vertex, weight)
+        
+        if not self.directed:
+            self.graph.insert(to_vertex, from_vertex, weight)
+            self.graph.link(from_vertex, to_vertex, weight)
+    
+    def _count_weights(self, weights, delta):
+        # Mantém os contadores de pesos negativos e não inteiros (delta < 0 na remoção)
+        for weight in weights:
+            if weight < 0:
+                self._negative_edges += delta
+            if not (isinstance(weight, int) or float(weight).is_integer()):
+                self._fractional_edges += delta
+    
+    def _drop_edges(self, from_vertex, to_vertex):
+        # Remove da lista de from_vertex todas as arestas (paralelas) para to_vertex
+        removed = self.graph.remove(from_vertex, to_vertex)
+        if self._negative_edges or self._fractional_edges:
+            self._count_weights(removed, -1)
+    
+    def add_vertex(self, vertex, coordinates=None):
+        if self._insert_vertex(vertex):
+            if coordinates is not None:
+                self.coordinates[vertex] = tuple(coordinates)
+            self._log(f"✓ Vértice '{vertex}' adicionado.")
             return True
-        print(f"✗ Vértice '{vertex}' já existe.")
+        self._log(f"✗ Vértice '{vertex}' já existe.", logging.WARNING)
         return False
     
     def remove_vertex(self, vertex):
         if vertex not in self.vertices:
-            print(f"✗ Vértice '{vertex}' não encontrado.")
+            self._log(f"✗ Vértice '{vertex}' não encontrado.", logging.WARNING)
             return False
         
-        # Remove o vértice do conjunto
-        self.vertices.remove(vertex)
+        self._touch()
+        self._unlink_vertex(vertex)
         
-        # Remove todas as arestas que partem deste vértice
-        if vertex in self.graph:
-            del self.graph[vertex]
+        if self._listeners:
+            self._notify("remove_vertex", vertex)
+        self._log(f"✓ Vértice '{vertex}' removido.")
+        return True
+    
+    def _unlink_vertex(self, vertex):
+        self.coordinates.pop(vertex, None)
         
-        # Remove todas as arestas que chegam neste vértice
-        for v in self.graph:
-            self.graph[v] = [(dest, weight) for dest, weight in self.graph[v] if dest != vertex]
+        # Remove todas as arestas que chegam neste vértice (só nos vizinhos de entrada)
+        for v in self.graph.predecessors(vertex):
+            if v != vertex:
+                self._drop_edges(v, vertex)
         
-        print(f"✓ Vértice '{vertex}' removido.")
-        return True
+        # Remove todas as arestas que partem deste vértice (arestas paralelas repetem o destino)
+        for dest in self.graph.successors(vertex):
+            if dest != vertex:
+                self.graph.unlink(dest, vertex)
+        if self._negative_edges or self._fractional_edges:
+            self._count_weights(self.graph.edge_weights(vertex), -1)
+        
+        # Libera o id do vértice (e os arrays das suas arestas)
+        self.graph.discard(vertex)
     
     def add_edge(self, from_vertex, to_vertex, weight=1):
         # Adiciona vértices automaticamente se não existirem
         self.add_vertex(from_vertex)
         self.add_vertex(to_vertex)
         
-        # Adiciona aresta (origem -> destino)
-        self.graph[from_vertex].append((to_vertex, weight))
-        
-        # Se não direcionado, adiciona aresta inversa (destino -> origem)
-        if not self.directed:
-            self.graph[to_vertex].append((from_vertex, weight))
+        # Adiciona aresta (origem -> destino) e, se não direcionado, a inversa
+        self._insert_edge(from_vertex, to_vertex, weight)
         
         direction = "→" if self.directed else "↔"
-        print(f"✓ Aresta {from_vertex} {direction} {to_vertex} (peso: {weight}) adicionada.")
+        self._log(f"✓ Aresta {from_vertex} {direction} {to_vertex} (peso: {weight}) adicionada.")
         return True
     
     def remove_edge(self, from_vertex, to_vertex):
         if from_vertex not in self.vertices or to_vertex not in self.vertices:
-            print(f"✗ Um dos vértices não existe.")
+            self._log(f"✗ Um dos vértices não existe.", logging.WARNING)
+            return False
+        
+        # Aresta inexistente: nada muda (nem a versão do grafo)
+        if self.graph.edge_weight(from_vertex, to_vertex) is None:
+            self._log(f"✗ Aresta não encontrada.", logging.WARNING)
             return False
         
-        # Remove aresta origem -> destino
-        original_length = len(self.graph[from_vertex])
-        self.graph[from_vertex] = [(dest, weight) for dest, weight in self.graph[from_vertex] 
-                                    if dest != to_vertex]
+        self._touch()
+        self._unlink_edge(from_vertex, to_vertex)
+        
+        if self._listeners:
+            self._notify("remove_edge", from_vertex, to_vertex)
+        self._log(f"✓ Aresta {from_vertex} → {to_vertex} removida.")
+        return True
+    
+    def _unlink_edge(self, from_vertex, to_vertex):
+        # Remove aresta origem -> destino (inclusive arestas paralelas)
+        self._drop_edges(from_vertex, to_vertex)
+        self.graph.unlink(to_vertex, from_vertex)
         
         # Se não direcionado, remove aresta destino -> origem
         if not self.directed:
-            self.graph[to_vertex] = [(dest, weight) for dest, weight in self.graph[to_vertex] 
-                                      if dest != from_vertex]
+            self._drop_edges(to_vertex, from_vertex)
+            self.graph.unlink(from_vertex, to_vertex)
+    
+    # ==================== CARGA EM LOTE ====================
+    
+    def add_vertices_from(self, vertices):
+        # Insere vários vértices sem emitir uma mensagem por vértice
+        return sum(1 for vertex in vertices if self._insert_vertex(vertex))
+    
+    def add_edges_from(self, edges):
+        # Aceita tuplas (origem, destino) ou (origem, destino, peso); peso padrão = 1
+        insert_vertex = self._insert_vertex
+        insert_edge = self._insert_edge
+        count = 0
+        for edge in edges:
+            from_vertex, to_vertex = edge[0], edge[1]
+            weight = edge[2] if len(edge) > 2 else 1
+            insert_vertex(from_vertex)
+            insert_vertex(to_vertex)
+            insert_edge(from_vertex, to_vertex, weight)
+            count += 1
+        return count
+    
+    @contextmanager
+    def batch(self, policy="min"):
+        # with graph.batch(): as alterações do bloco ficam num buffer e são aplicadas
+        # de uma vez na saída; se o bloco levantar exceção, o grafo não muda
+        pending = GraphBatch(self.directed, policy)
+        yield pending
+        pending.applied = self._apply_batch(pending)
+    
+    def _apply_batch(self, pending):
+        removed_vertices, removed_edges, new_vertices, new_edges = pending.plan()
+        events = [] if self._listeners else None
+        counts = {'removed_vertices': 0, 'removed_edges': 0, 'added_vertices': 0,
+                  'added_edges': 0, 'replaced_edges': 0, 'skipped_edges': 0}
         
-        if len(self.graph[from_vertex]) < original_length:
-            print(f"✓ Aresta {from_vertex} → {to_vertex} removida.")
-            return True
-        else:
-            print(f"✗ Aresta não encontrada.")
-            return False
+        for vertex in removed_vertices:
+            if vertex in self.vertices:
+                self._unlink_vertex(vertex)
+                counts['removed_vertices'] += 1
+                if events is not None:
+                    events.append(("remove_vertex", vertex))
+        
+        for from_vertex, to_vertex in removed_edges:
+            if self.graph.edge_weight(from_vertex, to_vertex) is not None:
+                self._unlink_edge(from_vertex, to_vertex)
+                counts['removed_edges'] += 1
+                if events is not None:
+                    events.append(("remove_edge", from_vertex, to_vertex))
+        
+        for vertex, coordinates in new_vertices:
+            if self._place_vertex(vertex):
+                counts['added_vertices'] += 1
+                if events is not None:
+                    events.append(("add_vertex", vertex))
+            if coordinates is not None and vertex not in self.coordinates:
+                self.coordinates[vertex] = coordinates
+        
+        # As arestas novas entram no fim das listas e cada lista tocada é ordenada
+        # uma vez só no final, em vez de uma inserção ordenada por aresta
+        graph = self.graph
+        policy = pending.policy
+        added = []
+        touched = set()
+        for from_vertex, to_vertex, weights in new_edges:
+            if policy != "multi":
+                # Duplicata de uma aresta que já está no grafo: mantém ou substitui, conforme a política
+                current = graph.edge_weight(from_vertex, to_vertex)
+                if current is not None:
+                    if policy == "min" and weights >= current:
+                        counts['skipped_edges'] += 1
+                        continue
+                    if policy == "replace" and [weight for dest, weight in graph.neighbors(from_vertex)
+                                                if dest == to_vertex] == [weights]:
+                        counts['skipped_edges'] += 1
+                        continue
+                    self._unlink_edge(from_vertex, to_vertex)
+                    counts['replaced_edges'] += 1
+                    if events is not None:
+                        events.append(("remove_edge", from_vertex, to_vertex))
+                weights = (weights,)
+            
+            for weight in weights:
+                graph.append(from_vertex, to_vertex, weight)
+                graph.link(to_vertex, from_vertex, weight)
+                if not self.directed:
+                    graph.append(to_vertex, from_vertex, weight)
+                    graph.link(from_vertex, to_vertex, weight)
+                added.append(weight)
+                if events is not None:
+                    events.append(("add_edge", from_vertex, to_vertex, weight))
+            touched.add(from_vertex)
+            touched.add(to_vertex)
+        
+        self._count_weights(added, 1 if self.directed else 2)
+        counts['added_edges'] = len(added)
+        for vertex in touched:
+            graph.sort(vertex)
+        
+        # Uma versão nova e um único aviso para o lote inteiro
+        if any(counts[key] for key in ('removed_vertices', 'removed_edges', 'added_vertices', 'added_edges')):
+            self._touch()
+            if self._listeners:
+                self._notify("batch", events)
+        
+        self._log(f"✓ Lote aplicado: +{counts['added_vertices']} vértices, +{counts['added_edges']} arestas, "
+                  f"-{counts['removed_vertices']} vértices, -{counts['removed_edges']} arestas "
+                  f"({counts['replaced_edges']} substituídas, {counts['skipped_edges']} duplicadas ignoradas).")
+        return counts
+    
+    @classmethod
+    def from_edge_list(cls, edges, directed=True, **kwargs):
+        graph = cls(directed=directed, **kwargs)
+        graph.add_edges_from(edges)
+        return graph
+    
+    @classmethod
+    def from_edge_file(cls, path, directed=True, delimiter=None, **kwargs):
+        # Lê o arquivo CSV/TSV linha a linha, sem carregá-lo inteiro na memória
+        return cls.from_edge_list(read_edges(path, delimiter), directed=directed, **kwargs)
     
     def display(self):
         print("\n" + "="*60)
@@ -114,123 +401,1009 @@ class Graph:
             return []
         return self.graph[vertex]
     
+    def set_coordinates(self, vertex, latitude, longitude):
+        if vertex not in self.vertices:
+            self._log(f"✗ Vértice '{vertex}' não encontrado.", logging.WARNING)
+            return False
+        self.coordinates[vertex] = (latitude, longitude)
+        return True
+    
     def get_edge_weight(self, from_vertex, to_vertex):
-        if from_vertex not in self.vertices:
+        # Com arestas paralelas, o menor peso (o que as buscas usam)
+        return self.graph.edge_weight(from_vertex, to_vertex)
+    
+    def freeze(self):
+        # Snapshot imutável em arrays (CSR) para consultas pesadas de leitura;
+        # como é imutável, o mesmo snapshot serve enquanto a versão não mudar
+        version, snapshot = self._frozen
+        if version != self.version:
+            snapshot = CSRGraph.from_graph(self)
+            self._frozen = (self.version, snapshot)
+        return snapshot
+    
+    def shortest_path_tree(self, source):
+        # Árvore de menores caminhos que se atualiza sozinha a cada alteração do grafo
+        if source not in self.vertices:
+            self._log(f"✗ Vértice '{source}' não encontrado.", logging.WARNING)
+            return None
+        return ShortestPathTree(self, source)
+    
+    def save(self, path):
+        # Grava o snapshot CSR em formato binário (ver storage.py), com as coordenadas se houver
+        snapshot = self.freeze()
+        coordinates = None
+        if self.coordinates:
+            coordinates = array('d')
+            for label in snapshot.labels:
+                coordinates.extend(self.coordinates.get(label, (nan, nan)))
+        snapshot.save(path, coordinates)
+    
+    @classmethod
+    def load(cls, path, mmap=False, **kwargs):
+        # Reconstrói um Graph editável; para só consultar, CSRGraph.load(path) mapeia sem copiar.
+        # Aqui os dados são copiados de qualquer jeito: mmap=True só evita ler o arquivo inteiro
+        # para a memória antes da cópia (o mapeamento é liberado junto com o snapshot)
+        snapshot = CSRGraph.load(path, mmap=mmap, verbose=False)
+        graph = cls(directed=snapshot.directed, **kwargs)
+        graph.add_vertices_from(snapshot.labels)
+        graph.add_edges_from((origin, destination, int(weight) if weight.is_integer() else weight)
+                             for origin, destination, weight in snapshot.edges())
+        coordinates = snapshot.coordinates
+        if coordinates is not None:
+            for i, label in enumerate(snapshot.labels):
+                latitude, longitude = coordinates[2 * i], coordinates[2 * i + 1]
+                if not isnan(latitude):
+                    graph.coordinates[label] = (latitude, longitude)
+        return graph
+    
+    def minimum_spanning_forest(self, algorithm="kruskal"):
+        # Árvore (ou floresta, se houver mais de uma componente) geradora mínima do grafo
+        # não direcionado; roda sobre o snapshot CSR, reaproveitado enquanto a versão não muda
+        return self.freeze().minimum_spanning_forest(algorithm)
+    
+    def contract(self, witness_limit=50):
+        # Pré-processamento (Contraction Hierarchies) para muitas consultas ponto a ponto
+        if self._negative_edges:
+            self._log("✗ O grafo tem arestas com peso negativo: a contração exige pesos não negativos.",
+                      logging.WARNING)
+            return None
+        return ContractionHierarchy.from_graph(self, witness_limit)
+    
+    def landmarks(self, k=8, strategy="farthest", path=None):
+        # Tabelas ALT reaproveitadas enquanto a versão não muda; com path, ficam em disco
+        # e só são recalculadas se a estrutura do grafo (assinatura) for outra
+        if self._negative_edges:
+            self._log("✗ O grafo tem arestas com peso negativo: landmarks exigem pesos não negativos.",
+                      logging.WARNING)
             return None
         
-        for neighbor, weight in self.graph[from_vertex]:
-            if neighbor == to_vertex:
-                return weight
-        return None
+        if strategy not in LANDMARK_STRATEGIES:
+            self._log(f"✗ Estratégia '{strategy}' desconhecida (use 'farthest' ou 'avoid').", logging.WARNING)
+            return None
+        
+        k = min(k, len(self.vertices))
+        version, index = self._landmarks
+        if index is not None and version == self.version and index.k == k and index.strategy == strategy:
+            return index
+        
+        signature = graph_signature(self.freeze())
+        if path and os.path.exists(path):
+            try:
+                index = LandmarkIndex.load(path)
+            except (OSError, ValueError) as error:
+                self._log(f"✗ Landmarks em '{path}' ignorados: {error}", logging.WARNING)
+                index = None
+            if index is not None and index.signature == signature and index.k == k and index.strategy == strategy:
+                self._landmarks = (self.version, index)
+                self._log(f"✓ {k} landmarks carregados de '{path}'.")
+                return index
+        
+        index = LandmarkIndex.from_graph(self, k, strategy)
+        self._landmarks = (self.version, index)
+        self._log(f"✓ {index.k} landmarks calculados ({strategy}).")
+        if path:
+            index.save(path)
+        return index
+    
+    def distance_bounds(self, from_vertex, to_vertex, k=8):
+        # (limite inferior, limite superior) de d(origem, destino) em O(k), sem busca
+        for vertex in (from_vertex, to_vertex):
+            if vertex not in self.vertices:
+                self._log(f"✗ Vértice '{vertex}' não encontrado.", logging.WARNING)
+                return None
+        
+        index = self.landmarks(k)
+        if index is None:
+            return None
+        return index.bounds(from_vertex, to_vertex)
+    
+    def has_negative_weights(self):
+        return self._negative_edges > 0
+    
+    def integer_max_weight(self):
+        # Maior peso se todos forem inteiros não negativos; None caso contrário
+        if self._negative_edges or self._fractional_edges:
+            return None
+        version, max_weight = self._max_weight
+        if version != self.version:
+            max_weight = max((max(weights) for weights in self.graph.weights if weights), default=0)
+            self._max_weight = (self.version, max_weight)
+        return max_weight
+    
+    # ==================== COMPONENTES ====================
+    
+    def _component_index(self):
+        # Criado sob demanda; depois acompanha as alterações e só é reconstruído
+        # quando uma alteração pode ter mudado as componentes
+        index = self._components
+        if index is None:
+            index = self._components = ComponentIndex(self)
+        elif index.version != self.version:
+            index.rebuild()
+        return index
+    
+    def components(self):
+        # Componentes fortemente conexas (direcionado) ou conexas (não direcionado),
+        # da maior para a menor
+        return sorted(self._component_index().components(), key=len, reverse=True)
+    
+    def component_of(self, vertex):
+        # Identificador da componente do vértice (válido até a próxima alteração)
+        if vertex not in self.vertices:
+            self._log(f"✗ Vértice '{vertex}' não encontrado.", logging.WARNING)
+            return None
+        return self._component_index().component_of(vertex)
+    
+    def can_reach(self, from_vertex, to_vertex):
+        # Existe caminho de from_vertex até to_vertex? Resposta exata (reconstrói o índice se preciso)
+        if from_vertex not in self.vertices or to_vertex not in self.vertices:
+            return False
+        return self._component_index().reachable(from_vertex, to_vertex)
+    
+    def _separated(self, from_vertex, to_vertex):
+        # Atalho das buscas ponto a ponto: só usa o índice se ele já existe e ainda prova
+        # "sem rota" em O(1); nunca o reconstrói (na dúvida, a própria busca responde)
+        index = self._components
+        return index is not None and index.separated(from_vertex, to_vertex)
     
     # ====================  ALGORITMO DE DIJKSTRA  ====================
     
-    def dijkstra(self, start_vertex, end_vertex=None):
+    def dijkstra(self, start_vertex, end_vertex=None, bidirectional=False, queue="heap", stats=None):
         if start_vertex not in self.vertices:
-            print(f"✗ Vértice inicial '{start_vertex}' não encontrado.")
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
             return None
         
-        if end_vertex and end_vertex not in self.vertices:
-            print(f"✗ Vértice final '{end_vertex}' não encontrado.")
+        if end_vertex is not None and end_vertex not in self.vertices:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
             return None
         
-        # Inicialização
-        distances = {vertex: float('infinity') for vertex in self.vertices}
-        distances[start_vertex] = 0
-        previous = {vertex: None for vertex in self.vertices}
+        if self._negative_edges:
+            self._log("✗ O grafo tem arestas com peso negativo: use Bellman-Ford.", logging.WARNING)
+            return None
         
-        # Fila de prioridade (min-heap): (distância, vértice)
-        priority_queue = [(0, start_vertex)]
-        visited = set()
+        if stats is not None:
+            stats.reset()
+            started = time.perf_counter()
+        
+        # Árvore da mesma origem já calculada nesta versão: só reconstrói o caminho
+        cache_key = (start_vertex, self.version)
+        cached = self._path_cache.get(cache_key)
+        
+        if cached is not None:
+            # Cópias: o chamador pode alterar o resultado sem corromper a árvore em cache
+            distances, previous = dict(cached[0]), dict(cached[1])
+            settled = 0
+            if stats is not None:
+                stats.cache_hit = True
+        elif end_vertex is not None and self._separated(start_vertex, end_vertex):
+            # Destino fora do alcance da origem: responde "sem rota" sem explorar nada
+            distances = {vertex: float('infinity') for vertex in self.vertices}
+            distances[start_vertex] = 0
+            previous = dict.fromkeys(self.vertices)
+            settled = 0
+        elif bidirectional and end_vertex is not None:
+            # Busca bidirecional só faz sentido com destino definido
+            result = self._bidirectional_dijkstra(start_vertex, end_vertex)
+            if stats is not None:
+                # Na busca bidirecional só o total de vértices fixados e o tempo são medidos
+                stats.settled = result['settled']
+                stats.wall_time = time.perf_counter() - started
+            return result
+        elif self._path_cache.maxsize and (end_vertex is None or self._queried.get(cache_key)):
+            # Árvore completa (sem destino, ou origem repetida): calcula uma vez e reaproveita
+            distances, previous, settled = self._dijkstra_tree(start_vertex, queue=queue, stats=stats)
+            self._path_cache.put(cache_key, (distances, previous))
+            distances, previous = dict(distances), dict(previous)
+        else:
+            # Primeira consulta da origem: para no destino; só a próxima paga a árvore completa
+            distances, previous, settled = self._dijkstra_tree(start_vertex, end_vertex, queue, stats)
+            if end_vertex is not None:
+                self._queried.put(cache_key, True)
+        
+        if stats is not None:
+            stats.wall_time = time.perf_counter() - started
+        
+        return {
+            'distances': distances,
+            'previous': previous,
+            'path': self.build_path(previous, start_vertex, end_vertex) if end_vertex is not None else None,
+            'settled': settled
+        }
+    
+    def build_path(self, previous, start_vertex, end_vertex):
+        # Reconstruir caminho seguindo os predecessores a partir do destino; público para
+        # quem reaproveita uma árvore (result['previous'] de dijkstra) com vários destinos
+        path = []
+        current = end_vertex
+        while current is not None:
+            path.append(current)
+            current = previous.get(current)
+        path.reverse()
+
+        # Se o primeiro vértice do caminho não é o inicial, não há caminho
+        if path[0] != start_vertex:
+            path = []
+        return path
+    
+    def _dijkstra_tree(self, start_vertex, end_vertex=None, queue="heap", stats=None):
+        if stats is not None:
+            return self._traced_dijkstra_tree(start_vertex, end_vertex, queue, stats)
+        
+        # Inicialização: a busca roda sobre os ids internos, com listas no lugar de dicts
+        adjacency = self.graph
+        labels, targets, weights = adjacency.labels, adjacency.targets, adjacency.weights
+        infinity = float('infinity')
+        distance = [infinity] * len(labels)
+        parent = [-1] * len(labels)
+        source = adjacency.ids[start_vertex]
+        target = adjacency.ids[end_vertex] if end_vertex is not None else -1
+        distance[source] = 0
+        
+        # Fila de prioridade: heap binário, ou Dial/radix se os pesos forem inteiros
+        max_weight = self.integer_max_weight() if queue != "heap" else None
+        priority_queue = make_queue(queue, max_weight)
+        push, pop = priority_queue.push, priority_queue.pop
+        push((0, source))
+        visited = bytearray(len(labels))
+        settled = 0
         
         # Algoritmo principal
         while priority_queue:
-            current_distance, current_vertex = heapq.heappop(priority_queue)
+            current_distance, current = pop()
             
             # Se já visitado, pular
-            if current_vertex in visited:
+            if visited[current]:
                 continue
             
             # Marcar como visitado
-            visited.add(current_vertex)
+            visited[current] = 1
+            settled += 1
             
             # Se encontrou o destino e só queremos um caminho específico, pode parar
-            if end_vertex and current_vertex == end_vertex:
+            if current == target:
                 break
             
             # Relaxamento das arestas (verificar vizinhos)
-            for neighbor, weight in self.graph[current_vertex]:
+            for neighbor, weight in zip(targets[current], weights[current]):
                 # Calcula nova distância
                 new_distance = current_distance + weight
                 
                 # Se encontrou caminho mais curto, atualiza
-                if new_distance < distances[neighbor]:
+                if new_distance < distance[neighbor]:
+                    distance[neighbor] = new_distance
+                    parent[neighbor] = current
+                    push((new_distance, neighbor))
+        
+        return self._label_tree(distance, parent) + (settled,)
+    
+    def _label_tree(self, distance, parent):
+        # Converte a árvore calculada sobre ids de volta para dicts por rótulo
+        labels = self.graph.labels
+        ids = self.graph.ids
+        distances = {vertex: distance[i] for vertex, i in ids.items()}
+        previous = {vertex: labels[parent[i]] if parent[i] >= 0 else None for vertex, i in ids.items()}
+        return distances, previous
+    
+    def _traced_dijkstra_tree(self, start_vertex, end_vertex, queue, stats):
+        # Mesma busca de _dijkstra_tree contando cada passo; fica separada para
+        # que a busca sem instrumentação não pague nenhum contador
+        hook = stats.hook
+        adjacency = self.graph
+        labels, targets, weights = adjacency.labels, adjacency.targets, adjacency.weights
+        infinity = float('infinity')
+        distance = [infinity] * len(labels)
+        parent = [-1] * len(labels)
+        source = adjacency.ids[start_vertex]
+        target = adjacency.ids[end_vertex] if end_vertex is not None else -1
+        distance[source] = 0
+        
+        max_weight = self.integer_max_weight() if queue != "heap" else None
+        priority_queue = make_queue(queue, max_weight)
+        push, pop = priority_queue.push, priority_queue.pop
+        push((0, source))
+        stats.pushes = stats.max_frontier = 1
+        if hook is not None:
+            hook('push', start_vertex, 0)
+        visited = bytearray(len(labels))
+        settled = 0
+        
+        while priority_queue:
+            current_distance, current = pop()
+            
+            if visited[current]:
+                stats.stale_pops += 1
+                if hook is not None:
+                    hook('stale', labels[current], current_distance)
+                continue
+            
+            visited[current] = 1
+            settled += 1
+            if hook is not None:
+                hook('settle', labels[current], current_distance)
+            
+            if current == target:
+                break
+            
+            for neighbor, weight in zip(targets[current], weights[current]):
+                stats.relaxations += 1
+                new_distance = current_distance + weight
+                if new_distance < distance[neighbor]:
+                    distance[neighbor] = new_distance
+                    parent[neighbor] = current
+                    push((new_distance, neighbor))
+                    stats.pushes += 1
+                    if hook is not None:
+                        hook('push', labels[neighbor], new_distance)
+            
+            if len(priority_queue) > stats.max_frontier:
+                stats.max_frontier = len(priority_queue)
+        
+        stats.settled = settled
+        return self._label_tree(distance, parent) + (settled,)
+    
+    def _bidirectional_dijkstra(self, start_vertex, end_vertex):
+        # Busca direta a partir da origem e reversa (arestas de entrada) a partir do destino.
+        # Só os vértices alcançados entram nos dicionários: 'distances' e 'previous' trazem
+        # os vértices tocados pela busca direta, e os do caminho com a distância exata.
+        infinity = float('infinity')
+        distances = ({start_vertex: 0}, {end_vertex: 0})
+        previous = ({start_vertex: None}, {end_vertex: None})
+        visited = (set(), set())
+        queues = ([(0, start_vertex)], [(0, end_vertex)])
+        
+        best = 0 if start_vertex == end_vertex else infinity
+        meeting = start_vertex if start_vertex == end_vertex else None
+        
+        while queues[0] and queues[1]:
+            # Critério de parada: nenhum caminho melhor pode passar pelas fronteiras
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            
+            # Expande o lado com a menor distância na fronteira
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            current_distance, current_vertex = heapq.heappop(queues[side])
+            
+            if current_vertex in visited[side]:
+                continue
+            visited[side].add(current_vertex)
+            
+            own, other = distances[side], distances[1 - side]
+            edges = self.graph.neighbors(current_vertex) if side == 0 else self.graph.incoming(current_vertex)
+            
+            for neighbor, weight in edges:
+                new_distance = current_distance + weight
+                if new_distance < own.get(neighbor, infinity):
+                    own[neighbor] = new_distance
+                    previous[side][neighbor] = current_vertex
+                    heapq.heappush(queues[side], (new_distance, neighbor))
+                
+                # Encontro das duas buscas
+                if neighbor in other and own[neighbor] + other[neighbor] < best:
+                    best = own[neighbor] + other[neighbor]
+                    meeting = neighbor
+        
+        forward_distances, forward_previous = distances[0], previous[0]
+        if meeting is None:
+            return {
+                'distances': forward_distances,
+                'previous': forward_previous,
+                'path': [],
+                'settled': len(visited[0]) + len(visited[1])
+            }
+        
+        # Metade inicial do caminho: origem -> ponto de encontro
+        path = []
+        current = meeting
+        while current is not None:
+            path.insert(0, current)
+            current = forward_previous[current]
+        
+        # Metade final: ponto de encontro -> destino, pela árvore reversa
+        current = meeting
+        while current != end_vertex:
+            following = previous[1][current]
+            forward_previous[following] = current
+            current = following
+            path.append(current)
+        
+        for vertex in path[path.index(meeting):]:
+            forward_distances[vertex] = best - distances[1][vertex]
+        
+        return {
+            'distances': forward_distances,
+            'previous': forward_previous,
+            'path': path,
+            'settled': len(visited[0]) + len(visited[1])
+        }
+    
+    # ==================== BUSCA A* (COORDENADAS GEOGRÁFICAS) ====================
+    
+    def _great_circle_heuristic(self, vertex, end_vertex):
+        # Distância em linha reta (km) é limite inferior para rotas medidas em km.
+        # Sem coordenadas em algum dos vértices, a estimativa é 0 (vira Dijkstra).
+        origin = self.coordinates.get(vertex)
+        destination = self.coordinates.get(end_vertex)
+        if origin is None or destination is None:
+            return 0
+        return great_circle_distance(origin, destination)
+    
+    def astar(self, start_vertex, end_vertex, heuristic=None):
+        if start_vertex not in self.vertices:
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        if end_vertex not in self.vertices:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        if self._negative_edges:
+            self._log("✗ O grafo tem arestas com peso negativo: use Bellman-Ford.", logging.WARNING)
+            return None
+        
+        # heuristic(vértice, destino) deve ser consistente (nunca superestimar)
+        if heuristic is None:
+            heuristic = self._great_circle_heuristic
+        
+        estimates = {}
+        
+        def estimate(vertex):
+            if vertex not in estimates:
+                estimates[vertex] = heuristic(vertex, end_vertex)
+            return estimates[vertex]
+        
+        infinity = float('infinity')
+        distances = {start_vertex: 0}
+        previous = {start_vertex: None}
+        visited = set()
+        
+        # Fila de prioridade: (distância + estimativa, distância, vértice);
+        # começa vazia se o destino nem é alcançável a partir da origem
+        priority_queue = []
+        if not self._separated(start_vertex, end_vertex):
+            priority_queue.append((estimate(start_vertex), 0, start_vertex))
+        
+        while priority_queue:
+            _, current_distance, current_vertex = heapq.heappop(priority_queue)
+            
+            if current_vertex in visited:
+                continue
+            visited.add(current_vertex)
+            
+            if current_vertex == end_vertex:
+                break
+            
+            for neighbor, weight in self.graph.neighbors(current_vertex):
+                new_distance = current_distance + weight
+                if new_distance < distances.get(neighbor, infinity):
                     distances[neighbor] = new_distance
                     previous[neighbor] = current_vertex
-                    heapq.heappush(priority_queue, (new_distance, neighbor))
+                    heapq.heappush(priority_queue, (new_distance + estimate(neighbor), new_distance, neighbor))
         
-        # Reconstruir caminho se end_vertex foi especificado
         path = []
-        if end_vertex:
+        if end_vertex in visited:
             current = end_vertex
             while current is not None:
                 path.insert(0, current)
                 current = previous[current]
-            
-            # Se o primeiro vértice do caminho não é o inicial, não há caminho
-            if path[0] != start_vertex:
-                path = []
         
         return {
             'distances': distances,
             'previous': previous,
-            'path': path if end_vertex else None
+            'path': path,
+            'settled': len(visited)
         }
     
-    # ==================== ALGORITMOS EXTRAS (BÔNUS - Opcional) ====================
+    def alt(self, start_vertex, end_vertex, k=8, strategy="farthest", path=None):
+        # A* com a heurística dos landmarks (ALT): não depende de coordenadas
+        if start_vertex not in self.vertices:
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        if end_vertex not in self.vertices:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        index = self.landmarks(k, strategy, path)
+        if index is None:
+            return None
+        
+        if self._separated(start_vertex, end_vertex):
+            return {'distances': {start_vertex: 0}, 'previous': {start_vertex: None}, 'path': [], 'settled': 0}
+        # A busca roda no snapshot da versão atual, com os mesmos ids das tabelas
+        return index.search(self.freeze(), start_vertex, end_vertex)
+    
+    # ==================== K MENORES CAMINHOS (YEN) ====================
+    
+    def _reverse_tree(self, end_vertex):
+        # Dijkstra reverso (arestas de entrada) a partir do destino: distância exata
+        # de cada vértice até end_vertex e o próximo passo rumo a ele. Fica no mesmo
+        # cache das árvores diretas, com chave de três elementos para não colidir
+        cache_key = (_REVERSE, end_vertex, self.version)
+        cached = self._path_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        to_end = {end_vertex: 0}
+        next_hop = {end_vertex: None}
+        visited = set()
+        priority_queue = [(0, end_vertex)]
+        while priority_queue:
+            current_distance, current_vertex = heapq.heappop(priority_queue)
+            if current_vertex in visited:
+                continue
+            visited.add(current_vertex)
+            for neighbor, weight in self.graph.incoming(current_vertex):
+                new_distance = current_distance + weight
+                if new_distance < to_end.get(neighbor, float('infinity')):
+                    to_end[neighbor] = new_distance
+                    next_hop[neighbor] = current_vertex
+                    heapq.heappush(priority_queue, (new_distance, neighbor))
+        
+        self._path_cache.put(cache_key, (to_end, next_hop))
+        return to_end, next_hop
     
-    def bfs(self, start_vertex):
+    def k_shortest_paths(self, start_vertex, end_vertex, k=3):
+        # Algoritmo de Yen: até k caminhos sem ciclos, do menor para o maior
         if start_vertex not in self.vertices:
-            print(f"✗ Vértice '{start_vertex}' não encontrado.")
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
             return None
         
+        if end_vertex not in self.vertices:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        if self._negative_edges:
+            self._log("✗ O grafo tem arestas com peso negativo: use Bellman-Ford.", logging.WARNING)
+            return None
+        
+        if k < 1 or self._separated(start_vertex, end_vertex):
+            return []
+        
+        # A árvore reversa dá o 1º caminho sem outra busca e serve de heurística
+        # exata (no grafo sem bloqueios) para as buscas de desvio
+        to_end, next_hop = self._reverse_tree(end_vertex)
+        if start_vertex not in to_end:
+            return []
+        
+        def tree_path(vertex):
+            path = [vertex]
+            while path[-1] != end_vertex:
+                path.append(next_hop[path[-1]])
+            return path
+        
+        def cost(path):
+            # Peso de cada passo = menor aresta entre os dois vértices
+            return [self.graph.edge_weight(u, v) for u, v in zip(path, path[1:])]
+        
+        first = tree_path(start_vertex)
+        accepted = [(to_end[start_vertex], first)]
+        seen = {tuple(first)}
+        candidates = []  # heap de (distância, ordem de chegada, caminho)
+        
+        while len(accepted) < k:
+            _, previous_path = accepted[-1]
+            steps = cost(previous_path)
+            
+            # Só faltam `needed` caminhos: candidatos além dos `needed` melhores nunca
+            # serão aceitos, e o custo do pior deles limita as próximas buscas
+            needed = k - len(accepted)
+            candidates = heapq.nsmallest(needed, candidates)
+            bound = [-distance for distance, _, _ in candidates]  # heap de máximo dos custos
+            heapq.heapify(bound)
+            
+            # Prefixo em comum de cada caminho aceito com o anterior (calculado uma vez)
+            common = []
+            for _, path in accepted:
+                length = 0
+                for a, b in zip(path, previous_path):
+                    if a != b:
+                        break
+                    length += 1
+                common.append(length)
+            
+            # Com spur = previous_path[j], os vértices da raiz previous_path[:j + 1] ficam
+            # bloqueados. first_hit(v) = menor índice de previous_path no caminho da árvore
+            # a partir de v: esse caminho está livre para o spur j se first_hit(v) > j.
+            # O memo vale para todos os spurs da rodada
+            position = {vertex: i for i, vertex in enumerate(previous_path)}
+            outside = len(previous_path)
+            hits = {}
+            
+            def first_hit(vertex):
+                walked = []
+                while vertex is not None and vertex not in hits:
+                    walked.append(vertex)
+                    vertex = next_hop[vertex]
+                result = outside if vertex is None else hits[vertex]
+                for vertex in reversed(walked):
+                    result = min(result, position.get(vertex, outside))
+                    hits[vertex] = result
+                return result
+            
+            root_cost = 0
+            for j, spur in enumerate(previous_path[:-1]):
+                limit = -bound[0] - root_cost if len(bound) == needed else float('infinity')
+                
+                # Nem o melhor desvio possível (árvore sem bloqueios) entraria entre os necessários
+                if to_end[spur] >= limit:
+                    root_cost += steps[j]
+                    continue
+                
+                # Arestas bloqueadas: saída de spur usada por caminhos com a mesma raiz
+                blocked_edges = {path[j + 1] for (_, path), length in zip(accepted, common)
+                                 if length > j and len(path) > j + 1}
+                
+                spur_path = self._spur_search(spur, j, end_vertex, position, blocked_edges,
+                                              to_end, next_hop, first_hit, limit)
+                if spur_path is not None:
+                    spur_cost, spur_vertices = spur_path
+                    path = previous_path[:j] + spur_vertices
+                    key = tuple(path)
+                    if key not in seen:
+                        seen.add(key)
+                        distance = root_cost + spur_cost
+                        heapq.heappush(candidates, (distance, len(seen), path))
+                        heapq.heappush(bound, -distance)
+                        if len(bound) > needed:
+                            heapq.heappop(bound)
+                
+                root_cost += steps[j]
+            
+            if not candidates:
+                break
+            distance, _, path = heapq.heappop(candidates)
+            accepted.append((distance, path))
+        
+        return [{'path': path, 'distance': distance} for distance, path in accepted]
+    
+    def _spur_search(self, spur, j, end_vertex, position, blocked_edges, to_end, next_hop, first_hit,
+                     limit=float('infinity')):
+        # A* de spur até o destino sem os vértices da raiz (índice <= j em position)
+        # nem as arestas bloqueadas: máscara, sem copiar o grafo. A heurística é a
+        # distância exata da árvore reversa: assim que sai da fila um vértice cujo
+        # caminho da árvore não toca a raiz, esse caminho completa a melhor rota.
+        # Desiste quando a estimativa atinge limit (o desvio não seria aproveitado)
+        outside = len(position)
+        infinity = float('infinity')
+        distances = {spur: 0}
+        previous = {spur: None}
         visited = set()
+        priority_queue = [(to_end.get(spur, infinity), 0, spur)]
+        
+        while priority_queue:
+            estimate, current_distance, current_vertex = heapq.heappop(priority_queue)
+            if estimate >= limit:
+                return None
+            if current_vertex in visited:
+                continue
+            visited.add(current_vertex)
+            
+            # No próprio spur, o primeiro passo da árvore pode ser uma aresta bloqueada
+            if current_vertex == spur:
+                following = next_hop.get(spur)
+                done = (following is not None and following not in blocked_edges
+                        and first_hit(following) > j)
+            else:
+                done = first_hit(current_vertex) > j
+            
+            if done:
+                path = []
+                vertex = current_vertex
+                while vertex is not None:
+                    path.append(vertex)
+                    vertex = previous[vertex]
+                path.reverse()
+                vertex = next_hop[current_vertex]
+                while vertex is not None:
+                    path.append(vertex)
+                    vertex = next_hop[vertex]
+                return current_distance + to_end[current_vertex], path
+            
+            for neighbor, weight in self.graph.neighbors(current_vertex):
+                if position.get(neighbor, outside) <= j or neighbor not in to_end:
+                    continue
+                if current_vertex == spur and neighbor in blocked_edges:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = current_vertex
+                    heapq.heappush(priority_queue, (new_distance + to_end[neighbor], new_distance, neighbor))
+        
+        return None
+    
+    # ==================== ALGORITMO DE BELLMAN-FORD ====================
+    
+    def bellman_ford(self, start_vertex, end_vertex=None, method="spfa"):
+        # method="spfa": fila de vértices alterados (só reexamina o que mudou)
+        # method="passes": passadas sobre o vetor de arestas do snapshot CSR,
+        #                  interrompidas assim que uma passada não altera nada
+        if start_vertex not in self.vertices:
+            self._log(f"✗ Vértice inicial '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        if end_vertex is not None and end_vertex not in self.vertices:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        if method == "passes":
+            return self.freeze().bellman_ford(start_vertex, end_vertex)
+        
+        distances, previous, suspect = self._spfa(start_vertex)
+        
+        negative_cycle = None
+        if suspect is not None:
+            negative_cycle = self._find_cycle(previous, suspect)
+            if negative_cycle is None:
+                # Predecessores ainda não fecharam o ciclo: confirma pelas passadas
+                return self.freeze().bellman_ford(start_vertex, end_vertex)
+        
+        infinity = float('infinity')
+        distances = {vertex: distances.get(vertex, infinity) for vertex in self.vertices}
+        previous = {vertex: previous.get(vertex) for vertex in self.vertices}
+        
+        path = None
+        if end_vertex is not None:
+            path = [] if negative_cycle else self.build_path(previous, start_vertex, end_vertex)
+        
+        return {
+            'distances': distances,
+            'previous': previous,
+            'path': path,
+            'negative_cycle': negative_cycle
+        }
+    
+    def _spfa(self, start_vertex):
+        # Devolve (distâncias, predecessores, vértice suspeito de ciclo negativo ou None)
+        infinity = float('infinity')
+        limit = len(self.vertices)
+        distances = {start_vertex: 0}
+        previous = {start_vertex: None}
+        edges_in_path = {start_vertex: 0}  # Nº de arestas do caminho atual até o vértice
         queue = deque([start_vertex])
-        order = []
-        levels = {start_vertex: 0}
+        in_queue = {start_vertex}
+        
+        while queue:
+            current_vertex = queue.popleft()
+            in_queue.discard(current_vertex)
+            current_distance = distances[current_vertex]
+            
+            for neighbor, weight in self.graph.neighbors(current_vertex):
+                new_distance = current_distance + weight
+                if new_distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = new_distance
+                    previous[neighbor] = current_vertex
+                    edges_in_path[neighbor] = edges_in_path[current_vertex] + 1
+                    
+                    # Caminho com V arestas ou mais só existe se houver ciclo negativo
+                    if edges_in_path[neighbor] >= limit:
+                        return distances, previous, neighbor
+                    
+                    if neighbor not in in_queue:
+                        in_queue.add(neighbor)
+                        queue.append(neighbor)
         
-        visited.add(start_vertex)
+        return distances, previous, None
+    
+    def _find_cycle(self, previous, vertex):
+        # Um ciclo no grafo de predecessores é sempre um ciclo negativo
+        seen = set()
+        while vertex is not None and vertex not in seen:
+            seen.add(vertex)
+            vertex = previous.get(vertex)
+        
+        if vertex is None:
+            return None
+        
+        cycle = [vertex]
+        current = previous[vertex]
+        while current != vertex:
+            cycle.append(current)
+            current = previous[current]
+        cycle.reverse()
+        return cycle
+    
+    # ==================== ALGORITMOS EXTRAS (BÔNUS - Opcional) ====================
+    
+    def iter_bfs(self, start_vertex, stats=None):
+        # Gerador: produz (vértice, nível) sob demanda; pode ser interrompido a qualquer momento
+        if start_vertex not in self.vertices:
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
+            return
+        
+        if stats is not None:
+            yield from self._traced_bfs(start_vertex, stats)
+            return
+        
+        # Percorre os ids internos; o rótulo só é buscado na hora de produzir o vértice
+        labels, targets = self.graph.labels, self.graph.targets
+        source = self.graph.ids[start_vertex]
+        visited = {source}
+        queue = deque([(source, 0)])
         
         while queue:
-            vertex = queue.popleft()
-            order.append(vertex)
+            vertex, level = queue.popleft()
+            yield labels[vertex], level
             
-            for neighbor, _ in sorted(self.graph[vertex]):
+            # Vizinhos já estão ordenados na lista de adjacência
+            for neighbor in targets[vertex]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append((neighbor, level + 1))
+    
+    def iter_dfs(self, start_vertex, stats=None):
+        # Gerador iterativo (pilha explícita): sem limite de recursão do Python
+        if start_vertex not in self.vertices:
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
+            return
+        
+        if stats is not None:
+            yield from self._traced_dfs(start_vertex, stats)
+            return
+        
+        labels, targets = self.graph.labels, self.graph.targets
+        source = self.graph.ids[start_vertex]
+        visited = {source}
+        yield start_vertex
+        stack = [iter(targets[source])]
+        
+        while stack:
+            for neighbor in stack[-1]:
                 if neighbor not in visited:
                     visited.add(neighbor)
-                    queue.append(neighbor)
-                    levels[neighbor] = levels[vertex] + 1
+                    yield labels[neighbor]
+                    stack.append(iter(targets[neighbor]))
+                    break
+            else:
+                stack.pop()
+    
+    def _traced_bfs(self, start_vertex, stats):
+        # Mesma BFS de iter_bfs contando cada passo; o tempo inclui o consumo do gerador
+        stats.reset()
+        hook = stats.hook
+        started = time.perf_counter()
         
-        return {
-            'order': order,
-            'levels': levels
-        }
+        labels, targets = self.graph.labels, self.graph.targets
+        source = self.graph.ids[start_vertex]
+        visited = {source}
+        queue = deque([(source, 0)])
+        stats.pushes = stats.max_frontier = 1
+        if hook is not None:
+            hook('push', start_vertex, 0)
+        
+        try:
+            while queue:
+                vertex, level = queue.popleft()
+                stats.settled += 1
+                if hook is not None:
+                    hook('settle', labels[vertex], level)
+                yield labels[vertex], level
+                
+                for neighbor in targets[vertex]:
+                    stats.relaxations += 1
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append((neighbor, level + 1))
+                        stats.pushes += 1
+                        if hook is not None:
+                            hook('push', labels[neighbor], level + 1)
+                
+                if len(queue) > stats.max_frontier:
+                    stats.max_frontier = len(queue)
+        finally:
+            # Também vale quando quem consome interrompe o gerador
+            stats.wall_time = time.perf_counter() - started
     
-    def dfs(self, start_vertex):
+    def _traced_dfs(self, start_vertex, stats):
+        # Mesma DFS de iter_dfs contando cada passo; a fronteira é a profundidade da pilha
+        stats.reset()
+        hook = stats.hook
+        started = time.perf_counter()
+        
+        try:
+            labels, targets = self.graph.labels, self.graph.targets
+            source = self.graph.ids[start_vertex]
+            visited = {source}
+            stats.settled = stats.pushes = stats.max_frontier = 1
+            if hook is not None:
+                hook('settle', start_vertex, 0)
+            yield start_vertex
+            stack = [iter(targets[source])]
+            
+            while stack:
+                for neighbor in stack[-1]:
+                    stats.relaxations += 1
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        stats.settled += 1
+                        stats.pushes += 1
+                        if hook is not None:
+                            hook('settle', labels[neighbor], len(stack))
+                        yield labels[neighbor]
+                        stack.append(iter(targets[neighbor]))
+                        if len(stack) > stats.max_frontier:
+                            stats.max_frontier = len(stack)
+                        break
+                else:
+                    stack.pop()
+        finally:
+            stats.wall_time = time.perf_counter() - started
+    
+    def bfs(self, start_vertex, end_vertex=None, stats=None):
         if start_vertex not in self.vertices:
-            print(f"✗ Vértice '{start_vertex}' não encontrado.")
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
             return None
         
-        visited = set()
-        order = []
+        if end_vertex is not None and end_vertex not in self.vertices:
+            self._log(f"✗ Vértice final '{end_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        # Com destino: para ao alcançá-lo e devolve o caminho com menos arestas;
+        # destino fora do alcance responde na hora, sem percorrer nada
+        if end_vertex is not None and self._separated(start_vertex, end_vertex):
+            return {'order': [], 'levels': {}, 'path': []}
         
-        def dfs_recursive(vertex):
-            visited.add(vertex)
+        order = []
+        levels = {}
+        for vertex, level in self.iter_bfs(start_vertex, stats):
             order.append(vertex)
-            
-            for neighbor, _ in sorted(self.graph[vertex]):
-                if neighbor not in visited:
-                    dfs_recursive(neighbor)
+            levels[vertex] = level
+            if vertex == end_vertex:
+                break
+        
+        if end_vertex is None:
+            return {
+                'order': order,
+                'levels': levels
+            }
+        
+        if end_vertex not in levels:
+            # Percorreu tudo o que a origem alcança sem chegar ao destino
+            return {'order': order, 'levels': levels, 'path': []}
+        
+        # Volta do destino pela origem: qualquer vizinho de entrada um nível acima serve
+        path = [end_vertex]
+        while path[-1] != start_vertex:
+            level = levels[path[-1]] - 1
+            path.append(next(u for u in self.graph.predecessors(path[-1]) if levels.get(u) == level))
+        path.reverse()
         
-        dfs_recursive(start_vertex)
-        return order
\ No newline at end of file
+        return {
+            'order': order,
+            'levels': levels,
+            'path': path
+        }
+    
+    def dfs(self, start_vertex, stats=None):
+        if start_vertex not in self.vertices:
+            self._log(f"✗ Vértice '{start_vertex}' não encontrado.", logging.WARNING)
+            return None
+        
+        return list(self.iter_dfs(start_vertex, stats))
+    
+    # ==================== MATRIZ DE DISTÂNCIAS ====================
+    
+    def distance_matrix(self, sources, targets, workers=1):
+        # matrix[i, j] = menor distância de sources[i] até targets[j] (inf se inalcançável),
+        # num único array contíguo (matrix.values)
+        return self.freeze().distance_matrix(sources, targets, workers)
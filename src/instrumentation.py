@@ -0,0 +1,42 @@
+"""
+Instrumentação opcional das buscas (Dijkstra, BFS e DFS)
+Um SearchStats passado para a busca é preenchido com os contadores da chamada e
+repassa cada evento ao gancho, se houver. Sem SearchStats, as buscas seguem pelo
+caminho normal, sem nenhum contador
+"""
+
+
+class SearchStats:
+
+    FIELDS = ('settled', 'relaxations', 'pushes', 'stale_pops', 'max_frontier', 'wall_time', 'cache_hit')
+
+    def __init__(self, hook=None):
+        # hook(evento, vértice, valor) recebe cada passo da busca:
+        # 'settle' (vértice fixado/visitado, valor = distância, nível ou profundidade),
+        # 'push' (vértice entrou na fronteira) e 'stale' (entrada obsoleta descartada)
+        self.hook = hook
+        self.reset()
+
+    def reset(self):
+        self.settled = 0  # Vértices fixados (Dijkstra) ou visitados (BFS/DFS)
+        self.relaxations = 0  # Arestas examinadas a partir dos vértices fixados
+        self.pushes = 0  # Inserções na fila/pilha
+        self.stale_pops = 0  # Remoções de entradas já superadas (Dijkstra)
+        self.max_frontier = 0  # Maior tamanho da fila/pilha durante a busca
+        self.wall_time = 0.0  # Segundos de relógio da chamada
+        self.cache_hit = False  # Dijkstra respondido pela árvore em cache (sem busca)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def summary(self):
+        # Linha curta para exibir ao lado da rota
+        if self.cache_hit:
+            return f"árvore em cache, {self.wall_time * 1000:.2f} ms"
+        return (f"{self.settled} vértices fixados, {self.relaxations} arestas examinadas, "
+                f"{self.pushes} inserções ({self.stale_pops} obsoletas), "
+                f"fronteira máx. {self.max_frontier}, {self.wall_time * 1000:.2f} ms")
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"SearchStats({fields})"
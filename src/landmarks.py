@@ -0,0 +1,321 @@
+"""
+Landmarks (ALT): limites de distância por desigualdade triangular
+Pré-processamento: escolhe k landmarks e guarda, para cada vértice v, d(L, v) e
+d(v, L) em arrays (vértice a vértice, k valores seguidos). Com eles:
+- limite inferior de d(u, v): max(d(L, v) - d(L, u), d(u, L) - d(v, L)) em O(k)
+- limite superior de d(u, v): min(d(u, L) + d(L, v)) em O(k)
+O limite inferior é consistente e serve de heurística para o A* (Graph.alt)
+Escolha dos landmarks:
+- "farthest": cada novo landmark é o vértice mais distante dos já escolhidos
+- "avoid": desce na árvore de menores caminhos de uma raiz aleatória rumo à
+  subárvore com os piores limites e sem landmark (Goldberg e Werneck)
+"""
+
+from array import array
+import hashlib
+import heapq
+import json
+from operator import add, sub
+import random
+import struct
+import sys
+
+MAGIC = b'GRAFOALT'
+HEADER = struct.Struct('<8sBBBxxxxxQQQ16s')  # magic, dirigido, estratégia, little-endian, V, k, bytes dos rótulos, assinatura
+
+STRATEGIES = ('farthest', 'avoid')
+INFINITY = float('infinity')
+
+
+def graph_signature(csr):
+    """Resumo (16 bytes) da estrutura do snapshot: muda se vértices, arestas ou pesos mudarem."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(bytes([int(csr.directed)]))
+    digest.update(repr(list(csr.labels)).encode('utf-8'))
+    for values in (csr.offsets, csr.targets, csr.weights):
+        digest.update(values)
+    return digest.digest()
+
+
+def _reverse_csr(csr):
+    # Arestas de entrada com os pesos, no mesmo formato (ordenação por contagem)
+    n = len(csr.labels)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    counts = array('q', [0]) * (n + 1)
+    for v in targets:
+        counts[v + 1] += 1
+    for v in range(n):
+        counts[v + 1] += counts[v]
+    sources = array('i', [0]) * len(targets)
+    reverse_weights = array('d', [0.0]) * len(targets)
+    position = array('q', counts[:n])
+    for u in range(n):
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            sources[position[v]] = u
+            reverse_weights[position[v]] = weights[i]
+            position[v] += 1
+    return type(csr)(csr.labels, counts, sources, reverse_weights, csr.directed, verbose=False)
+
+
+class LandmarkIndex:
+
+    def __init__(self, labels, landmarks, forward, backward, directed=True, strategy="farthest", signature=b''):
+        self.labels = labels  # id -> rótulo (mesma ordem do snapshot CSR)
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.landmarks = landmarks  # ids dos landmarks escolhidos
+        self.k = len(landmarks)
+        # forward[v * k + i] = d(L_i, v) e backward[v * k + i] = d(v, L_i) (infinito se não há caminho)
+        self.forward = forward
+        self.backward = backward  # No grafo não direcionado, o mesmo array de forward
+        self.directed = directed
+        self.strategy = strategy
+        self.signature = signature  # graph_signature do snapshot usado no pré-processamento
+
+    # ==================== PRÉ-PROCESSAMENTO ====================
+
+    @classmethod
+    def from_graph(cls, graph, k=8, strategy="farthest", seed=0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estratégia de landmarks desconhecida: '{strategy}' (use {', '.join(STRATEGIES)})")
+
+        csr = graph.freeze()
+        reverse = _reverse_csr(csr) if csr.directed else csr
+        n = len(csr.labels)
+        k = min(k, n)
+        rng = random.Random(seed)
+
+        landmarks = []
+        trees = []  # Por landmark: (d(L, v), d(v, L)) como listas
+        nearest = [INFINITY] * n  # Ida e volta até o landmark mais próximo (estratégia "farthest")
+        while len(landmarks) < k:
+            if strategy == "farthest":
+                landmark = _select_farthest(csr, nearest, landmarks, rng)
+            else:
+                landmark = _select_avoid(csr, trees, landmarks, rng)
+            if landmark is None:
+                break
+            landmarks.append(landmark)
+            to_all = csr._dijkstra(landmark)[0]
+            from_all = reverse._dijkstra(landmark)[0] if csr.directed else to_all
+            trees.append((to_all, from_all))
+            if strategy == "farthest":
+                nearest = list(map(min, nearest, map(add, to_all, from_all)))
+
+        # Tabelas vértice a vértice: os k valores de cada vértice ficam contíguos
+        k = len(landmarks)
+        forward = array('d', [0.0]) * (n * k)
+        for i, (to_all, _) in enumerate(trees):
+            forward[i::k] = array('d', to_all)
+        backward = forward
+        if csr.directed:
+            backward = array('d', [0.0]) * (n * k)
+            for i, (_, from_all) in enumerate(trees):
+                backward[i::k] = array('d', from_all)
+
+        return cls(csr.labels, landmarks, forward, backward, csr.directed, strategy, graph_signature(csr))
+
+    # ==================== LIMITES ====================
+
+    def _lower(self, u, v):
+        # d(L, v) - d(L, u) e d(u, L) - d(v, L) para cada landmark. Com distâncias infinitas:
+        # +inf (L alcança u mas não v, ou v alcança L mas u não) prova que v está fora do
+        # alcance de u; -inf e nan (inf - inf) não dizem nada e perdem para o 0 inicial
+        k = self.k
+        forward, backward = self.forward, self.backward
+        return max(0, *map(sub, forward[v * k:v * k + k], forward[u * k:u * k + k]),
+                   *map(sub, backward[u * k:u * k + k], backward[v * k:v * k + k]))
+
+    def _upper(self, u, v):
+        k = self.k
+        return min(map(add, self.backward[u * k:u * k + k], self.forward[v * k:v * k + k]), default=INFINITY)
+
+    def lower_bound(self, from_vertex, to_vertex):
+        # Mesma assinatura das heurísticas do Graph.astar; vértice desconhecido: limite trivial
+        u, v = self.index.get(from_vertex), self.index.get(to_vertex)
+        if u is None or v is None:
+            return 0
+        return self._lower(u, v)
+
+    def upper_bound(self, from_vertex, to_vertex):
+        u, v = self.index.get(from_vertex), self.index.get(to_vertex)
+        if u is None or v is None:
+            return INFINITY
+        return self._upper(u, v)
+
+    def bounds(self, from_vertex, to_vertex):
+        return self.lower_bound(from_vertex, to_vertex), self.upper_bound(from_vertex, to_vertex)
+
+    # ==================== BUSCA ORIENTADA (A*) ====================
+
+    def search(self, csr, start_vertex, end_vertex):
+        """A* sobre o snapshot CSR que originou as tabelas (mesma assinatura, mesmos ids)."""
+        source, target = self.index[start_vertex], self.index[end_vertex]
+        k = self.k
+        forward, backward = self.forward, self.backward
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        # As fatias do destino são fixas durante a busca
+        to_target = forward[target * k:target * k + k]
+        from_target = backward[target * k:target * k + k]
+
+        distances = {source: 0}
+        previous = {source: -1}
+        estimates = {}
+        visited = set()
+        priority_queue = [(0, 0, source)]
+
+        while priority_queue:
+            _, current_distance, u = heapq.heappop(priority_queue)
+            if u in visited:
+                continue
+            visited.add(u)
+            if u == target:
+                break
+
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                new_distance = current_distance + weights[i]
+                if new_distance < distances.get(v, INFINITY):
+                    estimate = estimates.get(v)
+                    if estimate is None:
+                        a = v * k
+                        estimate = estimates[v] = max(0, *map(sub, to_target, forward[a:a + k]),
+                                                      *map(sub, backward[a:a + k], from_target))
+                    if estimate == INFINITY:
+                        continue  # v não alcança o destino
+                    distances[v] = new_distance
+                    previous[v] = u
+                    heapq.heappush(priority_queue, (new_distance + estimate, new_distance, v))
+
+        labels = self.labels
+        path = []
+        if target in visited:
+            current = target
+            while current != -1:
+                path.append(labels[current])
+                current = previous[current]
+            path.reverse()
+
+        return {
+            'distances': {labels[u]: distance for u, distance in distances.items()},
+            'previous': {labels[u]: labels[p] if p != -1 else None for u, p in previous.items()},
+            'path': path,
+            'settled': len(visited)
+        }
+
+    def memory(self):
+        getsizeof = sys.getsizeof
+        return getsizeof(self.forward) + (getsizeof(self.backward) if self.backward is not self.forward else 0)
+
+    # ==================== PERSISTÊNCIA ====================
+
+    def save(self, path):
+        labels = list(self.labels)
+        if not all(isinstance(label, (str, int)) and not isinstance(label, bool) for label in labels):
+            raise TypeError("Para salvar em arquivo, os rótulos devem ser texto ou inteiros.")
+        names = json.dumps(labels, ensure_ascii=False).encode('utf-8')
+
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, int(self.directed), STRATEGIES.index(self.strategy),
+                                   int(sys.byteorder == 'little'), len(labels), self.k, len(names),
+                                   self.signature))
+            file.write(array('q', self.landmarks).tobytes())
+            file.write(self.forward.tobytes())
+            if self.directed:
+                file.write(self.backward.tobytes())
+            file.write(names)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        if len(data) < HEADER.size:
+            raise ValueError(f"'{path}' não é um arquivo de landmarks válido.")
+        magic, directed, strategy, little_endian, n, k, names_size, signature = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' não é um arquivo de landmarks válido.")
+        if little_endian != int(sys.byteorder == 'little'):
+            raise ValueError(f"'{path}' foi gravado em uma máquina com outra ordem de bytes.")
+
+        position = HEADER.size
+        sections = []
+        for typecode, length in (('q', k), ('d', n * k), ('d', n * k if directed else 0)):
+            values = array(typecode)
+            values.frombytes(data[position:position + length * values.itemsize])
+            sections.append(values)
+            position += length * values.itemsize
+        landmarks, forward, backward = sections
+        labels = json.loads(data[position:position + names_size].decode('utf-8'))
+
+        return cls(labels, list(landmarks), forward, backward if directed else forward,
+                   bool(directed), STRATEGIES[strategy], signature)
+
+
+# ==================== ESCOLHA DOS LANDMARKS ====================
+
+def _select_farthest(csr, nearest, landmarks, rng):
+    n = len(csr.labels)
+    if not landmarks:
+        # Primeiro landmark: o vértice alcançável mais distante de uma raiz aleatória
+        distances = csr._dijkstra(rng.randrange(n))[0]
+        return max(range(n), key=lambda v: (distances[v] != INFINITY, distances[v]))
+
+    # O vértice mais longe do landmark mais próximo; os que nenhum landmark alcança
+    # (distância infinita) vêm primeiro e levam um landmark para outra componente
+    chosen = set(landmarks)
+    return max((v for v in range(n) if v not in chosen), key=nearest.__getitem__, default=None)
+
+
+def _select_avoid(csr, trees, landmarks, rng, attempts=8):
+    n = len(csr.labels)
+    chosen = set(landmarks)
+    if len(chosen) == n:
+        return None
+
+    for _ in range(attempts):
+        root = rng.randrange(n)
+        distances, previous = csr._dijkstra(root)
+
+        # Peso de cada vértice: quanto os landmarks atuais subestimam d(raiz, v)
+        children = [[] for _ in range(n)]
+        order = [root]
+        weight = [0.0] * n
+        for v in range(n):
+            if previous[v] != -1:
+                children[previous[v]].append(v)
+        for v in order:
+            order.extend(children[v])
+            lower = 0
+            for to_all, from_all in trees:
+                if to_all[root] != INFINITY and to_all[v] - to_all[root] > lower:
+                    lower = to_all[v] - to_all[root]
+                if from_all[v] != INFINITY and from_all[root] - from_all[v] > lower:
+                    lower = from_all[root] - from_all[v]
+            weight[v] = distances[v] - lower
+
+        # Tamanho da subárvore (soma dos pesos), zerado se ela já contém um landmark
+        size = weight
+        blocked = bytearray(n)
+        for v in reversed(order):
+            if v in chosen:
+                blocked[v] = 1
+            if blocked[v]:
+                size[v] = 0
+                if previous[v] != -1:
+                    blocked[previous[v]] = 1
+            elif previous[v] != -1:
+                size[previous[v]] += size[v]
+
+        if size[root] <= 0:
+            continue
+        # Desce sempre para o filho de maior tamanho até chegar numa folha
+        vertex = root
+        while True:
+            child = max(children[vertex], key=size.__getitem__, default=None)
+            if child is None or size[child] <= 0:
+                return vertex
+            vertex = child
+
+    # Subárvores sempre com landmark: qualquer vértice ainda livre serve
+    return rng.choice([v for v in range(n) if v not in chosen])
@@ -0,0 +1,74 @@
+"""
+Leitura de arquivos de arestas e de consultas (CSV/TSV) em fluxo contínuo
+Formato de cada linha: origem, destino[, peso] (arestas) ou origem, destino (consultas)
+"""
+
+import csv
+
+
+def parse_weight(text):
+    """Converte o peso para int quando possível, senão para float."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _iter_rows(source, delimiter):
+    reader = csv.reader(source, delimiter=delimiter)
+    for line_number, row in enumerate(reader, 1):
+        # Ignora linhas vazias e comentários
+        if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+            continue
+        if len(row) < 2:
+            raise ValueError(f"Linha {line_number}: esperado 'origem{delimiter}destino[{delimiter}peso]'.")
+
+        origin, destination = row[0].strip(), row[1].strip()
+        weight = 1
+        if len(row) > 2 and row[2].strip():
+            try:
+                weight = parse_weight(row[2].strip())
+            except ValueError:
+                # Primeira linha com peso não numérico é tratada como cabeçalho
+                if line_number == 1:
+                    continue
+                raise ValueError(f"Linha {line_number}: peso inválido '{row[2].strip()}'.")
+
+        yield origin, destination, weight
+
+
+def read_edges(source, delimiter=None, encoding='utf-8'):
+    """Gera tuplas (origem, destino, peso) lendo o arquivo linha a linha."""
+    # Aceita tanto um caminho quanto um arquivo já aberto (ex.: sys.stdin)
+    if hasattr(source, 'read'):
+        yield from _iter_rows(source, delimiter or ',')
+        return
+
+    if delimiter is None:
+        delimiter = '\t' if str(source).lower().endswith(('.tsv', '.tab')) else ','
+
+    with open(source, newline='', encoding=encoding) as file:
+        yield from _iter_rows(file, delimiter)
+
+
+def _iter_query_rows(source, delimiter):
+    reader = csv.reader(source, delimiter=delimiter)
+    for line_number, row in enumerate(reader, 1):
+        if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+            continue
+        if len(row) < 2:
+            raise ValueError(f"Linha {line_number}: esperado 'origem{delimiter}destino'.")
+        yield line_number, row[0].strip(), row[1].strip()
+
+
+def read_queries(source, delimiter=None, encoding='utf-8'):
+    """Gera tuplas (linha, origem, destino) de um arquivo de consultas, linha a linha."""
+    if hasattr(source, 'read'):
+        yield from _iter_query_rows(source, delimiter or ',')
+        return
+
+    if delimiter is None:
+        delimiter = '\t' if str(source).lower().endswith(('.tsv', '.tab')) else ','
+
+    with open(source, newline='', encoding=encoding) as file:
+        yield from _iter_query_rows(file, delimiter)
@@ -1,9 +1,22 @@
 """
 Programa Principal - Sistema de Rotas de Cidades
 Demonstração de Grafo Genérico + Algoritmo de Dijkstra
+
+Sem argumentos abre o menu interativo. Com --graph roda em lote, sem menu:
+    python src/main.py --graph arestas.csv --queries consultas.csv [--format csv|jsonl]
+As consultas (origem,destino por linha) vêm do arquivo ou da entrada padrão, os
+resultados saem na saída padrão (ou em --output) e o resumo vai para stderr
 """
 
-from graph import Graph
+import argparse
+import csv
+import json
+import sys
+import time
+
+from graph import Graph, parse_coordinates
+from instrumentation import SearchStats
+from loaders import read_queries
 
 
 def print_menu():
@@ -23,6 +36,9 @@ def print_menu():
     print("  7. Carregar exemplo de cidades brasileiras")
     print("  8. BFS - Busca em Largura (opcional)")
     print("  9. DFS - Busca em Profundidade (opcional)")
+    print(" 10. Bellman-Ford - pesos negativos (opcional)")
+    print(" 11. Componentes conexas (opcional)")
+    print(" 12. A* - menor caminho com coordenadas (opcional)")
     print("  0. Sair")
     print("="*60)
 
@@ -36,6 +52,17 @@ def load_example(graph):
         "Brasília", "Salvador", "Curitiba", "Fortaleza"
     ]
     
+    # Coordenadas (latitude, longitude) usadas pela heurística do A*
+    coordinates = {
+        "São Paulo": (-23.5505, -46.6333),
+        "Rio de Janeiro": (-22.9068, -43.1729),
+        "Belo Horizonte": (-19.9167, -43.9345),
+        "Brasília": (-15.7939, -47.8828),
+        "Salvador": (-12.9777, -38.5016),
+        "Curitiba": (-25.4284, -49.2733),
+        "Fortaleza": (-3.7319, -38.5267)
+    }
+    
     routes = [
         ("São Paulo", "Rio de Janeiro", 430),
         ("São Paulo", "Belo Horizonte", 586),
@@ -48,19 +75,165 @@ def load_example(graph):
         ("Salvador", "Fortaleza", 1075)
     ]
     
-    for city in cities:
-        graph.add_vertex(city)
-    
-    for origin, destination, distance in routes:
-        graph.add_edge(origin, destination, distance)
+    # Carga em lote: aplicada de uma vez e sem duplicar rotas se o exemplo já foi carregado
+    with graph.batch(policy="min") as batch:
+        for city in cities:
+            batch.add_vertex(city, coordinates[city])
+        for origin, destination, distance in routes:
+            batch.add_edge(origin, destination, distance)
+    changes = batch.applied
     
     print(f"\n✅ Exemplo carregado com sucesso!")
-    print(f"📍 {len(cities)} cidades adicionadas")
-    print(f"🔗 {len(routes)} rotas adicionadas")
+    print(f"📍 {changes['added_vertices']} cidades adicionadas")
+    print(f"🔗 {changes['added_edges']} rotas adicionadas ({changes['skipped_edges']} já existiam)")
+
+
+# ==================== MODO EM LOTE ====================
+
+def answer_group(graph, source, targets):
+    """Responde as consultas de uma mesma origem com uma única busca."""
+    if source not in graph.vertices:
+        return [{'error': f"Vértice '{source}' não encontrado."}] * len(targets)
+    
+    known = {target for target in targets if target in graph.vertices}
+    if not known:
+        result = None
+    elif graph.has_negative_weights():
+        result = graph.bellman_ford(source)
+        if result['negative_cycle']:
+            return [{'error': "Ciclo negativo alcançável a partir da origem."}] * len(targets)
+    elif len(known) == 1:
+        # Destino único: na primeira consulta da origem, a busca para assim que ele é fixado
+        result = graph.dijkstra(source, next(iter(known)))
+    else:
+        result = graph.dijkstra(source)
+    
+    answers = []
+    for target in targets:
+        if target not in known:
+            answers.append({'error': f"Vértice '{target}' não encontrado."})
+            continue
+        path = graph.build_path(result['previous'], source, target)
+        answers.append({'distance': result['distances'][target] if path else None, 'path': path})
+    return answers
+
+
+def answer_chunk(graph, queries, write, counts):
+    """Agrupa um bloco de consultas por origem e escreve as respostas na ordem de entrada."""
+    groups = {}
+    for position, (source, _) in enumerate(queries):
+        groups.setdefault(source, []).append(position)
+    
+    answers = [None] * len(queries)
+    for source, positions in groups.items():
+        group = answer_group(graph, source, [queries[position][1] for position in positions])
+        for position, answer in zip(positions, group):
+            answers[position] = answer
+    counts['sources'] += len(groups)
+    
+    for (source, target), answer in zip(queries, answers):
+        write(source, target, answer)
+        counts['queries'] += 1
+        if 'error' in answer:
+            counts['errors'] += 1
+        elif not answer['path']:
+            counts['unreachable'] += 1
+
+
+def csv_writer(output):
+    writer = csv.writer(output)
+    writer.writerow(["from", "to", "distance", "path", "error"])
+    
+    def write(source, target, answer):
+        distance, path = answer.get('distance'), answer.get('path')
+        writer.writerow([source, target, "" if distance is None else distance,
+                         "|".join(map(str, path)) if path else "", answer.get('error', "")])
+    return write
+
+
+def jsonl_writer(output):
+    def write(source, target, answer):
+        output.write(json.dumps({'from': source, 'to': target, **answer}, ensure_ascii=False) + "\n")
+    return write
+
+
+def run_batch(args):
+    """Carrega o grafo uma vez e responde as consultas em fluxo; devolve o código de saída."""
+    # Sem mensagens do Graph: a saída padrão leva só os resultados
+    started = time.perf_counter()
+    try:
+        graph = Graph.from_edge_file(args.graph, directed=not args.undirected,
+                                     verbose=False, cache_size=args.cache_size)
+    except (OSError, ValueError) as error:
+        print(f"✗ Erro ao carregar o grafo: {error}", file=sys.stderr)
+        return 1
+    load_time = time.perf_counter() - started
+    
+    source = sys.stdin if args.queries in (None, "-") else args.queries
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    write = csv_writer(output) if args.format == "csv" else jsonl_writer(output)
+    counts = {'queries': 0, 'sources': 0, 'unreachable': 0, 'errors': 0}
+    
+    started = time.perf_counter()
+    try:
+        chunk = []
+        for line_number, origin, destination in read_queries(source):
+            # Primeira linha sem nenhum vértice conhecido é tratada como cabeçalho
+            if line_number == 1 and origin not in graph.vertices and destination not in graph.vertices:
+                continue
+            chunk.append((origin, destination))
+            if len(chunk) >= args.chunk:
+                answer_chunk(graph, chunk, write, counts)
+                output.flush()
+                chunk = []
+        if chunk:
+            answer_chunk(graph, chunk, write, counts)
+    except (OSError, ValueError) as error:
+        print(f"✗ Erro nas consultas: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if args.output:
+            output.close()
+        else:
+            output.flush()
+    elapsed = time.perf_counter() - started
+    
+    rate = counts['queries'] / elapsed if elapsed > 0 else 0.0
+    print(f"✓ Grafo: {len(graph.vertices)} vértices carregados em {load_time:.2f} s", file=sys.stderr)
+    print(f"✓ {counts['queries']} consultas ({counts['sources']} grupos por origem, "
+          f"{counts['unreachable']} sem rota, {counts['errors']} com erro) em {elapsed:.2f} s: "
+          f"{rate:.0f} consultas/s", file=sys.stderr)
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de rotas: menu interativo ou consultas em lote")
+    parser.add_argument("--graph", metavar="ARQUIVO", help="Arquivo de arestas CSV/TSV (ativa o modo em lote)")
+    parser.add_argument("--queries", metavar="ARQUIVO",
+                        help="Consultas origem,destino por linha (padrão ou '-': entrada padrão)")
+    parser.add_argument("--output", metavar="ARQUIVO", help="Arquivo de resultados (padrão: saída padrão)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--undirected", action="store_true", help="Grafo não direcionado")
+    parser.add_argument("--chunk", type=int, default=10000,
+                        help="Consultas lidas e agrupadas por origem de cada vez (padrão: 10000)")
+    parser.add_argument("--cache-size", type=int, default=16,
+                        help="Árvores de Dijkstra em cache, reaproveitadas entre blocos (padrão: 16)")
+    args = parser.parse_args(argv)
+    if args.graph is None and (args.queries is not None or args.output is not None):
+        parser.error("--queries e --output exigem --graph")
+    if args.chunk < 1:
+        parser.error("--chunk deve ser positivo")
+    return args
 
 
+# ==================== PROGRAMA PRINCIPAL ====================
+
 def main():
     """Função principal do programa."""
+    args = parse_args()
+    if args.graph:
+        sys.exit(run_batch(args))
+    
     print("\n" + "="*60)
     print("🗺️  SISTEMA DE GRAFOS - ROTAS DE CIDADES")
     print("="*60)
@@ -82,7 +255,13 @@ def main():
         if choice == "1":
             city = input("📍 Nome da cidade: ").strip()
             if city:
-                graph.add_vertex(city)
+                # Coordenadas são opcionais: só o A* as usa
+                try:
+                    coordinates = parse_coordinates(input("🌐 Latitude, longitude (Enter para pular): "))
+                except ValueError:
+                    print("✗ Coordenadas inválidas! Use o formato: -23.55, -46.63")
+                    continue
+                graph.add_vertex(city, coordinates)
         
         elif choice == "2":
             city = input("🗑️  Nome da cidade a remover: ").strip()
@@ -116,8 +295,11 @@ def main():
             print("="*60)
             start = input("📍 Cidade de origem: ").strip()
             end = input("📍 Cidade de destino: ").strip()
+            bidirectional = input("⚡ Usar busca bidirecional? (s/N): ").strip().lower() == "s"
+            show_stats = input("📈 Mostrar estatísticas da busca? (s/N): ").strip().lower() == "s"
             
-            result = graph.dijkstra(start, end)
+            stats = SearchStats() if show_stats else None
+            result = graph.dijkstra(start, end, bidirectional=bidirectional, stats=stats)
             
             if result:
                 print("\n" + "="*60)
@@ -133,9 +315,14 @@ def main():
                     print(f"\n📊 Distâncias acumuladas:")
                     for i, city in enumerate(result['path']):
                         print(f"   {i+1}. {city}: {result['distances'][city]:.2f} km")
+                elif not graph.can_reach(start, end):
+                    print("\n✗ Não há caminho: as cidades estão em componentes sem ligação.")
                 else:
                     print("\n✗ Não há caminho entre as cidades informadas.")
                 
+                if stats is not None:
+                    print(f"\n📈 Estatísticas: {stats.summary()}")
+                
                 print("="*60)
         
         # OUTRAS OPÇÕES
@@ -144,20 +331,78 @@ def main():
         
         elif choice == "8":
             start = input("📍 Cidade inicial para BFS: ").strip()
-            result = graph.bfs(start)
+            stats = SearchStats()
+            result = graph.bfs(start, stats=stats)
             if result:
                 print(f"\n📍 BFS a partir de '{start}':")
                 print(f"Ordem de visita: {' → '.join(result['order'])}")
                 print("\nNíveis:")
                 for city, level in sorted(result['levels'].items(), key=lambda x: x[1]):
                     print(f"  {city}: nível {level}")
+                print(f"\n📈 Estatísticas: {stats.summary()}")
         
         elif choice == "9":
             start = input("📍 Cidade inicial para DFS: ").strip()
-            result = graph.dfs(start)
+            stats = SearchStats()
+            result = graph.dfs(start, stats=stats)
             if result:
                 print(f"\n📍 DFS a partir de '{start}':")
                 print(f"Ordem de visita: {' → '.join(result)}")
+                print(f"📈 Estatísticas: {stats.summary()}")
+        
+        elif choice == "10":
+            start = input("📍 Cidade de origem: ").strip()
+            end = input("📍 Cidade de destino (Enter para todas): ").strip()
+            result = graph.bellman_ford(start, end or None)
+            if result:
+                print("\n" + "="*60)
+                print("📊 RESULTADO DO BELLMAN-FORD")
+                print("="*60)
+                
+                if result['negative_cycle']:
+                    cycle = result['negative_cycle']
+                    print(f"\n⚠️  Ciclo negativo detectado: {' → '.join(cycle + [cycle[0]])}")
+                    print("   Distâncias mínimas não são definidas neste grafo.")
+                elif end:
+                    if result['path']:
+                        print(f"\n✅ Caminho encontrado!")
+                        print(f"📍 Rota: {' → '.join(result['path'])}")
+                        print(f"📏 Distância total: {result['distances'][end]:.2f} km")
+                    else:
+                        print("\n✗ Não há caminho entre as cidades informadas.")
+                else:
+                    print(f"\n📏 Distâncias a partir de '{start}':")
+                    for city, distance in sorted(result['distances'].items(), key=lambda x: x[1]):
+                        print(f"   {city}: {distance:.2f} km")
+                
+                print("="*60)
+        
+        elif choice == "11":
+            components = graph.components()
+            kind = "fortemente conexas" if graph.directed else "conexas"
+            print(f"\n🧩 {len(components)} componente(s) {kind}:")
+            for i, component in enumerate(components, 1):
+                print(f"  {i}. ({len(component)}) {', '.join(sorted(component))}")
+        
+        elif choice == "12":
+            start = input("📍 Cidade de origem: ").strip()
+            end = input("📍 Cidade de destino: ").strip()
+            result = graph.astar(start, end)
+            if result:
+                print("\n" + "="*60)
+                print("🧭 RESULTADO DO A*")
+                print("="*60)
+                
+                if result['path']:
+                    print(f"\n✅ Caminho encontrado!")
+                    print(f"📍 Rota: {' → '.join(result['path'])}")
+                    print(f"📏 Distância total: {result['distances'][end]:.2f} km")
+                else:
+                    print("\n✗ Não há caminho entre as cidades informadas.")
+                if any(city not in graph.coordinates for city in (start, end)):
+                    print("ℹ️  Sem coordenadas na origem ou no destino: a busca equivale ao Dijkstra.")
+                print(f"📈 Cidades fixadas: {result['settled']}")
+                print("="*60)
         
         elif choice == "0":
             print("\n" + "="*60)
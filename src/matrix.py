@@ -0,0 +1,140 @@
+"""
+Matriz de distâncias muitos-para-muitos calculada em paralelo
+O snapshot CSR é copiado uma única vez para memória compartilhada e os processos
+trabalhadores leem os arrays diretamente, sem serializar o grafo a cada tarefa
+O resultado é um único array('d') contíguo, linha por linha, que os trabalhadores
+preenchem direto na memória compartilhada
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import heapq
+
+# Estado de cada processo trabalhador (preenchido por _attach)
+_worker = {}
+
+
+class DistanceMatrix:
+    """Matriz len(origens) x len(destinos) guardada num único array('d') (linha por linha)."""
+
+    def __init__(self, rows, columns, values=None):
+        self.rows = rows
+        self.columns = columns
+        self.values = array('d', bytes(8 * rows * columns)) if values is None else values
+
+    @property
+    def shape(self):
+        return (self.rows, self.columns)
+
+    def index(self, i, j):
+        # Posição de (origem i, destino j) em values
+        return i * self.columns + j
+
+    def __getitem__(self, key):
+        # matrix[i, j] devolve a distância; matrix[i] devolve a linha i (como na lista de linhas)
+        if isinstance(key, tuple):
+            i, j = key
+            return self.values[i * self.columns + j]
+        return self.row(key)
+
+    def row(self, i):
+        # Fatia sem cópia de values
+        if not 0 <= i < self.rows:
+            raise IndexError(i)
+        return memoryview(self.values)[i * self.columns:(i + 1) * self.columns]
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return (self.row(i) for i in range(self.rows))
+
+    def view(self):
+        # memoryview 2-D sem cópia (numpy.asarray(matrix.view()) vira um ndarray)
+        return memoryview(self.values).cast('B').cast('d', (self.rows, self.columns))
+
+    def tolist(self):
+        return [row.tolist() for row in self]
+
+
+def distances_to_targets(offsets, targets, weights, source, target_ids):
+    """Dijkstra a partir de source que para assim que todos os destinos são fixados."""
+    infinity = float('infinity')
+    distances = {source: 0.0}
+    visited = set()
+    remaining = set(target_ids)
+    priority_queue = [(0.0, source)]
+
+    while priority_queue and remaining:
+        current_distance, u = heapq.heappop(priority_queue)
+        if u in visited:
+            continue
+        visited.add(u)
+        remaining.discard(u)
+
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_distance = current_distance + weights[i]
+            if new_distance < distances.get(v, infinity):
+                distances[v] = new_distance
+                heapq.heappush(priority_queue, (new_distance, v))
+
+    return array('d', (distances.get(t, infinity) for t in target_ids))
+
+
+def _share(values):
+    # Copia um array para um bloco de memória compartilhada
+    size = len(values) * values.itemsize
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    block.buf[:size] = memoryview(values).cast('B')
+    return block
+
+
+def _attach(layout, target_ids):
+    # Executado uma vez por trabalhador: mapeia os blocos sem copiá-los
+    # (o último bloco é a matriz de saída)
+    views = []
+    for name, typecode, length in layout:
+        block = shared_memory.SharedMemory(name=name)
+        _worker.setdefault('blocks', []).append(block)
+        size = length * array(typecode).itemsize
+        views.append(block.buf[:size].cast(typecode))
+    _worker['arrays'] = views
+    _worker['target_ids'] = target_ids
+
+
+def _row(i, source):
+    offsets, targets, weights, output = _worker['arrays']
+    columns = len(_worker['target_ids'])
+    output[i * columns:(i + 1) * columns] = distances_to_targets(
+        offsets, targets, weights, source, _worker['target_ids'])
+
+
+def compute_distance_matrix(csr, source_ids, target_ids, workers=1):
+    """Devolve uma DistanceMatrix: posição (i, j) = distância de source_ids[i] até target_ids[j]."""
+    matrix = DistanceMatrix(len(source_ids), len(target_ids))
+    columns = matrix.columns
+    if workers <= 1 or len(source_ids) <= 1:
+        for i, s in enumerate(source_ids):
+            matrix.values[i * columns:(i + 1) * columns] = distances_to_targets(
+                csr.offsets, csr.targets, csr.weights, s, target_ids)
+        return matrix
+
+    blocks = [_share(csr.offsets), _share(csr.targets), _share(csr.weights), _share(matrix.values)]
+    try:
+        layout = [(block.name, getattr(values, 'typecode', None) or values.format, len(values))
+                  for block, values in zip(blocks, (csr.offsets, csr.targets, csr.weights, matrix.values))]
+        chunksize = max(1, len(source_ids) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(layout, list(target_ids))) as pool:
+            for _ in pool.map(_row, range(len(source_ids)), source_ids, chunksize=chunksize):
+                pass
+        size = len(matrix.values) * matrix.values.itemsize
+        matrix.values = array('d')
+        matrix.values.frombytes(blocks[-1].buf[:size])
+        return matrix
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,99 @@
+"""
+Filas de prioridade intercambiáveis para o Dijkstra
+- BinaryHeap: heap binário (heapq), aceita qualquer peso não negativo
+- BucketQueue: fila de Dial, um balde por distância (pesos inteiros pequenos)
+- RadixHeap: baldes por bit mais significativo (pesos inteiros quaisquer)
+Todas recebem e devolvem entradas (chave, item). As filas inteiras exigem chaves
+monótonas: nunca inserir chave menor que a última removida
+"""
+
+from functools import partial
+import heapq
+
+
+class BinaryHeap:
+
+    def __init__(self):
+        self._heap = []
+        # Ligadas direto ao heapq: sem chamada Python extra por operação
+        self.push = partial(heapq.heappush, self._heap)
+        self.pop = partial(heapq.heappop, self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketQueue:
+
+    def __init__(self, max_weight):
+        # Chaves pendentes ficam sempre em [cursor, cursor + max_weight]:
+        # basta um vetor circular com max_weight + 1 baldes
+        self._size = int(max_weight) + 1
+        self._buckets = [[] for _ in range(self._size)]
+        self._cursor = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, entry):
+        self._buckets[int(entry[0]) % self._size].append(entry)
+        self._count += 1
+
+    def pop(self):
+        buckets, size = self._buckets, self._size
+        while not buckets[self._cursor % size]:
+            self._cursor += 1
+        self._count -= 1
+        return buckets[self._cursor % size].pop()
+
+
+class RadixHeap:
+
+    def __init__(self):
+        # Balde i guarda chaves cujo bit mais alto diferente de "last" é o bit i - 1
+        self._buckets = [[] for _ in range(65)]
+        self._last = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, entry):
+        index = (int(entry[0]) ^ self._last).bit_length()
+        if index >= len(self._buckets):
+            self._buckets.extend([] for _ in range(index - len(self._buckets) + 1))
+        self._buckets[index].append(entry)
+        self._count += 1
+
+    def pop(self):
+        buckets = self._buckets
+        if not buckets[0]:
+            # Redistribui o primeiro balde não vazio a partir da sua menor chave
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            self._last = int(min(key for key, _ in bucket))
+            for entry in bucket:
+                buckets[(int(entry[0]) ^ self._last).bit_length()].append(entry)
+            bucket.clear()
+        self._count -= 1
+        return buckets[0].pop()
+
+
+QUEUES = ("heap", "dial", "radix", "auto")
+
+
+def make_queue(kind, max_weight=None):
+    # max_weight=None indica pesos não inteiros: aí só o heap serve, qualquer que seja kind.
+    # Em Python puro as filas inteiras não compensam (benchmarks/bench_queues.py, grade
+    # 200x200 com pesos 1..100: heap 164 ms, Dial 168 ms e radix 223 ms por busca; com
+    # pesos 1..2000, 173, 203 e 310 ms). Por isso 'auto' fica com o heap
+    if kind not in QUEUES:
+        raise ValueError(f"Fila de prioridade desconhecida: '{kind}'")
+    if kind == "dial" and max_weight is not None:
+        return BucketQueue(max_weight)
+    if kind == "radix" and max_weight is not None:
+        return RadixHeap()
+    return BinaryHeap()
@@ -0,0 +1,455 @@
+"""
+Serviço HTTP/JSON de consultas de rotas sobre um Graph compartilhado (asyncio)
+- Consultas (menor caminho, BFS, DFS) rodam em paralelo entre as alterações,
+  protegidas por um lock de leitores/escritor
+- Consultas de menor caminho que chegam juntas são agrupadas por origem:
+  uma única árvore de Dijkstra responde todos os destinos do grupo
+- As buscas rodam num pool de workers (threads ou processos), sem travar o laço
+
+Uso: python src/server.py [--graph arestas.csv] [--undirected] [--port 8080]
+                          [--pool thread|process] [--workers 4]
+
+Rotas:
+    GET    /health                          estado e versão do grafo
+    GET    /stats                           contadores do serviço
+    GET    /vertices                        lista de vértices
+    GET    /shortest-path?from=A&to=B       menor caminho e distância
+    GET    /bfs?from=A    /dfs?from=A       ordem de visita
+    POST   /vertices   {"vertex": "A"}
+    DELETE /vertices?vertex=A
+    POST   /edges      {"from": "A", "to": "B", "weight": 10}
+    DELETE /edges?from=A&to=B
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import json
+import logging
+import os
+import shutil
+import signal
+import tempfile
+from urllib.parse import parse_qsl, urlsplit
+
+try:
+    from .csr import CSRGraph
+    from .graph import Graph
+except ImportError:
+    from csr import CSRGraph
+    from graph import Graph
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 422: "Unprocessable Entity",
+           500: "Internal Server Error"}
+MAX_BODY = 1 << 20  # Corpo máximo aceito (1 MiB)
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ==================== LOCK DE LEITORES/ESCRITOR ====================
+
+class ReadWriteLock:
+
+    def __init__(self):
+        # Vários leitores ao mesmo tempo ou um único escritor; escritores esperando
+        # bloqueiam novos leitores para não ficarem sem vez
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writer and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+# ==================== BUSCAS NOS WORKERS ====================
+# Modo thread: as buscas usam o próprio Graph (protegido pelo lock de leitura).
+# Modo processo: cada worker abre com mmap o snapshot binário da versão atual.
+
+_snapshots = {}  # Snapshot aberto em cada processo worker: {caminho: CSRGraph}
+
+
+def _open_snapshot(path):
+    csr = _snapshots.get(path)
+    if csr is None:
+        _snapshots.clear()
+        csr = _snapshots[path] = CSRGraph.load(path, mmap=True, verbose=False)
+    return csr
+
+
+def _route(path, distance):
+    return {'path': path, 'distance': distance if path else None}
+
+
+def _graph_routes(graph, source, targets):
+    # Uma árvore por origem (reaproveitada pelo cache do Graph) atende todos os destinos
+    result = graph.dijkstra(source)
+    if result is None:
+        return None
+    distances = result['distances']
+    return [_route(graph.build_path(result['previous'], source, target), distances[target])
+            for target in targets]
+
+
+def _snapshot_routes(path, source, targets):
+    csr = _open_snapshot(path)
+    index, labels = csr.index, csr.labels
+    # Um único destino permite parar a busca assim que ele é fixado
+    distances, previous = csr._dijkstra(index[source], index[targets[0]] if len(targets) == 1 else -1)
+    routes = []
+    for target in targets:
+        current = index[target]
+        route = []
+        if distances[current] != float('infinity'):
+            while current != -1:
+                route.append(labels[current])
+                current = previous[current]
+            route.reverse()
+        routes.append(_route(route, distances[index[target]]))
+    return routes
+
+
+def _snapshot_traversal(path, kind, source):
+    csr = _open_snapshot(path)
+    return csr.bfs(source) if kind == "bfs" else csr.dfs(source)
+
+
+# ==================== SERVIÇO ====================
+
+class RouteService:
+
+    def __init__(self, graph, pool="thread", workers=None, batch_window=0.002, batch_size=64):
+        self.graph = graph
+        self.lock = ReadWriteLock()
+        self.pool = pool
+        self.executor = (ProcessPoolExecutor(workers) if pool == "process"
+                         else ThreadPoolExecutor(workers))
+        self.batch_window = batch_window  # Segundos que uma consulta espera por outras da mesma leva
+        self.batch_size = batch_size  # Consultas pendentes que disparam a leva imediatamente
+        self._pending = {}  # {origem: [(destino, future), ...]}
+        self._pending_count = 0
+        self._flush_handle = None
+        self._batches = set()  # Levas em andamento: o laço só guarda referência fraca às tasks
+        self._snapshot_dir = tempfile.mkdtemp(prefix="grafo-") if pool == "process" else None
+        self._snapshot = (-1, None)  # (versão, caminho do arquivo)
+        self._snapshot_lock = asyncio.Lock()
+        self.counters = {'requests': 0, 'queries': 0, 'batches': 0, 'mutations': 0, 'errors': 0}
+
+    def close(self):
+        # Espera os workers saírem: com pool de processos, nenhum fica órfão
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if self._snapshot_dir:
+            shutil.rmtree(self._snapshot_dir, ignore_errors=True)
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def _snapshot_path(self):
+        # Grava o snapshot da versão atual uma única vez por versão; chamado com o lock
+        # de leitura. A gravação roda no próprio laço (sem threads extras antes do fork
+        # dos workers) e custa O(V + E) só na primeira consulta após cada alteração
+        async with self._snapshot_lock:
+            version, path = self._snapshot
+            if version != self.graph.version:
+                new_path = os.path.join(self._snapshot_dir, f"grafo-{self.graph.version}.bin")
+                self.graph.freeze().save(new_path)
+                if path:
+                    os.remove(path)  # Workers com o arquivo antigo mapeado continuam válidos
+                self._snapshot = (self.graph.version, new_path)
+                path = new_path
+            return path
+
+    # ---------- Consultas ----------
+
+    def _check_vertex(self, vertex, name):
+        if vertex is None:
+            raise HTTPError(400, f"Parâmetro '{name}' é obrigatório.")
+        if vertex not in self.graph.vertices:
+            raise HTTPError(404, f"Vértice '{vertex}' não encontrado.")
+
+    async def shortest_path(self, source, target):
+        self._check_vertex(source, "from")
+        self._check_vertex(target, "to")
+        if self.graph.has_negative_weights():
+            raise HTTPError(422, "O grafo tem arestas com peso negativo.")
+
+        # Entra na leva pendente; a primeira consulta da leva agenda o disparo
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(source, []).append((target, future))
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending, self._pending_count = self._pending, {}, 0
+        for source, requests in pending.items():
+            task = asyncio.ensure_future(self._solve(source, requests))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _solve(self, source, requests):
+        self.counters['batches'] += 1
+        self.counters['queries'] += len(requests)
+        targets = [target for target, _ in requests]
+        try:
+            async with self.lock.read():
+                # Uma mutação pode ter chegado entre o pedido e a leva
+                missing = [v for v in (source, *targets) if v not in self.graph.vertices]
+                if self.graph.has_negative_weights():
+                    raise HTTPError(422, "O grafo tem arestas com peso negativo.")
+                if missing:
+                    raise HTTPError(404, f"Vértice '{missing[0]}' não encontrado.")
+                if self.pool == "process":
+                    routes = await self._run(_snapshot_routes, await self._snapshot_path(), source, targets)
+                else:
+                    routes = await self._run(_graph_routes, self.graph, source, targets)
+        except Exception as error:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), route in zip(requests, routes):
+            if not future.done():
+                future.set_result(route)
+
+    async def traversal(self, kind, source):
+        self._check_vertex(source, "from")
+        async with self.lock.read():
+            if source not in self.graph.vertices:
+                raise HTTPError(404, f"Vértice '{source}' não encontrado.")
+            if self.pool == "process":
+                result = await self._run(_snapshot_traversal, await self._snapshot_path(), kind, source)
+            else:
+                search = self.graph.bfs if kind == "bfs" else self.graph.dfs
+                result = await self._run(search, source)
+        return result if kind == "bfs" else {'order': result}
+
+    # ---------- Alterações ----------
+
+    async def mutate(self, operation, *args):
+        # Alterações são rápidas: rodam no próprio laço, com o lock de escrita
+        async with self.lock.write():
+            changed = getattr(self.graph, operation)(*args)
+        self.counters['mutations'] += 1
+        return {'changed': changed, 'version': self.graph.version}
+
+    # ---------- Roteamento HTTP ----------
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        route = url.path.rstrip('/') or '/'
+
+        if route == "/health" and method == "GET":
+            return 200, {'status': 'ok', 'version': self.graph.version}
+        if route == "/stats" and method == "GET":
+            return 200, {**self.counters, 'vertices': len(self.graph.vertices),
+                         'version': self.graph.version, 'cache': self.graph.cache_stats()}
+        if route == "/vertices" and method == "GET":
+            async with self.lock.read():
+                return 200, {'vertices': sorted(self.graph.vertices, key=str)}
+        if route == "/shortest-path" and method == "GET":
+            return 200, await self.shortest_path(params.get("from"), params.get("to"))
+        if route in ("/bfs", "/dfs") and method == "GET":
+            return 200, await self.traversal(route[1:], params.get("from"))
+
+        if route == "/vertices" and method == "POST":
+            data = self._json(body)
+            if "vertex" not in data:
+                raise HTTPError(400, "Campo 'vertex' é obrigatório.")
+            return self._created(await self.mutate("add_vertex", data["vertex"]))
+        if route == "/vertices" and method == "DELETE":
+            self._check_vertex(params.get("vertex"), "vertex")
+            return 200, await self.mutate("remove_vertex", params["vertex"])
+        if route == "/edges" and method == "POST":
+            data = self._json(body)
+            if "from" not in data or "to" not in data:
+                raise HTTPError(400, "Campos 'from' e 'to' são obrigatórios.")
+            weight = data.get("weight", 1)
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise HTTPError(400, "Campo 'weight' deve ser numérico.")
+            return self._created(await self.mutate("add_edge", data["from"], data["to"], weight))
+        if route == "/edges" and method == "DELETE":
+            self._check_vertex(params.get("from"), "from")
+            self._check_vertex(params.get("to"), "to")
+            return 200, await self.mutate("remove_edge", params["from"], params["to"])
+
+        if route in ("/health", "/stats", "/vertices", "/shortest-path", "/bfs", "/dfs", "/edges"):
+            raise HTTPError(405, f"Método {method} não permitido em {route}.")
+        raise HTTPError(404, f"Rota '{route}' não encontrada.")
+
+    @staticmethod
+    def _created(result):
+        # 201 só quando o POST criou algo; repetição sem efeito (vértice já existente) é 200
+        return (201 if result['changed'] else 200), result
+
+    @staticmethod
+    def _json(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Corpo JSON inválido.")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Corpo JSON deve ser um objeto.")
+        return data
+
+    # ---------- Conexões ----------
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 mínimo com keep-alive: um pedido por vez em cada conexão
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+
+                self.counters['requests'] += 1
+                if length < 0:
+                    # Sem um tamanho válido não dá para saber onde o corpo termina: fecha a conexão
+                    self.counters['errors'] += 1
+                    status, payload = 400, {'error': "Cabeçalho Content-Length inválido."}
+                    keep_alive = False
+                elif length > MAX_BODY:
+                    status, payload = 413, {'error': "Corpo grande demais."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._respond(method, target, body)
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, body):
+        try:
+            return await self.dispatch(method, target, body)
+        except HTTPError as error:
+            self.counters['errors'] += 1
+            return error.status, {'error': str(error)}
+        except Exception as error:
+            self.counters['errors'] += 1
+            logging.getLogger(__name__).exception("Erro ao atender %s %s", method, target)
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+
+async def serve(service, host="127.0.0.1", port=8080):
+    server = await asyncio.start_server(service.handle, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"✓ Servidor ouvindo em http://{address[0]}:{address[1]} "
+          f"({len(service.graph.vertices)} vértices, pool de {service.pool}s)")
+    # SIGTERM (ex.: process.terminate()) e SIGINT encerram pelo mesmo caminho, que
+    # fecha o pool e apaga os snapshots; sem isso o SIGTERM mataria só o processo principal
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: fica o KeyboardInterrupt tratado no main
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON de consultas de rotas")
+    parser.add_argument("--graph", metavar="ARQUIVO", help="Arquivo de arestas CSV/TSV para carregar")
+    parser.add_argument("--undirected", action="store_true", help="Grafo não direcionado")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread",
+                        help="Workers das buscas: threads sobre o Graph ou processos sobre snapshots")
+    parser.add_argument("--workers", type=int, default=None, help="Tamanho do pool (padrão: nº de CPUs)")
+    parser.add_argument("--batch-window", type=float, default=2.0,
+                        help="Milissegundos de espera para agrupar consultas (padrão: 2)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--cache-size", type=int, default=64, help="Árvores de Dijkstra em cache")
+    args = parser.parse_args()
+
+    graph = Graph(directed=not args.undirected, verbose=False, cache_size=args.cache_size)
+    if args.graph:
+        graph = Graph.from_edge_file(args.graph, directed=not args.undirected,
+                                     verbose=False, cache_size=args.cache_size)
+
+    service = RouteService(graph, args.pool, args.workers, args.batch_window / 1000, args.batch_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    print("\n👋 Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Árvore/floresta geradora mínima sobre o snapshot CSR (grafo não direcionado)
+- Kruskal: lê cada aresta não direcionada uma vez só (a cópia u < v), ordena as
+  posições por peso (contagem quando os pesos são inteiros pequenos) e junta as
+  pontas com um union-find em arrays
+- Prim: fila de prioridade a partir de cada vértice ainda fora da floresta
+Os dois devolvem a lista de arestas escolhidas como (id origem, id destino, peso)
+"""
+
+from array import array
+from bisect import bisect_right
+import heapq
+
+
+class ArrayUnionFind:
+
+    def __init__(self, n):
+        self.parent = array('i', range(n))
+        self.rank = bytearray(n)  # Posto <= log2(n): cabe em um byte
+
+    def find(self, item):
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        # Compressão de caminho: todos do caminho passam a apontar para a raiz
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        rank = self.rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+        return True
+
+
+def _sorted_positions(offsets, targets, weights, n):
+    # Posições (no array de arestas) das cópias u < v, em ordem crescente de peso.
+    # Os vizinhos de cada vértice estão ordenados por id, então as cópias u < v
+    # formam o final da faixa do vértice: uma busca binária por vértice basta
+    positions = array('q')
+    for u in range(n):
+        end = offsets[u + 1]
+        positions.extend(range(bisect_right(targets, u, offsets[u], end), end))
+
+    m = len(positions)
+    if m and min(weights) >= 0 and max(weights) <= 4 * m + 1024 and all(map(float.is_integer, weights)):
+        # Ordenação por contagem: só arrays, sem objetos Python por aresta
+        counts = array('q', [0]) * (int(max(weights)) + 2)
+        for i in positions:
+            counts[int(weights[i]) + 1] += 1
+        for w in range(1, len(counts)):
+            counts[w] += counts[w - 1]
+        ordered = array('q', [0]) * m
+        for i in positions:
+            w = int(weights[i])
+            ordered[counts[w]] = i
+            counts[w] += 1
+        return ordered
+    return array('q', sorted(positions, key=weights.__getitem__))
+
+
+def kruskal(offsets, targets, weights, n):
+    forest = []
+    if n < 2:
+        return forest
+    union_find = ArrayUnionFind(n)
+    union = union_find.union
+    for i in _sorted_positions(offsets, targets, weights, n):
+        # Origem da aresta i: o vértice cuja faixa [offsets[u], offsets[u + 1]) contém i
+        u = bisect_right(offsets, i) - 1
+        v = targets[i]
+        if union(u, v):
+            forest.append((u, v, weights[i]))
+            if len(forest) == n - 1:
+                break
+    return forest
+
+
+def prim(offsets, targets, weights, n):
+    forest = []
+    in_tree = bytearray(n)
+    best = array('d', [float('infinity')]) * n  # Menor peso visto ligando cada vértice à árvore
+
+    for root in range(n):
+        if in_tree[root]:
+            continue
+        in_tree[root] = 1
+        priority_queue = []
+        vertex = root
+        while True:
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                v = targets[i]
+                weight = weights[i]
+                if not in_tree[v] and weight < best[v]:
+                    best[v] = weight
+                    heapq.heappush(priority_queue, (weight, v, vertex))
+
+            # Próximo vértice: o mais barato ainda fora da árvore
+            while priority_queue:
+                weight, vertex, parent = heapq.heappop(priority_queue)
+                if not in_tree[vertex]:
+                    break
+            else:
+                break
+            in_tree[vertex] = 1
+            forest.append((parent, vertex, weight))
+
+    return forest
+
+
+ALGORITHMS = {'kruskal': kruskal, 'prim': prim}
@@ -0,0 +1,113 @@
+"""
+Formato binário compacto do snapshot CSR, pensado para abrir com mmap
+Layout (little-endian, seções alinhadas em 8 bytes):
+    cabeçalho | offsets (int64) | pesos (float64) | destinos (int32) | tabela de nomes | [coordenadas]
+A tabela de nomes é um vetor de offsets (int64) + bytes UTF-8, ou um vetor de
+int64 quando todos os rótulos são inteiros. As coordenadas são opcionais (bit no
+cabeçalho): latitude e longitude (float64) de cada vértice, NaN quando não houver
+"""
+
+from array import array
+import mmap as mmap_module
+import struct
+import sys
+
+MAGIC = b'GRAFOCSR'
+HEADER = struct.Struct('<8sBBBBxxxxQQQ')  # magic, dirigido, tipo dos rótulos, little-endian, flags, V, E, bytes de nomes
+
+HAS_COORDINATES = 1  # Flag: o arquivo termina com a seção de coordenadas
+
+LABELS_STR = 0
+LABELS_INT = 1
+
+
+class NameTable:
+    """Sequência de rótulos decodificados sob demanda a partir do arquivo."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _padding(size):
+    return b'\0' * (-size % 8)
+
+
+def save_csr(csr, path, coordinates=None):
+    # coordinates: sequência plana [lat0, lon0, lat1, lon1, ...] na ordem dos ids, ou None
+    labels = list(csr.labels)
+    if all(isinstance(label, str) for label in labels):
+        kind = LABELS_STR
+        encoded = [label.encode('utf-8') for label in labels]
+        name_offsets = array('q', [0])
+        for name in encoded:
+            name_offsets.append(name_offsets[-1] + len(name))
+        blob = b''.join(encoded)
+    elif all(isinstance(label, int) and not isinstance(label, bool) for label in labels):
+        kind = LABELS_INT
+        name_offsets = array('q', labels)
+        blob = b''
+    else:
+        raise TypeError("Para salvar em arquivo, os rótulos devem ser todos texto ou todos inteiros.")
+
+    with open(path, 'wb') as file:
+        flags = HAS_COORDINATES if coordinates is not None else 0
+        file.write(HEADER.pack(MAGIC, int(csr.directed), kind, int(sys.byteorder == 'little'), flags,
+                               len(labels), len(csr.targets), len(blob)))
+        for values, typecode in ((csr.offsets, 'q'), (csr.weights, 'd'), (csr.targets, 'i'), (name_offsets, 'q')):
+            data = array(typecode, values).tobytes() if not isinstance(values, array) else values.tobytes()
+            file.write(data)
+            file.write(_padding(len(data)))
+        file.write(blob)
+        if coordinates is not None:
+            file.write(_padding(len(blob)))
+            file.write(array('d', coordinates).tobytes())
+
+
+def load_csr(path, mmap=True):
+    """Devolve (labels, offsets, targets, weights, directed, coordinates) lidos do arquivo."""
+    with open(path, 'rb') as file:
+        if mmap:
+            # Mapeia o arquivo: as páginas são compartilhadas entre processos
+            buffer = memoryview(mmap_module.mmap(file.fileno(), 0, access=mmap_module.ACCESS_READ))
+        else:
+            buffer = memoryview(file.read())
+
+    magic, directed, kind, little_endian, flags, n_vertices, n_edges, blob_size = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' não é um arquivo de grafo válido.")
+    if little_endian != int(sys.byteorder == 'little'):
+        raise ValueError(f"'{path}' foi gravado em uma máquina com outra ordem de bytes.")
+
+    position = HEADER.size
+    sections = []
+    for typecode, length in (('q', n_vertices + 1), ('d', n_edges), ('i', n_edges),
+                             ('q', n_vertices + 1 if kind == LABELS_STR else n_vertices)):
+        size = length * array(typecode).itemsize
+        sections.append(buffer[position:position + size].cast(typecode))
+        position += size + (-size % 8)
+    offsets, weights, targets, names = sections
+
+    if kind == LABELS_STR:
+        labels = NameTable(names, buffer[position:position + blob_size])
+    else:
+        labels = names
+
+    coordinates = None
+    if flags & HAS_COORDINATES:
+        position += blob_size + (-blob_size % 8)
+        coordinates = buffer[position:position + 2 * n_vertices * 8].cast('d')
+
+    return labels, offsets, targets, weights, bool(directed), coordinates
@@ -0,0 +1,80 @@
+"""
+Utilitários dos testes: grafos aleatórios e um Dijkstra de referência
+A referência é a versão de livro (heap + dicionários), sem nenhuma das otimizações
+do Graph, e serve de gabarito para comparar cada variante
+"""
+
+import heapq
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from graph import Graph
+
+INFINITY = float('infinity')
+
+
+def random_edges(seed, n=40, m=120, max_weight=20, fractional=False, parallel=True):
+    # Rótulos 0..n-1, como nos geradores dos benchmarks (0 também é um destino válido)
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        weight = rng.randint(0, max_weight)
+        if fractional and rng.random() < 0.5:
+            weight += 0.25
+        edges.append((u, v, weight))
+        if parallel and rng.random() < 0.1:
+            edges.append((u, v, rng.randint(0, max_weight)))
+    return edges
+
+
+def reference_dijkstra(edges, directed, source):
+    adjacency = {}
+    for u, v, weight in edges:
+        adjacency.setdefault(u, []).append((v, weight))
+        if not directed:
+            adjacency.setdefault(v, []).append((u, weight))
+    distances = {source: 0}
+    visited = set()
+    priority_queue = [(0, source)]
+    while priority_queue:
+        distance, u = heapq.heappop(priority_queue)
+        if u in visited:
+            continue
+        visited.add(u)
+        for v, weight in adjacency.get(u, ()):
+            if distance + weight < distances.get(v, INFINITY):
+                distances[v] = distance + weight
+                heapq.heappush(priority_queue, (distance + weight, v))
+    return distances
+
+
+def path_weight(graph, path):
+    return sum(graph.get_edge_weight(u, v) for u, v in zip(path, path[1:]))
+
+
+def check_route(graph, result, start, end, expected):
+    # Distância e caminho de uma consulta ponto a ponto conferidos contra o gabarito
+    if expected == INFINITY:
+        assert result['path'] == []
+        assert result['distances'].get(end, INFINITY) == INFINITY
+        return
+    assert result['distances'][end] == pytest.approx(expected)
+    path = result['path']
+    assert path[0] == start and path[-1] == end
+    assert path_weight(graph, path) == pytest.approx(expected)
+
+
+def graph_from(edges, directed=True, **kwargs):
+    kwargs.setdefault('verbose', False)
+    return Graph.from_edge_list(edges, directed=directed, **kwargs)
+
+
+@pytest.fixture(params=[True, False], ids=["direcionado", "nao-direcionado"])
+def directed(request):
+    return request.param
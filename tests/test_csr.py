@@ -0,0 +1,174 @@
+"""
+Testes do snapshot CSR: buscas, matriz de distâncias, formato binário (com e sem
+mmap), persistência dos pré-processamentos e árvore geradora mínima
+"""
+
+import pytest
+
+from conftest import INFINITY, graph_from, random_edges, reference_dijkstra
+
+from contraction import ContractionHierarchy
+from csr import CSRGraph
+from graph import Graph
+
+SEEDS = range(4)
+
+
+# ==================== BUSCAS ====================
+
+def test_zero_is_a_real_target():
+    snapshot = graph_from([(1, 0, 2), (0, 2, 3), (1, 2, 9)]).freeze()
+    assert snapshot.dijkstra(1, 0)['path'] == [1, 0]
+    assert snapshot.bellman_ford(1, 0)['path'] == [1, 0]
+    assert snapshot.dijkstra(0, 1)['path'] == []
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_distance_matrix(directed, seed, workers):
+    edges = random_edges(seed)
+    graph = graph_from(edges, directed)
+    vertices = sorted(graph.vertices)
+    sources, targets = vertices[:5], vertices[-7:]
+    matrix = graph.distance_matrix(sources, targets, workers=workers)
+    assert matrix.shape == (5, 7) and len(matrix.values) == 35
+    for i, source in enumerate(sources):
+        expected = reference_dijkstra(edges, directed, source)
+        for j, target in enumerate(targets):
+            assert matrix[i, j] == pytest.approx(expected.get(target, INFINITY))
+
+
+# ==================== FORMATO BINÁRIO ====================
+
+def labelled(edges, kind):
+    if kind == "str":
+        return [(f"cidade {u}", f"cidade {v}", weight) for u, v, weight in edges]
+    return edges
+
+
+@pytest.mark.parametrize("kind", ["int", "str"])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_round_trip(directed, tmp_path, kind, mmap):
+    edges = labelled(random_edges(3, fractional=True), kind)
+    graph = graph_from(edges, directed)
+    path = tmp_path / "grafo.bin"
+    graph.save(path)
+
+    snapshot = CSRGraph.load(path, mmap=mmap, verbose=False)
+    assert snapshot.directed == directed
+    assert sorted(snapshot.labels) == sorted(graph.vertices)
+    assert sorted(snapshot.edges()) == sorted(graph.freeze().edges())
+
+    source = edges[0][0]
+    expected = reference_dijkstra(edges, directed, source)
+    distances = snapshot.dijkstra(source)['distances']
+    assert {v: d for v, d in distances.items() if d != float('infinity')} == pytest.approx(expected)
+
+    reloaded = Graph.load(path, mmap=mmap, verbose=False)
+    assert {v: sorted(reloaded.graph[v]) for v in reloaded.vertices} == \
+        {v: sorted(graph.graph[v]) for v in graph.vertices}
+    assert reloaded.coordinates == {}
+
+
+def test_coordinates_survive_save_and_load(tmp_path):
+    graph = graph_from([(0, 1, 3), (1, 2, 4)])
+    graph.set_coordinates(0, -23.55, -46.63)
+    graph.set_coordinates(2, -22.91, -43.17)
+    path = tmp_path / "grafo.bin"
+    graph.save(path)
+
+    reloaded = Graph.load(path, mmap=True, verbose=False)
+    assert reloaded.coordinates == {0: (-23.55, -46.63), 2: (-22.91, -43.17)}
+    assert reloaded.astar(0, 2)['path'] == [0, 1, 2]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "lixo.bin"
+    path.write_bytes(b"nao e um grafo" * 10)
+    with pytest.raises(ValueError):
+        CSRGraph.load(path)
+
+
+def test_contraction_hierarchy_round_trip(tmp_path):
+    edges = random_edges(5)
+    graph = graph_from(edges)
+    hierarchy = graph.contract()
+    path = tmp_path / "ch.json"
+    hierarchy.save(path)
+    loaded = ContractionHierarchy.load(path, verbose=False)
+    for u, v, _ in edges[:20]:
+        assert loaded.query(u, v)['path'] == hierarchy.query(u, v)['path']
+
+
+def test_landmarks_reused_from_disk_until_the_graph_changes(tmp_path):
+    edges = random_edges(6)
+    graph = graph_from(edges)
+    path = tmp_path / "alt.bin"
+    first = graph.landmarks(4, path=path)
+    assert path.exists()
+
+    same = graph_from(edges)
+    loaded = same.landmarks(4, path=path)
+    assert loaded.signature == first.signature
+    assert list(loaded.forward) == list(first.forward)
+
+    same.add_edge(1, 2, 1)
+    rebuilt = same.landmarks(4, path=path)
+    assert rebuilt.signature != first.signature
+    start, end = edges[0][0], edges[-1][1]
+    expected = reference_dijkstra(edges + [(1, 2, 1)], True, start).get(end, float('infinity'))
+    assert same.alt(start, end, k=4)['distances'].get(end, float('infinity')) == expected
+
+
+# ==================== ÁRVORE GERADORA MÍNIMA ====================
+
+def reference_forest_weight(edges):
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            x = parent[x]
+        return x
+
+    total = 0
+    for u, v, weight in sorted(edges, key=lambda edge: edge[2]):
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            parent[ru] = rv
+            total += weight
+    return total
+
+
+def count_components(vertices, edges):
+    parent = {v: v for v in vertices}
+
+    def find(x):
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    for u, v, _ in edges:
+        parent[find(u)] = find(v)
+    return len({find(v) for v in vertices})
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("algorithm", ["kruskal", "prim"])
+def test_forest_is_minimal_and_spanning(seed, algorithm):
+    edges = random_edges(seed, n=40, m=60, fractional=seed % 2 == 1)
+    graph = graph_from(edges, directed=False)
+    forest = graph.minimum_spanning_forest(algorithm)
+
+    assert forest['total_weight'] == pytest.approx(reference_forest_weight(edges))
+    components = count_components(graph.vertices, edges)
+    assert forest['components'] == components
+    assert len(forest['edges']) == len(graph.vertices) - components
+    # Toda aresta escolhida existe no grafo com esse peso e não fecha ciclo
+    assert count_components(graph.vertices, forest['edges']) == components
+    for u, v, weight in forest['edges']:
+        assert graph.get_edge_weight(u, v) == weight
+
+
+def test_directed_graph_and_unknown_algorithm_are_rejected():
+    assert graph_from([(1, 2, 3)], directed=True).minimum_spanning_forest() is None
+    assert graph_from([(1, 2, 3)], directed=False).minimum_spanning_forest("boruvka") is None
@@ -0,0 +1,458 @@
+"""
+Testes do Graph: cada variante de menor caminho comparada com o Dijkstra de
+referência, árvore dinâmica, lotes de alterações e adjacência compacta
+"""
+
+import itertools
+import random
+
+import pytest
+
+from conftest import (INFINITY, check_route, graph_from, path_weight, random_edges,
+                      reference_dijkstra)
+
+
+# ==================== MENORES CAMINHOS ====================
+
+SEEDS = range(6)
+
+
+def pairs(seed, n=40, count=25):
+    rng = random.Random(seed)
+    return [(rng.randrange(n), rng.randrange(n)) for _ in range(count)]
+
+
+def present(graph, queries):
+    return [(s, t) for s, t in queries if s in graph.vertices and t in graph.vertices]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("queue", ["heap", "dial", "radix", "auto"])
+def test_dijkstra_full_tree(directed, seed, queue):
+    edges = random_edges(seed)
+    graph = graph_from(edges, directed)
+    for source in list(graph.vertices)[:8]:
+        expected = reference_dijkstra(edges, directed, source)
+        distances = graph.dijkstra(source, queue=queue)['distances']
+        assert {v: d for v, d in distances.items() if d != INFINITY} == expected
+
+
+@pytest.mark.parametrize("edges", [[(0, 1, 2)], [(0, 1, 2.5)]], ids=["inteiro", "fracionario"])
+def test_unknown_queue_is_rejected(edges):
+    with pytest.raises(ValueError):
+        graph_from(edges).dijkstra(0, queue="dail")
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("cache_size", [0, 16])
+def test_point_to_point_variants(directed, seed, cache_size):
+    edges = random_edges(seed)
+    graph = graph_from(edges, directed, cache_size=cache_size)
+    queries = present(graph, pairs(seed))
+    # A mesma origem de novo exercita o caminho que monta e reaproveita a árvore completa
+    queries += queries[:5]
+    for start, end in queries:
+        expected = reference_dijkstra(edges, directed, start).get(end, INFINITY)
+        check_route(graph, graph.dijkstra(start, end), start, end, expected)
+        check_route(graph, graph.dijkstra(start, end, bidirectional=True), start, end, expected)
+        check_route(graph, graph.dijkstra(start, end, queue="radix"), start, end, expected)
+        check_route(graph, graph.astar(start, end), start, end, expected)
+        check_route(graph, graph.alt(start, end, k=4), start, end, expected)
+        check_route(graph, graph.freeze().dijkstra(start, end), start, end, expected)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_astar_with_coordinates(seed):
+    # Pesos = distância em linha reta arredondada para cima: a heurística nunca superestima
+    rng = random.Random(seed)
+    graph = graph_from([], directed=True)
+    points = {v: (rng.uniform(-30, 0), rng.uniform(-60, -35)) for v in range(30)}
+    for vertex, point in points.items():
+        graph.add_vertex(vertex, point)
+    edges = []
+    for _ in range(90):
+        u, v = rng.sample(sorted(points), 2)
+        weight = int(graph._great_circle_heuristic(u, v)) + 1 + rng.randint(0, 50)
+        graph.add_edge(u, v, weight)
+        edges.append((u, v, weight))
+    for start, end in pairs(seed, 30):
+        expected = reference_dijkstra(edges, True, start).get(end, INFINITY)
+        check_route(graph, graph.astar(start, end), start, end, expected)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_contraction_hierarchy(directed, seed):
+    edges = random_edges(seed, fractional=True)
+    graph = graph_from(edges, directed)
+    hierarchy = graph.contract()
+    for start, end in present(graph, pairs(seed)):
+        expected = reference_dijkstra(edges, directed, start).get(end, INFINITY)
+        result = hierarchy.query(start, end)
+        if expected == INFINITY:
+            assert result['path'] == []
+        else:
+            assert result['distances'][end] == pytest.approx(expected)
+            assert path_weight(graph, result['path']) == pytest.approx(expected)
+
+
+def test_contraction_rejects_negative_weights():
+    graph = graph_from([(0, 1, 2), (1, 2, -1)])
+    assert graph.contract() is None
+    graph.remove_edge(1, 2)
+    assert graph.contract() is not None
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_distance_bounds_bracket_the_distance(directed, seed):
+    edges = random_edges(seed)
+    graph = graph_from(edges, directed)
+    for start, end in present(graph, pairs(seed)):
+        expected = reference_dijkstra(edges, directed, start).get(end, INFINITY)
+        lower, upper = graph.distance_bounds(start, end, k=4)
+        assert lower <= expected <= upper
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("method", ["spfa", "passes"])
+def test_bellman_ford_with_negative_weights(seed, method):
+    # Arestas negativas só "para a frente" (u < v): sem ciclos negativos
+    rng = random.Random(seed)
+    edges = []
+    for u, v, weight in random_edges(seed):
+        if u < v and rng.random() < 0.3:
+            weight = -weight
+        elif u > v:
+            weight += 25
+        edges.append((u, v, weight))
+    graph = graph_from(edges, directed=True)
+    reference = {}
+    for source in list(graph.vertices)[:6]:
+        # Gabarito: relaxação ingênua até estabilizar
+        reference = {source: 0}
+        for _ in range(len(graph.vertices)):
+            for u, v, weight in edges:
+                if u in reference and reference[u] + weight < reference.get(v, INFINITY):
+                    reference[v] = reference[u] + weight
+        result = graph.bellman_ford(source, method=method)
+        assert result['negative_cycle'] is None
+        assert {v: d for v, d in result['distances'].items() if d != INFINITY} == reference
+
+
+@pytest.mark.parametrize("method", ["spfa", "passes"])
+def test_bellman_ford_finds_negative_cycle(method):
+    graph = graph_from([(1, 2, 1), (2, 3, -4), (3, 2, 2), (3, 4, 1)], directed=True)
+    result = graph.bellman_ford(1, 4, method=method)
+    cycle = result['negative_cycle']
+    assert cycle and set(cycle) == {2, 3}
+    assert result['path'] == []
+
+
+def simple_paths(edges, start, end):
+    # Todos os caminhos sem ciclos (grafos pequenos), com o menor peso entre paralelas
+    lightest = {}
+    for u, v, weight in edges:
+        lightest[u, v] = min(weight, lightest.get((u, v), INFINITY))
+    vertices = {u for u, _ in lightest} | {v for _, v in lightest}
+    found = []
+
+    def extend(path, cost):
+        if path[-1] == end:
+            found.append(cost)
+            return
+        for v in vertices:
+            if (path[-1], v) in lightest and v not in path:
+                extend(path + [v], cost + lightest[path[-1], v])
+
+    extend([start], 0)
+    return sorted(found)
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_k_shortest_paths_match_enumeration(seed):
+    edges = random_edges(seed, n=7, m=18, max_weight=9)
+    graph = graph_from(edges, directed=True)
+    for start, end in itertools.islice(present(graph, pairs(seed, 7)), 6):
+        if start == end:
+            continue
+        routes = graph.k_shortest_paths(start, end, k=4)
+        expected = simple_paths(edges, start, end)[:4]
+        assert [route['distance'] for route in routes] == expected
+        assert len({tuple(route['path']) for route in routes}) == len(routes)
+        for route in routes:
+            assert len(set(route['path'])) == len(route['path'])
+            assert path_weight(graph, route['path']) == route['distance']
+
+
+def test_cached_tree_is_not_shared_with_callers():
+    graph = graph_from([(1, 2, 3), (2, 3, 4)])
+    for _ in range(3):
+        result = graph.dijkstra(1)
+        result['distances'][3] = 99
+        result['previous'][3] = None
+    assert graph.dijkstra(1)['distances'][3] == 7
+    assert graph.dijkstra(1, 3)['path'] == [1, 2, 3]
+
+
+def test_zero_and_empty_labels_are_real_targets():
+    # 0 e '' são rótulos válidos: não podem ser confundidos com "sem destino"
+    graph = graph_from([(1, 0, 2), (0, 2, 3), (1, 2, 9), ('', 1, 1)])
+    for _ in range(3):
+        assert graph.dijkstra(1, 0)['path'] == [1, 0]
+        assert graph.dijkstra(1, 0, bidirectional=True)['path'] == [1, 0]
+        assert graph.dijkstra('', 2)['path'] == ['', 1, 0, 2]
+    assert graph.dijkstra(0, '')['path'] == []
+    for method in ("spfa", "passes"):
+        assert graph.bellman_ford(1, 0, method=method)['path'] == [1, 0]
+
+
+# ==================== ÁRVORE DINÂMICA ====================
+
+def current_edges(graph):
+    return [(u, v, weight) for u in graph.vertices for v, weight in graph.graph.neighbors(u)]
+
+
+def check_tree(graph, tree):
+    expected = reference_dijkstra(current_edges(graph), True, tree.source) if tree.source in graph.vertices else {}
+    assert tree.distances == pytest.approx(expected)
+    for vertex in graph.vertices:
+        assert tree.distance_to(vertex) == pytest.approx(expected.get(vertex, INFINITY))
+        path = tree.path_to(vertex)
+        if vertex in expected:
+            assert path[0] == tree.source and path[-1] == vertex
+            assert sum(graph.get_edge_weight(u, v) for u, v in zip(path, path[1:])) == pytest.approx(expected[vertex])
+        else:
+            assert path == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_tree_follows_random_mutations(seed):
+    rng = random.Random(seed)
+    n = 25
+    graph = graph_from([(rng.randrange(n), rng.randrange(n), rng.randrange(9)) for _ in range(60)])
+    graph.add_vertex(0)
+    tree = graph.shortest_path_tree(0)
+    check_tree(graph, tree)
+
+    for _ in range(80):
+        u, v = rng.randrange(n), rng.randrange(n)
+        action = rng.random()
+        if action < 0.45:
+            graph.add_edge(u, v, rng.randrange(9))
+        elif action < 0.75:
+            graph.remove_edge(u, v)
+        elif action < 0.85:
+            graph.remove_vertex(u)
+        else:
+            with graph.batch() as batch:
+                for _ in range(4):
+                    batch.add_edge(rng.randrange(n), rng.randrange(n), rng.randrange(9))
+                batch.remove_edge(u, v)
+        check_tree(graph, tree)
+    tree.close()
+
+
+def test_tree_recovers_when_source_returns():
+    graph = graph_from([(1, 2, 3), (2, 3, 4), (1, 3, 10)])
+    tree = graph.shortest_path_tree(1)
+    assert tree.distance_to(3) == 7
+
+    graph.remove_vertex(1)
+    assert tree.distances == {} and tree.path_to(3) == []
+
+    graph.add_vertex(1)
+    assert tree.distances == {1: 0}
+    graph.add_edge(1, 2, 1)
+    assert tree.distance_to(3) == 5 and tree.path_to(3) == [1, 2, 3]
+    check_tree(graph, tree)
+
+
+# ==================== LOTES ====================
+
+def snapshot(graph):
+    return {vertex: sorted(graph.graph[vertex]) for vertex in graph.vertices}, dict(graph.coordinates)
+
+
+def test_exception_discards_the_whole_batch(directed):
+    graph = graph_from(random_edges(1), directed)
+    events = []
+    graph.subscribe(lambda *event: events.append(event))
+    before, version = snapshot(graph), graph.version
+
+    with pytest.raises(RuntimeError):
+        with graph.batch() as batch:
+            batch.add_edge(1, 99, 5)
+            batch.remove_vertex(2)
+            batch.remove_edge(3, 4)
+            raise RuntimeError("falha no meio do lote")
+
+    assert snapshot(graph) == before
+    assert graph.version == version
+    assert events == []
+
+
+def test_invalid_weight_fails_inside_the_block():
+    graph = graph_from([(1, 2, 3)])
+    before = snapshot(graph)
+    with pytest.raises(TypeError):
+        with graph.batch() as batch:
+            batch.add_edge(2, 3, 1)
+            batch.add_edge(3, 4, "pesado")
+    assert snapshot(graph) == before
+
+
+def test_unknown_policy_is_rejected():
+    graph = graph_from([(1, 2, 3)])
+    with pytest.raises(ValueError):
+        with graph.batch(policy="x"):
+            pass
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_multi_batch_matches_single_operations(directed, seed):
+    rng = random.Random(seed)
+    edges = random_edges(seed, n=15, m=30)
+    one_by_one, batched = graph_from(edges, directed), graph_from(edges, directed)
+    events = []
+    batched.subscribe(lambda *event: events.append(event))
+    version = batched.version
+
+    with batched.batch(policy="multi") as batch:
+        for _ in range(60):
+            u, v = rng.randrange(18), rng.randrange(18)
+            action = rng.random()
+            if action < 0.6:
+                weight = rng.randrange(9)
+                one_by_one.add_edge(u, v, weight)
+                batch.add_edge(u, v, weight)
+            elif action < 0.85:
+                one_by_one.remove_edge(u, v)
+                batch.remove_edge(u, v)
+            else:
+                one_by_one.remove_vertex(u)
+                batch.remove_vertex(u)
+
+    assert snapshot(batched) == snapshot(one_by_one)
+    assert batched.version == version + 1
+    assert [event[0] for event in events] == ["batch"]
+    for vertex in batched.vertices:
+        assert batched.dijkstra(vertex)['distances'] == one_by_one.dijkstra(vertex)['distances']
+
+
+def test_duplicate_policies():
+    graph = graph_from([(1, 2, 5)])
+    with graph.batch(policy="min") as batch:
+        batch.add_edge(1, 2, 7)
+        batch.add_edge(2, 3, 4)
+        batch.add_edge(2, 3, 2)
+    assert graph.graph[1] == [(2, 5)] and graph.graph[2] == [(3, 2)]
+    assert batch.applied['skipped_edges'] == 1
+
+    with graph.batch(policy="replace") as batch:
+        batch.add_edge(1, 2, 9)
+        batch.add_edge(1, 2, 8)
+    assert graph.graph[1] == [(2, 8)]
+    assert batch.applied['replaced_edges'] == 1
+
+    with graph.batch(policy="multi") as batch:
+        batch.add_edge(1, 2, 1)
+    assert graph.graph[1] == [(2, 1), (2, 8)]
+    assert graph.get_edge_weight(1, 2) == 1
+
+
+# ==================== ADJACÊNCIA E COMPONENTES ====================
+
+def lightest_edges(graph):
+    # Gabarito das entradas: {destino: {origem: menor peso}} a partir das listas de saída
+    expected = {vertex: {} for vertex in graph.vertices}
+    for u in graph.vertices:
+        for v, weight in graph.graph.neighbors(u):
+            expected[v][u] = min(weight, expected[v].get(u, weight))
+    return expected
+
+
+def test_lists_stay_sorted_and_parallel_edges_use_the_lightest():
+    graph = graph_from([("b", "c", 4), ("b", "a", 2), ("b", "c", 1), ("b", "a", 7)])
+    assert graph.graph["b"] == [("a", 2), ("a", 7), ("c", 1), ("c", 4)]
+    assert graph.get_edge_weight("b", "c") == 1
+    assert graph.get_edge_weight("c", "b") is None
+    assert graph.get_edge_weight("x", "b") is None
+
+
+def test_weights_switch_to_float_on_the_first_fraction():
+    graph = graph_from([(1, 2, 3), (2, 3, 4)])
+    graph.add_edge(1, 3, 430.0)  # A CLI sempre passa float(...): inteiro não promove
+    assert graph.graph.typecode == 'q'
+    assert graph.get_edge_weight(1, 3) == 430 and isinstance(graph.get_edge_weight(1, 3), int)
+    graph.add_edge(3, 1, 0.5)
+    assert graph.graph.typecode == 'd'
+    assert graph.graph[3] == [(1, 0.5)] and graph.graph[1] == [(2, 3), (3, 430)]
+    assert graph.dijkstra(3)['distances'][2] == 3.5
+
+
+def test_removed_ids_are_reused_without_stale_edges():
+    graph = graph_from([(1, 2, 3), (2, 3, 4), (3, 1, 5)])
+    graph.remove_vertex(2)
+    graph.add_edge(4, 1, 6)
+    assert graph.graph[1] == [] and graph.graph[3] == [(1, 5)] and graph.graph[4] == [(1, 6)]
+    assert sorted(graph.graph.predecessors(1)) == [3, 4]
+    assert len(graph.graph.labels) == 3
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_reverse_index_follows_mutations(directed, seed):
+    rng = random.Random(seed)
+    graph = graph_from(random_edges(seed, n=15, m=40, fractional=True), directed)
+    for step in range(120):
+        u, v = rng.randrange(17), rng.randrange(17)
+        action = rng.random()
+        if action < 0.5:
+            graph.add_edge(u, v, rng.randint(0, 9))
+        elif action < 0.75:
+            graph.remove_edge(u, v)
+        elif action < 0.85:
+            graph.remove_vertex(u)
+        else:
+            with graph.batch(policy=rng.choice(["min", "replace", "multi"])) as batch:
+                batch.add_edge(u, v, rng.randint(0, 9))
+                batch.remove_edge(v, u)
+        if step == 30:
+            # O índice reverso é montado sob demanda; daí em diante é mantido a cada alteração
+            graph.graph.incoming(next(iter(graph.vertices)))
+        expected = lightest_edges(graph)
+        for vertex in graph.vertices:
+            for source in graph.vertices:
+                assert graph.get_edge_weight(source, vertex) == expected[vertex].get(source)
+            if graph.graph.sources is not None:
+                assert dict(graph.graph.incoming(vertex)) == expected[vertex]
+
+
+def reachable_from(graph, source):
+    seen, stack = {source}, [source]
+    while stack:
+        for v in graph.graph.successors(stack.pop()):
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+    return seen
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_reachability_survives_mutations(directed, seed):
+    rng = random.Random(seed)
+    graph = graph_from(random_edges(seed, n=20, m=25), directed)
+    for _ in range(40):
+        u, v = rng.randrange(20), rng.randrange(20)
+        if rng.random() < 0.6:
+            graph.add_edge(u, v, 1)
+        elif rng.random() < 0.8:
+            graph.remove_edge(u, v)
+        else:
+            graph.remove_vertex(u)
+        vertices = sorted(graph.vertices)
+        for source in vertices[:5]:
+            reached = reachable_from(graph, source)
+            for target in vertices:
+                assert graph.can_reach(source, target) == (target in reached)
+                # A prova de "sem rota" nunca pode descartar um destino alcançável
+                if target in reached:
+                    assert not graph._separated(source, target)
@@ -0,0 +1,76 @@
+"""Serviço HTTP: consultas em leva contra o gabarito, códigos de status e cabeçalhos inválidos."""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import INFINITY, graph_from, random_edges, reference_dijkstra
+
+from server import RouteService
+
+
+def run(coroutine_function, graph):
+    async def main():
+        service = RouteService(graph, workers=2)
+        try:
+            return await coroutine_function(service)
+        finally:
+            service.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_queries_match_reference():
+    # Os rótulos chegam da URL como texto: o grafo do serviço usa rótulos str
+    edges = random_edges(2)
+    graph = graph_from([(str(u), str(v), weight) for u, v, weight in edges])
+    vertices = sorted({u for u, _, _ in edges} | {v for _, v, _ in edges})
+    pairs = [(s, t) for s in vertices[:6] for t in vertices[-6:]]
+
+    async def scenario(service):
+        # Consultas simultâneas: as da mesma origem são respondidas numa só leva
+        return await asyncio.gather(*(service.dispatch("GET", f"/shortest-path?from={s}&to={t}", b"")
+                                      for s, t in pairs))
+
+    for (s, t), (status, route) in zip(pairs, run(scenario, graph)):
+        expected = reference_dijkstra(edges, True, s).get(t, INFINITY)
+        assert status == 200
+        if expected == INFINITY:
+            assert route['path'] == []
+        else:
+            assert route['distance'] == expected
+            assert route['path'][0] == str(s) and route['path'][-1] == str(t)
+
+
+def test_post_is_201_only_when_something_changed():
+    async def scenario(service):
+        first = await service.dispatch("POST", "/vertices", b'{"vertex": "A"}')
+        again = await service.dispatch("POST", "/vertices", b'{"vertex": "A"}')
+        edge = await service.dispatch("POST", "/edges", b'{"from": "A", "to": "B", "weight": 2}')
+        missing = await service._respond("GET", "/shortest-path?from=A&to=Z", b"")
+        return first[0], again[0], edge[0], missing[0]
+
+    assert run(scenario, graph_from([])) == (201, 200, 201, 404)
+
+
+@pytest.mark.parametrize("header, body, status", [
+    (b"abc", b"", 400),
+    (b"-5", b"", 400),
+    (b"15", b'{"vertex": "X"}', 201),
+])
+def test_content_length_is_validated(header, body, status):
+    async def scenario(service):
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /vertices HTTP/1.1\r\nConnection: close\r\nContent-Length: "
+                         + header + b"\r\n\r\n" + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return response
+
+    head, _, payload = run(scenario, graph_from([])).partition(b"\r\n\r\n")
+    assert head.split()[1] == str(status).encode()
+    assert ("error" in json.loads(payload)) == (status == 400)